@@ -0,0 +1,140 @@
+from functools import update_wrapper
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from rest_framework.response import Response
+
+
+def get_async_reads_settings():
+    return {
+        'ENABLED': False,
+        **getattr(settings, 'ASYNC_READS', {}),
+    }
+
+
+class AsyncReadMixin:
+    """
+    Асинхронные list и retrieve для вьюсетов DRF.
+
+    GET и HEAD действий из async_actions обрабатываются корутиной: SQL
+    выполняется асинхронным ORM (acount, aget, async for), а
+    аутентификация, права и фильтры DRF — через sync_to_async. Под
+    ASGI запрос не занимает поток сервера, пока ждёт базу. Остальные
+    методы идут через обычный синхронный dispatch.
+
+    Под WSGI асинхронное представление только добавляет переключения
+    потоков, поэтому оно включается настройкой ASYNC_READS['ENABLED']
+    (её задаёт api_yamdb.asgi); иначе вьюсет остаётся синхронным.
+
+    Вьюсет определяет асинхронный обработчик a<action>; миксины,
+    которые оборачивают list/retrieve (кэш, вложенные ресурсы),
+    оборачивают и alist/aretrieve.
+    """
+
+    async_actions = ('list', 'retrieve')
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+        if not get_async_reads_settings()['ENABLED'] or not any(
+            action in cls.async_actions for action in view.actions.values()
+        ):
+            return view
+        sync_view = sync_to_async(view)
+
+        async def async_view(request, *args, **kwargs):
+            actions = view.actions
+            if 'get' in actions and 'head' not in actions:
+                actions['head'] = actions['get']
+            method = request.method.lower()
+            if (
+                method not in ('get', 'head')
+                or actions.get(method) not in cls.async_actions
+            ):
+                return await sync_view(request, *args, **kwargs)
+
+            self = cls(**initkwargs)
+            self.action_map = actions
+            self.request = request
+            self.args = args
+            self.kwargs = kwargs
+            return await self.async_dispatch(request, *args, **kwargs)
+
+        # Переносит cls, actions, initkwargs и csrf_exempt.
+        return update_wrapper(async_view, view)
+
+    async def async_dispatch(self, request, *args, **kwargs):
+        """Асинхронный аналог APIView.dispatch."""
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            handler = getattr(self, f'a{self.action}')
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(
+            request, response, *args, **kwargs
+        )
+        return self.response
+
+    def get_read_queryset(self):
+        return self.filter_queryset(self.get_queryset())
+
+    async def apaginate_queryset(self, queryset):
+        if self.paginator is None:
+            return None
+        if hasattr(self.paginator, 'apaginate_queryset'):
+            return await self.paginator.apaginate_queryset(
+                queryset, self.request, view=self
+            )
+        return await sync_to_async(self.paginate_queryset)(queryset)
+
+    async def aget_object(self):
+        queryset = await sync_to_async(self.get_read_queryset)()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        except (
+            queryset.model.DoesNotExist, TypeError, ValueError,
+            ValidationError,
+        ):
+            raise Http404
+        await sync_to_async(self.check_object_permissions)(
+            self.request, obj
+        )
+        return obj
+
+    async def aserialize(self, instance, many=False):
+        """
+        Возвращает serializer.data; связи сериализаторов с aprefetch
+        (api.read_serializers) догружаются асинхронным ORM.
+        """
+        serializer = self.get_serializer(instance, many=many)
+        if hasattr(serializer, 'aprefetch'):
+            await serializer.aprefetch()
+        return serializer.data
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = await sync_to_async(self.get_read_queryset)()
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                await self.aserialize(page, many=True)
+            )
+        return Response(await self.aserialize(
+            [item async for item in queryset], many=True
+        ))
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        return Response(await self.aserialize(instance))
@@ -0,0 +1,126 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router, transaction
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.models import YamdbUser
+
+
+CLAIM_FIELDS = ('username', 'role', 'is_superuser', 'is_active')
+
+
+def get_claims_settings():
+    return {
+        # Время жизни метки claims пользователя в кэше.
+        'MARKER_SECONDS': 60,
+        'CACHE_ALIAS': 'default',
+        **getattr(settings, 'AUTH_CLAIMS', {}),
+    }
+
+
+def get_claims_cache():
+    return caches[get_claims_settings()['CACHE_ALIAS']]
+
+
+def _marker_key(user_id):
+    return f'auth:claims:{user_id}'
+
+
+def get_claims(source):
+    """Значения CLAIM_FIELDS пользователя или токена."""
+    if isinstance(source, YamdbUser):
+        return [getattr(source, field) for field in CLAIM_FIELDS]
+    return [source[field] for field in CLAIM_FIELDS]
+
+
+def remember_user_claims(user, replace=True):
+    """
+    Сохраняет метку: текущие claims пользователя из БД.
+
+    Токены, claims которых совпадают с меткой, принимаются без запроса
+    к БД. replace=False не перезаписывает существующую метку.
+    """
+    cache = get_claims_cache()
+    store = cache.set if replace else cache.add
+    store(
+        _marker_key(user.pk),
+        get_claims(user),
+        timeout=get_claims_settings()['MARKER_SECONDS'],
+    )
+
+
+def revoke_user_claims(user_id):
+    """
+    Удаляет метку claims пользователя при смене роли, username,
+    блокировке или удалении.
+
+    Следующий запрос проверит токен по строке пользователя из БД.
+    Метка удаляется и после фиксации транзакции: иначе параллельный
+    запрос успел бы сохранить прежние данные из ещё не изменённой БД.
+    """
+    key = _marker_key(user_id)
+    get_claims_cache().delete(key)
+    transaction.on_commit(lambda: get_claims_cache().delete(key))
+
+
+class RoleAccessToken(AccessToken):
+    """Access-токен с username, ролью и признаком суперпользователя."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for field in CLAIM_FIELDS:
+            token[field] = getattr(user, field)
+        remember_user_claims(user)
+        return token
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT-аутентификация без запроса пользователя к БД.
+
+    Claims роли из токена принимаются, если совпадают с меткой
+    пользователя в общем кэше: пользователь собирается из claims,
+    остальные поля модели остаются отложенными и загружаются только при
+    обращении к ним. Иначе пользователь читается из БД, как в
+    JWTAuthentication, и метка сохраняется заново. Изменение
+    пользователя удаляет метку (api.signals), поэтому прежние claims
+    перестают приниматься во всех процессах.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None or any(
+            field not in validated_token for field in CLAIM_FIELDS
+        ):
+            return super().get_user(validated_token)
+        marker = get_claims_cache().get(_marker_key(user_id))
+        if (
+            validated_token['is_active']
+            and marker is not None
+            and marker == get_claims(validated_token)
+        ):
+            return self.build_user(user_id, validated_token)
+        user = super().get_user(validated_token)
+        if marker is None:
+            remember_user_claims(user, replace=False)
+        return user
+
+    @staticmethod
+    def build_user(user_id, validated_token):
+        """Пользователь из claims; прочие поля загружаются отложенно."""
+        values = dict(
+            zip(CLAIM_FIELDS, get_claims(validated_token)), id=user_id
+        )
+        # from_db ждёт значения в порядке полей модели.
+        field_names = [
+            field.attname for field in YamdbUser._meta.concrete_fields
+            if field.attname in values
+        ]
+        return YamdbUser.from_db(
+            router.db_for_read(YamdbUser),
+            field_names,
+            [values[name] for name in field_names],
+        )
@@ -0,0 +1,253 @@
+import hashlib
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.http import parse_http_date_safe
+from rest_framework import status
+
+from api.conditional import get_not_modified
+from api.replicas import is_read_from_replica
+
+
+_stats_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+
+# Валидаторы условных запросов хранятся вместе с ответом.
+VALIDATOR_HEADERS = ('ETag', 'Last-Modified')
+
+
+def get_cache_settings():
+    return {
+        'ENABLED': True,
+        'ALIAS': 'default',
+        'TIMEOUT': 60,
+        # Срок хранения ответов, прочитанных с реплики; 0 — не хранить.
+        'REPLICA_TIMEOUT': 5,
+        'KEY_PREFIX': 'api-response',
+        **getattr(settings, 'RESPONSE_CACHE', {}),
+    }
+
+
+def get_response_cache():
+    return caches[get_cache_settings()['ALIAS']]
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def get_cache_stats():
+    """Возвращает счётчики попаданий и промахов кэша ответов."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_cache_stats():
+    with _stats_lock:
+        for name in _stats:
+            _stats[name] = 0
+
+
+def title_scope(title_id):
+    return f'title:{title_id}'
+
+
+def title_scopes(title_id):
+    """Области кэша, содержащие данные произведения (в т.ч. рейтинг)."""
+    return ('titles', title_scope(title_id))
+
+
+def reviews_scope(title_id):
+    return f'title:{title_id}:reviews'
+
+
+def comments_scope(review_id):
+    return f'review:{review_id}:comments'
+
+
+def _version_key(scope):
+    return f'{get_cache_settings()["KEY_PREFIX"]}:version:{scope}'
+
+
+def get_scope_versions(scopes):
+    """
+    Возвращает текущие версии областей кэша.
+
+    Версия входит в ключ записи, поэтому смена версии делает
+    недоступными все записи области без удаления по шаблону, которое
+    не поддерживают locmem и файловый бэкенды.
+    """
+    cache = get_response_cache()
+    keys = [_version_key(scope) for scope in scopes]
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def invalidate_scopes(*scopes):
+    """Сбрасывает записи кэша, относящиеся к указанным областям."""
+    cache = get_response_cache()
+    for scope in scopes:
+        key = _version_key(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+
+
+def _build_key(kind, parts, scopes):
+    versions = get_scope_versions(scopes)
+    raw = '|'.join((*parts, repr(list(zip(scopes, versions)))))
+    digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+    return f'{get_cache_settings()["KEY_PREFIX"]}:{kind}:{digest}'
+
+
+def build_cache_key(request, scopes):
+    query = sorted(request.query_params.lists())
+    return _build_key('response', (
+        request.build_absolute_uri(request.path),
+        repr(query),
+        request.accepted_renderer.format,
+    ), scopes)
+
+
+def build_list_key(request, scopes, ignored_params, extra=''):
+    """
+    Ключ данных списка, общих для всех его страниц: параметры из
+    ignored_params (номер и размер страницы) в ключ не входят.
+    """
+    query = sorted(
+        (name, values) for name, values in request.query_params.lists()
+        if name not in ignored_params
+    )
+    return _build_key('list', (request.path, repr(query), extra), scopes)
+
+
+class BaseResponseCacheMixin:
+    """
+    Кэширование ответов на чтение для анонимных запросов.
+
+    Вьюсет описывает области кэша в get_cache_scopes(); записи
+    сбрасываются сигналами при изменении данных этих областей.
+    """
+
+    cache_actions = ('list', 'retrieve')
+
+    def get_cache_scopes(self):
+        raise NotImplementedError(
+            'Вьюсет с кэшем ответов должен определить get_cache_scopes().'
+        )
+
+    def is_cacheable(self, request):
+        return (
+            get_cache_settings()['ENABLED']
+            and self.action in self.cache_actions
+            and request.user.is_anonymous
+        )
+
+    def get_cached_response(self, request):
+        """Возвращает ключ кэша и сохранённый ответ или None."""
+        key = build_cache_key(request, self.get_cache_scopes())
+        cached = get_response_cache().get(key)
+        if cached is None:
+            _count('misses')
+            return key, None
+        _count('hits')
+        content, content_type, validators = cached
+        if validators.get('ETag'):
+            not_modified = get_not_modified(
+                request,
+                validators['ETag'],
+                parse_http_date_safe(validators.get('Last-Modified')),
+            )
+            if not_modified is not None:
+                not_modified['X-Cache'] = 'HIT'
+                return key, not_modified
+        response = HttpResponse(content, content_type=content_type)
+        for header, value in validators.items():
+            response[header] = value
+        response['X-Cache'] = 'HIT'
+        return key, response
+
+    def store_response(self, key, response):
+        """Сохраняет ответ в кэш после рендеринга."""
+        if response.status_code != status.HTTP_200_OK:
+            return
+        response['X-Cache'] = 'MISS'
+        # Страница отстающей реплики могла попасть в кэш уже после
+        # сброса версии области, поэтому хранится недолго.
+        timeout = get_cache_settings()[
+            'REPLICA_TIMEOUT' if is_read_from_replica() else 'TIMEOUT'
+        ]
+        if timeout == 0:
+            return
+        cache = get_response_cache()
+        response.add_post_render_callback(
+            lambda rendered: cache.set(
+                key,
+                (
+                    rendered.content,
+                    rendered['Content-Type'],
+                    {
+                        header: rendered[header]
+                        for header in VALIDATOR_HEADERS
+                        if header in rendered
+                    },
+                ),
+                timeout,
+            )
+        )
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if not self.is_cacheable(request):
+            return handler(request, *args, **kwargs)
+        key, response = self.get_cached_response(request)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            self.store_response(key, response)
+        return response
+
+    async def acached_response(self, handler, request, *args, **kwargs):
+        if not self.is_cacheable(request):
+            return await handler(request, *args, **kwargs)
+        key, response = await sync_to_async(self.get_cached_response)(
+            request
+        )
+        if response is None:
+            response = await handler(request, *args, **kwargs)
+            self.store_response(key, response)
+        return response
+
+
+class ListResponseCacheMixin(BaseResponseCacheMixin):
+    """Кэширует ответы действия list."""
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        return await self.acached_response(
+            super().alist, request, *args, **kwargs
+        )
+
+
+class ResponseCacheMixin(ListResponseCacheMixin):
+    """Кэширует ответы действий list и retrieve."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return await self.acached_response(
+            super().aretrieve, request, *args, **kwargs
+        )
@@ -0,0 +1,149 @@
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from rest_framework import status
+
+
+def set_validator_headers(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def get_not_modified(request, etag, last_modified):
+    """Ответ 304, если валидаторы запроса совпадают, иначе None."""
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is None:
+        return None
+    return set_validator_headers(response, etag, last_modified)
+
+
+class BaseConditionalGetMixin:
+    """
+    Условные GET-запросы (If-None-Match, If-Modified-Since).
+
+    Валидаторы считаются одним запросом по той же выборке, что и ответ:
+    количество записей и максимальный updated_at; в ETag входят и
+    параметры запроса, чтобы страницы списка не совпадали. Совпадение
+    отдаёт 304 до чтения страницы и сериализации. Количество используется и
+    пагинацией вместо отдельного COUNT(*); для списков оба значения
+    берутся из кэша пагинации (CountedPagination.aggregate). Курсорная
+    пагинация не считает записи, поэтому её страницы отдаются без
+    валидаторов.
+    """
+
+    conditional_actions = ('list', 'retrieve')
+
+    def get_validator_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.action != 'list':
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        return queryset
+
+    def is_conditional(self, request):
+        if self.action not in self.conditional_actions:
+            return False
+        paginator = self.paginator
+        return self.action != 'list' or paginator is None or getattr(
+            paginator, 'is_counted', lambda request: False
+        )(request)
+
+    def get_validators(self):
+        """Возвращает (ETag, Last-Modified) или None без записей."""
+        aggregates = {'count': Count('pk'), 'updated_at': Max('updated_at')}
+        try:
+            queryset = self.get_validator_queryset()
+            if self.action == 'list' and hasattr(self.paginator, 'aggregate'):
+                # Кэш пагинации: валидаторы списка общие для всех страниц.
+                values = self.paginator.aggregate(
+                    queryset, self.request, self, **aggregates
+                )
+            else:
+                values = queryset.aggregate(**aggregates)
+        except (TypeError, ValueError, ValidationError):
+            return None
+        if self.action == 'list':
+            self.known_count = values['count']
+        if not values['count']:
+            # Пустой список или 404 отдаются обычным путём.
+            return None
+        # Параметры запроса (страница, её размер, курсор, фильтры)
+        # различают ETag страниц одного списка.
+        raw = '|'.join((
+            str(values['count']),
+            values['updated_at'].isoformat(),
+            self.request.accepted_renderer.format,
+            repr(sorted(self.request.query_params.lists())),
+        ))
+        etag = quote_etag(hashlib.md5(raw.encode('utf-8')).hexdigest())
+        return etag, int(values['updated_at'].timestamp())
+
+    def finish_conditional(self, response, validators):
+        if response.status_code == status.HTTP_200_OK:
+            set_validator_headers(response, *validators)
+        return response
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        validators = None
+        if self.is_conditional(request):
+            validators = self.get_validators()
+        if validators is None:
+            return handler(request, *args, **kwargs)
+        response = get_not_modified(request, *validators)
+        if response is not None:
+            return response
+        return self.finish_conditional(
+            handler(request, *args, **kwargs), validators
+        )
+
+    async def aconditional_response(self, handler, request, *args,
+                                    **kwargs):
+        validators = None
+        if self.is_conditional(request):
+            validators = await sync_to_async(self.get_validators)()
+        if validators is None:
+            return await handler(request, *args, **kwargs)
+        response = get_not_modified(request, *validators)
+        if response is not None:
+            return response
+        return self.finish_conditional(
+            await handler(request, *args, **kwargs), validators
+        )
+
+
+class ListConditionalGetMixin(BaseConditionalGetMixin):
+    """Условные запросы к действию list."""
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    async def alist(self, request, *args, **kwargs):
+        return await self.aconditional_response(
+            super().alist, request, *args, **kwargs
+        )
+
+
+class ConditionalGetMixin(ListConditionalGetMixin):
+    """Условные запросы к действиям list и retrieve."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return await self.aconditional_response(
+            super().aretrieve, request, *args, **kwargs
+        )
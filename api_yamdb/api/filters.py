@@ -1,6 +1,8 @@
 import django_filters
+from rest_framework import filters
 
 from reviews.models import Title
+from reviews.search import is_search_available, search
 
 
 class TitleFilter(django_filters.FilterSet):
@@ -13,11 +15,25 @@ class TitleFilter(django_filters.FilterSet):
         field_name='genre__slug',
         lookup_expr='exact'
     )
-    name = django_filters.CharFilter(
-        field_name='name',
-        lookup_expr='icontains'
-    )
+    name = django_filters.CharFilter(method='filter_name')
 
     class Meta:
         model = Title
         fields = ('category', 'genre', 'name', 'year')
+
+    def filter_name(self, queryset, name, value):
+        return search(queryset, value)
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    Поиск по названию через FTS-индекс с сортировкой по релевантности.
+
+    Если индекса нет, работает как обычный SearchFilter.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms or not is_search_available(queryset.model, queryset.db):
+            return super().filter_queryset(request, queryset, view)
+        return search(queryset, ' '.join(terms))
@@ -0,0 +1,334 @@
+import csv
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.rankings import recompute_rankings
+from reviews.ratings import recalculate_scores
+
+
+User = get_user_model()
+
+DEFAULT_DATA_DIR = Path(settings.BASE_DIR) / 'static' / 'data'
+DEFAULT_BATCH_SIZE = 1000
+
+
+class RowRejected(Exception):
+    """Строка CSV не может быть импортирована."""
+
+
+class ImportSpec:
+    """
+    Описание импорта одного CSV-файла.
+
+    fields сопоставляет attname поля модели с колонкой CSV,
+    foreign_keys — attname внешнего ключа с моделью, на которую он
+    ссылается; unique перечисляет наборы attname, уникальные в таблице.
+    after_import выполняется сразу после загрузки файла, finalize —
+    один раз после всех файлов команды, даже если его указали
+    несколько загруженных файлов.
+    """
+
+    def __init__(self, name, filename, model, fields, foreign_keys=None,
+                 unique=(), after_import=None, finalize=None):
+        self.name = name
+        self.filename = filename
+        self.model = model
+        self.fields = fields
+        self.foreign_keys = foreign_keys or {}
+        self.unique = unique
+        self.after_import = after_import
+        self.finalize = finalize
+
+    def __repr__(self):
+        return f'<ImportSpec {self.name}: {self.filename}>'
+
+
+SPECS = {
+    spec.name: spec for spec in (
+        ImportSpec(
+            name='users',
+            filename='users.csv',
+            model=User,
+            fields={
+                'id': 'id',
+                'username': 'username',
+                'email': 'email',
+                'role': 'role',
+                'bio': 'bio',
+                'first_name': 'first_name',
+                'last_name': 'last_name',
+            },
+            unique=(('username',), ('email',)),
+        ),
+        ImportSpec(
+            name='categories',
+            filename='category.csv',
+            model=Category,
+            fields={'id': 'id', 'name': 'name', 'slug': 'slug'},
+            unique=(('slug',),),
+        ),
+        ImportSpec(
+            name='genres',
+            filename='genre.csv',
+            model=Genre,
+            fields={'id': 'id', 'name': 'name', 'slug': 'slug'},
+            unique=(('slug',),),
+        ),
+        ImportSpec(
+            name='titles',
+            filename='titles.csv',
+            model=Title,
+            fields={
+                'id': 'id',
+                'name': 'name',
+                'year': 'year',
+                'category_id': 'category',
+            },
+            foreign_keys={'category_id': Category},
+            # Строки рейтингов лидеров создают сигналы, которые
+            # bulk_create не вызывает.
+            finalize=recompute_rankings,
+        ),
+        ImportSpec(
+            name='genres_titles',
+            filename='genre_title.csv',
+            model=Title.genre.through,
+            fields={
+                'id': 'id',
+                'title_id': 'title_id',
+                'genre_id': 'genre_id',
+            },
+            foreign_keys={'title_id': Title, 'genre_id': Genre},
+            unique=(('title_id', 'genre_id'),),
+            finalize=recompute_rankings,
+        ),
+        ImportSpec(
+            name='reviews',
+            filename='review.csv',
+            model=Review,
+            fields={
+                'id': 'id',
+                'title_id': 'title_id',
+                'text': 'text',
+                'author_id': 'author',
+                'score': 'score',
+                'pub_date': 'pub_date',
+            },
+            foreign_keys={'title_id': Title, 'author_id': User},
+            unique=(('author_id', 'title_id'),),
+            # bulk_create не вызывает сигналы, поэтому рейтинг,
+            # распределение оценок и рейтинги лидеров пересчитываются
+            # после импорта.
+            after_import=recalculate_scores,
+            finalize=recompute_rankings,
+        ),
+        ImportSpec(
+            name='comments',
+            filename='comments.csv',
+            model=Comment,
+            fields={
+                'id': 'id',
+                'review_id': 'review_id',
+                'text': 'text',
+                'author_id': 'author',
+                'pub_date': 'pub_date',
+            },
+            foreign_keys={'review_id': Review, 'author_id': User},
+        ),
+    )
+}
+
+
+class ImportResult:
+    """Итоги импорта одного файла."""
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.created = 0
+        self.rejected = []
+        self.elapsed = 0.0
+
+    @property
+    def rows(self):
+        return self.created + len(self.rejected)
+
+    @property
+    def rate(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def reject(self, line, reason):
+        self.rejected.append((line, reason))
+
+
+class CSVImporter:
+    """
+    Потоково читает CSV-файл и записывает его через bulk_create.
+
+    Внешние ключи проверяются по множествам id, загруженным один раз до
+    чтения файла; строки с ошибками пропускаются с указанием причины.
+    Каждая пачка записывается в отдельной транзакции. write_lock
+    позволяет нескольким импортёрам в разных потоках писать по очереди.
+    """
+
+    def __init__(self, spec, data_dir=DEFAULT_DATA_DIR,
+                 batch_size=DEFAULT_BATCH_SIZE, write_lock=None):
+        self.spec = spec
+        self.write_lock = write_lock or nullcontext()
+        self.path = Path(data_dir) / spec.filename
+        self.batch_size = batch_size
+        self.converters = {
+            attname: self._get_converter(attname)
+            for attname in spec.fields
+        }
+
+    def _get_converter(self, attname):
+        field = next(
+            field for field in self.spec.model._meta.concrete_fields
+            if field.attname == attname
+        )
+        nullable = field.null
+        if attname in self.spec.foreign_keys:
+            field = field.target_field
+
+            def convert(value):
+                return field.to_python(value)
+        else:
+            def convert(value):
+                return field.clean(value, None)
+
+        def converter(value):
+            if value == '' and nullable:
+                return None
+            try:
+                return convert(value)
+            except ValidationError as error:
+                raise RowRejected(f'{attname}: {"; ".join(error.messages)}')
+        return converter
+
+    def load_known_keys(self):
+        """Загружает id связанных объектов и уже существующие записи."""
+        self.known_ids = {
+            attname: set(model.objects.values_list('pk', flat=True))
+            for attname, model in self.spec.foreign_keys.items()
+        }
+        manager = self.spec.model._default_manager
+        self.existing_pks = set(manager.values_list('pk', flat=True))
+        self.existing_unique = [
+            set(manager.values_list(*fields)) for fields in self.spec.unique
+        ]
+
+    def build(self, row):
+        values = {}
+        for attname, column in self.spec.fields.items():
+            raw = row.get(column)
+            if raw is None:
+                raise RowRejected(f'нет значения в колонке {column}')
+            values[attname] = self.converters[attname](raw)
+
+        for attname, ids in self.known_ids.items():
+            value = values[attname]
+            if value is not None and value not in ids:
+                raise RowRejected(f'{attname}={value} не найден')
+        pk = values.get('id')
+        if pk in self.existing_pks:
+            raise RowRejected(f'запись с id={pk} уже существует')
+        unique_keys = [
+            tuple(values[attname] for attname in fields)
+            for fields in self.spec.unique
+        ]
+        for fields, key, existing in zip(
+            self.spec.unique, unique_keys, self.existing_unique
+        ):
+            if key in existing:
+                raise RowRejected(
+                    f'нарушена уникальность {", ".join(fields)}: {key}'
+                )
+
+        self.existing_pks.add(pk)
+        for key, existing in zip(unique_keys, self.existing_unique):
+            existing.add(key)
+        return self.spec.model(**values)
+
+    def flush(self, batch, lines, result):
+        with self.write_lock:
+            self._write(batch, lines, result)
+
+    def _write(self, batch, lines, result):
+        manager = self.spec.model._default_manager
+        try:
+            with transaction.atomic():
+                manager.bulk_create(batch)
+            result.created += len(batch)
+            return
+        except IntegrityError:
+            pass
+        # Пачка не записалась целиком: ищем конфликтующие строки.
+        for line, obj in zip(lines, batch):
+            try:
+                with transaction.atomic():
+                    manager.bulk_create([obj])
+                result.created += 1
+            except IntegrityError as error:
+                result.reject(line, str(error))
+
+    def run(self):
+        result = ImportResult(self.spec)
+        started = time.perf_counter()
+        with self.write_lock:
+            self.load_known_keys()
+        batch, lines = [], []
+        with open(self.path, mode='r', encoding='utf-8', newline='') as file:
+            reader = csv.DictReader(file)
+            for row in reader:
+                try:
+                    batch.append(self.build(row))
+                except RowRejected as error:
+                    result.reject(reader.line_num, str(error))
+                    continue
+                lines.append(reader.line_num)
+                if len(batch) >= self.batch_size:
+                    self.flush(batch, lines, result)
+                    batch, lines = [], []
+        if batch:
+            self.flush(batch, lines, result)
+        if self.spec.after_import is not None and result.created:
+            with self.write_lock:
+                self.spec.after_import()
+        result.elapsed = time.perf_counter() - started
+        return result
+
+
+def run_finalizers(results):
+    """
+    Выполняет finalize файлов, в которых были созданы строки, по
+    одному разу для каждой функции.
+    """
+    finalizers = []
+    for result in results:
+        finalize = result.spec.finalize
+        if (
+            finalize is not None and result.created
+            and finalize not in finalizers
+        ):
+            finalizers.append(finalize)
+    for finalize in finalizers:
+        finalize()
+
+
+def get_dependencies(spec):
+    """Возвращает имена файлов, которые нужно загрузить раньше spec."""
+    related_models = set(spec.foreign_keys.values())
+    return {
+        other.name for other in SPECS.values()
+        if other.model in related_models and other is not spec
+    }
+
+
+DEPENDENCIES = {name: get_dependencies(spec) for name, spec in SPECS.items()}
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.importers import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_DATA_DIR,
+    SPECS,
+    CSVImporter,
+    run_finalizers,
+)
+
+
+class ImportCommand(BaseCommand):
+    """Базовая команда импорта CSV-файлов из static/data."""
+
+    spec_names = ()
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--data-dir',
+            default=DEFAULT_DATA_DIR,
+            help='Каталог с CSV-файлами.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Количество строк в одной транзакции.',
+        )
+
+    def get_spec_names(self, options):
+        return self.spec_names
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должен быть больше нуля.')
+        results = []
+        for name in self.get_spec_names(options):
+            importer = CSVImporter(
+                SPECS[name], options['data_dir'], options['batch_size']
+            )
+            if not importer.path.exists():
+                raise CommandError(f'Файл {importer.path} не найден.')
+            results.append(importer.run())
+            self.report(results[-1])
+        run_finalizers(results)
+
+    def report(self, result):
+        for line, reason in result.rejected:
+            self.stderr.write(f'{result.spec.filename}:{line}: {reason}')
+        self.stdout.write(self.style.SUCCESS(
+            f'{result.spec.name}: создано {result.created}, '
+            f'отклонено {len(result.rejected)} '
+            f'за {result.elapsed:.2f} с ({result.rate:.0f} строк/с)'
+        ))
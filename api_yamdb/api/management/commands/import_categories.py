@@ -1,27 +1,6 @@
-import csv
+from api.management.base import ImportCommand
 
-from django.contrib.auth import get_user_model
-from django.core.management.base import BaseCommand
-from django.db.utils import IntegrityError
 
-from reviews.models import Category
-
-
-User = get_user_model()
-
-
-class Command(BaseCommand):
+class Command(ImportCommand):
     help = "Импортирует категории."
-
-    def handle(self, *args, **kwargs):
-        with open('static/data/category.csv', mode='r') as file:
-            csv_reader = csv.DictReader(file)
-            for row in csv_reader:
-                try:
-                    Category.objects.create(
-                        id=row['id'],
-                        name=row['name'],
-                        slug=row['slug'],
-                    )
-                except IntegrityError as e:
-                    print(f'Не удалось добавить жанр по причине: {e}')
+    spec_names = ('categories',)
@@ -0,0 +1,28 @@
+from django.core.management.base import CommandError
+
+from api.importers import SPECS
+from api.management.base import ImportCommand
+
+
+class Command(ImportCommand):
+    help = (
+        "Импортирует CSV-файлы из static/data. Без аргументов загружает "
+        "все файлы в порядке зависимостей."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'names',
+            nargs='*',
+            help=f'Что импортировать: {", ".join(SPECS)}.',
+        )
+        super().add_arguments(parser)
+
+    def get_spec_names(self, options):
+        names = set(options['names'])
+        unknown = names - set(SPECS)
+        if unknown:
+            raise CommandError(
+                f'Неизвестные файлы: {", ".join(sorted(unknown))}.'
+            )
+        return [name for name in SPECS if not names or name in names]
@@ -0,0 +1,129 @@
+import json
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from django.core.management.base import CommandError
+from django.db import connection, connections
+
+from api.importers import DEPENDENCIES, SPECS, CSVImporter, run_finalizers
+from api.management.base import ImportCommand
+
+
+STATE_FILENAME = '.load_all.json'
+
+
+class Command(ImportCommand):
+    help = (
+        "Загружает все CSV-файлы с учётом зависимостей между ними. "
+        "Независимые файлы загружаются параллельно, после сбоя загрузка "
+        "продолжается с незавершённых файлов."
+    )
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=3,
+            help='Количество файлов, загружаемых одновременно.',
+        )
+        parser.add_argument(
+            '--state-file',
+            help=(
+                'Файл с перечнем загруженных файлов; по умолчанию '
+                f'{STATE_FILENAME} в каталоге данных.'
+            ),
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Игнорировать сохранённое состояние и загрузить всё заново.',
+        )
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1:
+            raise CommandError('--workers должен быть больше нуля.')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должен быть больше нуля.')
+        self.options = options
+        self.state_path = Path(
+            options['state_file']
+            or Path(options['data_dir']) / STATE_FILENAME
+        )
+        completed = set() if options['restart'] else self.load_state()
+        for name in sorted(completed):
+            self.stdout.write(f'{name}: уже загружен, пропускаем')
+        for name in SPECS:
+            path = Path(options['data_dir']) / SPECS[name].filename
+            if name not in completed and not path.exists():
+                raise CommandError(f'Файл {path} не найден.')
+
+        # SQLite допускает одного писателя: файлы читаются и разбираются
+        # параллельно, а пачки записываются по очереди.
+        self.write_lock = (
+            threading.Lock() if connection.vendor == 'sqlite' else None
+        )
+        results = []
+        failed = self.load(completed, results)
+        # Загруженные файлы обрабатываются и при сбое остальных.
+        run_finalizers(results)
+        if failed:
+            raise CommandError(
+                f'Не удалось загрузить: {", ".join(sorted(failed))}. '
+                'Повторный запуск продолжит загрузку.'
+            )
+        self.state_path.unlink(missing_ok=True)
+
+    def load(self, completed, results):
+        pending = {name for name in SPECS if name not in completed}
+        failed = set()
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.options['workers']) as pool:
+            while pending or running:
+                ready = [
+                    name for name in SPECS
+                    if name in pending and DEPENDENCIES[name] <= completed
+                ]
+                for name in ready:
+                    pending.discard(name)
+                    running[pool.submit(self.import_file, name)] = name
+                if not running:
+                    # Оставшиеся файлы зависят от незагруженных.
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results.append(future.result())
+                        self.report(results[-1])
+                    except Exception as error:
+                        failed.add(name)
+                        self.stderr.write(f'{name}: ошибка загрузки: {error}')
+                        continue
+                    completed.add(name)
+                    self.save_state(completed)
+        return failed | pending
+
+    def import_file(self, name):
+        try:
+            return CSVImporter(
+                SPECS[name],
+                self.options['data_dir'],
+                self.options['batch_size'],
+                self.write_lock,
+            ).run()
+        finally:
+            # Поток пула открывает собственные соединения с БД.
+            connections.close_all()
+
+    def load_state(self):
+        if not self.state_path.exists():
+            return set()
+        state = json.loads(self.state_path.read_text(encoding='utf-8'))
+        return set(state.get('completed', ())) & set(SPECS)
+
+    def save_state(self, completed):
+        self.state_path.write_text(
+            json.dumps({'completed': sorted(completed)}), encoding='utf-8'
+        )
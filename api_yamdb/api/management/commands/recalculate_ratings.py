@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from reviews.ratings import recalculate_ratings, recalculate_score_counts
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересчитывает сохранённый рейтинг и распределение оценок "
+        "произведений по отзывам."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'title_ids',
+            nargs='*',
+            type=int,
+            help='id произведений; по умолчанию пересчитываются все.',
+        )
+
+    def handle(self, *args, **options):
+        title_ids = options['title_ids'] or None
+        changed = recalculate_ratings(title_ids)
+        rows = recalculate_score_counts(title_ids)
+        self.stdout.write(
+            self.style.SUCCESS(f'Исправлен рейтинг произведений: {changed}')
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f'Строк распределения оценок: {rows}')
+        )
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from api.cache import invalidate_scopes
+from reviews.rankings import get_prior_mean, recompute_rankings
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересчитывает рейтинги лидеров (общий, по категориям и жанрам) "
+        "с текущей средней оценкой. Запускается по расписанию."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Сколько произведений обрабатывать за раз.',
+        )
+
+    def handle(self, *args, **options):
+        count = recompute_rankings(batch_size=options['batch_size'])
+        # Рейтинги лидеров кэшируются в области произведений.
+        invalidate_scopes('titles')
+        self.stdout.write(self.style.SUCCESS(
+            f'Строк рейтингов: {count}, '
+            f'средняя оценка: {get_prior_mean():.3f}'
+        ))
@@ -0,0 +1,382 @@
+import logging
+import random
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from api.cache import get_cache_stats
+
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar('request_metrics', default=None)
+
+PREFIX = 'yamdb'
+QUANTILES = (0.5, 0.9, 0.99, 1.0)
+SLOW_QUERIES_LOGGED = 10
+
+
+def get_metrics_settings():
+    return {
+        'ENABLED': True,
+        'PUBLIC': False,
+        'SLOW_REQUEST_MS': 500,
+        'SLOW_SAMPLE_RATE': 1.0,
+        'SUB_BUCKET_BITS': 5,
+        **getattr(settings, 'METRICS', {}),
+    }
+
+
+class Histogram:
+    """
+    Гистограмма в духе HDR Histogram.
+
+    Значения до 2**bits хранятся точно, большие — в корзинах, ширина
+    которых растёт вместе со значением, так что относительная ошибка
+    не превышает 2**-(bits - 1). Память зависит от диапазона значений,
+    а не от их количества.
+    """
+
+    def __init__(self, bits):
+        self.bits = bits
+        self.mask = (1 << bits) - 1
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def _index(self, value):
+        shift = max(value.bit_length() - self.bits, 0)
+        return (shift << self.bits) | (value >> shift)
+
+    def _upper_bound(self, index):
+        shift = index >> self.bits
+        return (((index & self.mask) + 1) << shift) - 1
+
+    def record(self, value):
+        value = max(int(value), 0)
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, quantile):
+        if not self.count:
+            return 0
+        target = max(1, round(quantile * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._upper_bound(index), self.max)
+        return self.max
+
+
+class RouteMetrics:
+    """Гистограммы одного маршрута: времена в микросекундах."""
+
+    FIELDS = ('total', 'db', 'serializer', 'queries')
+
+    def __init__(self, bits):
+        self.histograms = {field: Histogram(bits) for field in self.FIELDS}
+
+    def record(self, values):
+        for field, value in values.items():
+            self.histograms[field].record(value)
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes = {}
+
+    def record(self, view, method, values):
+        key = (view, method)
+        with self.lock:
+            route = self.routes.get(key)
+            if route is None:
+                route = self.routes[key] = RouteMetrics(
+                    get_metrics_settings()['SUB_BUCKET_BITS']
+                )
+            route.record(values)
+
+    def reset(self):
+        with self.lock:
+            self.routes.clear()
+
+    def snapshot(self):
+        """Возвращает {(view, method): {поле: (квантили, сумма, число)}}."""
+        with self.lock:
+            return {
+                key: {
+                    field: (
+                        [
+                            histogram.percentile(quantile)
+                            for quantile in QUANTILES
+                        ],
+                        histogram.total,
+                        histogram.count,
+                    )
+                    for field, histogram in route.histograms.items()
+                }
+                for key, route in self.routes.items()
+            }
+
+
+registry = MetricsRegistry()
+
+
+class WriteMetrics:
+    """Ожидание блокировки записи и повторы (см. api.writes)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def record(self, wait, retries, failed):
+        """wait — ожидание в секундах, retries — число повторов."""
+        with self.lock:
+            if self.wait is None:
+                self.wait = Histogram(
+                    get_metrics_settings()['SUB_BUCKET_BITS']
+                )
+            self.wait.record(wait * 1e6)
+            self.retries += retries
+            self.failures += failed
+
+    def reset(self):
+        with self.lock:
+            self.wait = None
+            self.retries = 0
+            self.failures = 0
+
+    def snapshot(self):
+        """Возвращает (квантили ожидания, сумма, число, повторы, отказы)."""
+        with self.lock:
+            wait = self.wait or Histogram(1)
+            return (
+                [wait.percentile(quantile) for quantile in QUANTILES],
+                wait.total,
+                wait.count,
+                self.retries,
+                self.failures,
+            )
+
+
+write_metrics = WriteMetrics()
+
+
+class RequestMetrics:
+    """Счётчики одного запроса."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = []
+        self.serializer_time = 0.0
+        self._serializer_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        # Обёртка execute_wrapper: время каждого SQL-запроса.
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((time.perf_counter() - started, sql))
+
+    def time_serializer(self, func):
+        def timed(*args, **kwargs):
+            # Вложенные сериализаторы уже учтены во внешнем вызове.
+            self._serializer_depth += 1
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._serializer_depth -= 1
+                if not self._serializer_depth:
+                    self.serializer_time += time.perf_counter() - started
+        return timed
+
+
+def get_request_metrics():
+    """Счётчики текущего запроса или None, если метрики выключены."""
+    return _current.get()
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Постоянная обёртка SQL-запросов каждого соединения.
+
+    Соединения принадлежат потокам, а асинхронный ORM выполняет запросы
+    в потоках sync_to_async, поэтому обёртка ставится на все соединения
+    и находит счётчики запроса через contextvar.
+    """
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def install_query_recorder(connection):
+    if record_query not in connection.execute_wrappers:
+        # В начало списка: execute_wrapper() снимает последнюю обёртку.
+        connection.execute_wrappers.insert(0, record_query)
+
+
+class MetricsMiddleware:
+    """
+    Собирает по каждому маршруту число SQL-запросов, время БД,
+    время сериализации и полное время ответа.
+
+    Медленные запросы с вероятностью SLOW_SAMPLE_RATE пишутся в лог
+    вместе с самыми долгими SQL-запросами.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics_settings = get_metrics_settings()
+        if not metrics_settings['ENABLED']:
+            return self.get_response(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.record(request, response, metrics, metrics_settings)
+        return response
+
+    async def __acall__(self, request):
+        metrics_settings = get_metrics_settings()
+        if not metrics_settings['ENABLED']:
+            return await self.get_response(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.record(request, response, metrics, metrics_settings)
+        return response
+
+    def record(self, request, response, metrics, metrics_settings):
+        total = time.perf_counter() - metrics.started
+        match = request.resolver_match
+        view = match.view_name if match else 'unmatched'
+        db_time = sum(duration for duration, _ in metrics.queries)
+        registry.record(view, request.method, {
+            'total': total * 1e6,
+            'db': db_time * 1e6,
+            'serializer': metrics.serializer_time * 1e6,
+            'queries': len(metrics.queries),
+        })
+        if (
+            total * 1000 >= metrics_settings['SLOW_REQUEST_MS']
+            and random.random() < metrics_settings['SLOW_SAMPLE_RATE']
+        ):
+            slowest = sorted(metrics.queries, reverse=True)
+            logger.warning(
+                'Медленный запрос %s %s (%s): %.1f мс, SQL: %d за %.1f мс, '
+                'сериализация %.1f мс, статус %s\n%s',
+                request.method, request.get_full_path(), view,
+                total * 1000, len(metrics.queries), db_time * 1000,
+                metrics.serializer_time * 1000, response.status_code,
+                '\n'.join(
+                    f'{duration * 1000:.1f} мс: {sql}'
+                    for duration, sql in slowest[:SLOW_QUERIES_LOGGED]
+                ),
+            )
+
+
+class MetricsMixin:
+    """Учитывает время сериализации и валидации в метриках запроса."""
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        metrics = get_request_metrics()
+        if metrics is not None:
+            serializer.to_representation = metrics.time_serializer(
+                serializer.to_representation
+            )
+            serializer.run_validation = metrics.time_serializer(
+                serializer.run_validation
+            )
+        return serializer
+
+
+def _escape(value):
+    return (
+        str(value).replace('\\', r'\\').replace('"', r'\"')
+        .replace('\n', r'\n')
+    )
+
+
+def _format_float(value):
+    return f'{value:.6g}'
+
+
+def render_prometheus():
+    """Метрики в текстовом формате Prometheus."""
+    descriptions = {
+        'total': (
+            'request_duration_seconds', 1e-6, 'Полное время ответа.'
+        ),
+        'db': ('db_duration_seconds', 1e-6, 'Время SQL-запросов.'),
+        'serializer': (
+            'serializer_duration_seconds', 1e-6,
+            'Время сериализации и валидации.',
+        ),
+        'queries': ('db_queries', 1, 'Число SQL-запросов на ответ.'),
+    }
+    snapshot = registry.snapshot()
+    lines = []
+    for field, (name, scale, help_text) in descriptions.items():
+        metric = f'{PREFIX}_{name}'
+        lines.append(f'# HELP {metric} {help_text}')
+        lines.append(f'# TYPE {metric} summary')
+        for (view, method), fields in sorted(snapshot.items()):
+            values, total, count = fields[field]
+            labels = f'view="{_escape(view)}",method="{_escape(method)}"'
+            for quantile, value in zip(QUANTILES, values):
+                lines.append(
+                    f'{metric}{{{labels},quantile="{quantile}"}} '
+                    f'{_format_float(value * scale)}'
+                )
+            lines.append(
+                f'{metric}_sum{{{labels}}} {_format_float(total * scale)}'
+            )
+            lines.append(f'{metric}_count{{{labels}}} {count}')
+    values, total, count, retries, failures = write_metrics.snapshot()
+    metric = f'{PREFIX}_write_lock_wait_seconds'
+    lines.append(
+        f'# HELP {metric} Ожидание блокировки записи, включая повторы.'
+    )
+    lines.append(f'# TYPE {metric} summary')
+    for quantile, value in zip(QUANTILES, values):
+        lines.append(
+            f'{metric}{{quantile="{quantile}"}} {_format_float(value * 1e-6)}'
+        )
+    lines.append(f'{metric}_sum {_format_float(total * 1e-6)}')
+    lines.append(f'{metric}_count {count}')
+    for name, value in (('retries', retries), ('failures', failures)):
+        metric = f'{PREFIX}_write_lock_{name}_total'
+        lines.append(f'# TYPE {metric} counter')
+        lines.append(f'{metric} {value}')
+    for name, value in get_cache_stats().items():
+        metric = f'{PREFIX}_response_cache_{name}_total'
+        lines.append(f'# TYPE {metric} counter')
+        lines.append(f'{metric} {value}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,182 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.shortcuts import aget_object_or_404
+from rest_framework import serializers
+from rest_framework.generics import get_object_or_404
+
+NO_PREFETCH_ACTIONS = ('update', 'partial_update', 'destroy')
+
+
+def _get_relation(model, source):
+    """Возвращает поле-связь модели по source поля сериализатора."""
+    if model is None or '.' in source:
+        return None
+    try:
+        field = model._meta.get_field(source)
+    except FieldDoesNotExist:
+        return None
+    return field if field.is_relation else None
+
+
+def _collect_lookups(serializer, prefix, select, prefetch, in_prefetch):
+    model = getattr(getattr(serializer, 'Meta', None), 'model', None)
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*':
+            continue
+        relation = _get_relation(model, field.source)
+        if relation is None:
+            continue
+        lookup = f'{prefix}{field.source}'
+        if isinstance(field, serializers.ListSerializer):
+            prefetch.append(lookup)
+            _collect_lookups(
+                field.child, f'{lookup}__', select, prefetch, True
+            )
+        elif isinstance(field, serializers.ManyRelatedField):
+            prefetch.append(lookup)
+        elif isinstance(field, serializers.BaseSerializer):
+            (prefetch if in_prefetch else select).append(lookup)
+            _collect_lookups(
+                field, f'{lookup}__', select, prefetch, in_prefetch
+            )
+        elif isinstance(field, serializers.PrimaryKeyRelatedField):
+            continue
+        elif isinstance(field, serializers.RelatedField):
+            (prefetch if in_prefetch else select).append(lookup)
+
+
+@lru_cache(maxsize=None)
+def get_related_lookups(serializer_class):
+    """
+    Строит план загрузки связей для сериализатора.
+
+    Возвращает пару кортежей (select_related, prefetch_related): связи
+    "один к одному" и "многие к одному" подгружаются JOIN-ом,
+    связи "многие ко многим" и вложенные списки — prefetch-запросом.
+    """
+    select, prefetch = [], []
+    _collect_lookups(serializer_class(), '', select, prefetch, False)
+    return tuple(select), tuple(prefetch)
+
+
+class QueryPlanMixin:
+    """
+    Миксин, подгружающий связи, которые выводит сериализатор действия.
+
+    Исключает N+1 запросов при выдаче вложенных объектов.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        select, prefetch = get_related_lookups(self.get_serializer_class())
+        if select:
+            queryset = queryset.select_related(*select)
+        # UpdateModelMixin сбрасывает prefetch-кэш объекта после
+        # сохранения, а удалению связи не нужны.
+        if prefetch and self.action not in NO_PREFETCH_ACTIONS:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset
+
+
+class NestedResourceMixin:
+    """
+    Миксин для вложенных ресурсов вида /parents/{id}/children/.
+
+    parent_field — внешний ключ модели вьюсета на родителя,
+    parent_lookups — соответствие kwargs URL и фильтров queryset по
+    id предков. Список и отдельные объекты фильтруются по id без
+    загрузки родителя; родитель загружается не больше одного раза за
+    запрос: при создании объекта или чтобы вернуть 404 на пустую
+    страницу несуществующего родителя.
+    """
+
+    parent_field = None
+    parent_lookups = {}
+
+    def get_parent_filters(self):
+        filters = {}
+        for kwarg, lookup in self.parent_lookups.items():
+            if lookup == f'{self.parent_field}_id':
+                lookup = 'pk'
+            else:
+                lookup = lookup.removeprefix(f'{self.parent_field}__')
+            filters[lookup] = self.kwargs.get(kwarg)
+        return filters
+
+    def get_parent_model(self):
+        return self.queryset.model._meta.get_field(
+            self.parent_field
+        ).related_model
+
+    def get_parent(self):
+        if not hasattr(self, '_parent'):
+            self._parent = get_object_or_404(
+                self.get_parent_model(), **self.get_parent_filters()
+            )
+        return self._parent
+
+    async def aget_parent(self):
+        if not hasattr(self, '_parent'):
+            self._parent = await aget_object_or_404(
+                self.get_parent_model(), **self.get_parent_filters()
+            )
+        return self._parent
+
+    def get_queryset(self):
+        return super().get_queryset().filter(**{
+            lookup: self.kwargs.get(kwarg)
+            for kwarg, lookup in self.parent_lookups.items()
+        })
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if not page:
+            # Пустой список: проверяем, что родитель существует.
+            self.get_parent()
+        return page
+
+    async def apaginate_queryset(self, queryset):
+        page = await super().apaginate_queryset(queryset)
+        if not page:
+            await self.aget_parent()
+        return page
+
+
+class ValuesReadMixin:
+    """
+    Миксин, читающий GET-запросы list и retrieve через .values().
+
+    Для этих действий queryset после фильтров превращается в выборку
+    словарей values_serializer_class (см. api.read_serializers), и
+    ответ строится без объектов моделей. get_serializer_class не
+    меняется: формы browsable API и запись используют обычные
+    сериализаторы.
+    """
+
+    values_actions = ('list', 'retrieve')
+    values_serializer_class = None
+
+    def uses_values(self):
+        request = getattr(self, 'request', None)
+        return (
+            self.values_serializer_class is not None
+            and self.action in self.values_actions
+            and request is not None
+            and request.method in ('GET', 'HEAD')
+        )
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if not self.uses_values():
+            return queryset
+        # select_related .values() не учитывает, prefetch не нужен.
+        return self.values_serializer_class.get_values_queryset(
+            queryset.prefetch_related(None)
+        )
+
+    def get_serializer(self, *args, **kwargs):
+        if not self.uses_values():
+            return super().get_serializer(*args, **kwargs)
+        kwargs.setdefault('context', self.get_serializer_context())
+        return self.values_serializer_class(*args, **kwargs)
@@ -0,0 +1,374 @@
+import math
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.paginator import InvalidPage
+from django.db.models import Count, Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    BasePagination,
+    PageNumberPagination,
+    _positive_int,
+)
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+from api.cache import build_list_key, get_response_cache
+from api.replicas import is_read_from_replica
+
+
+def get_pagination_settings():
+    return {
+        'MAX_PAGE_SIZE': 100,
+        # Время жизни кэша количества записей; 0 отключает кэш.
+        'COUNT_CACHE_TIMEOUT': 30,
+        **getattr(settings, 'PAGINATION', {}),
+    }
+
+
+class KeysetPagination(BasePagination):
+    """
+    Курсорная пагинация по (pub_date, id) от новых записей к старым.
+
+    Страница выбирается условием по индексируемому pub_date с id в
+    качестве второго ключа, поэтому дальние страницы стоят столько же,
+    сколько первая, а запрос COUNT(*) не выполняется.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    position_field = 'pub_date'
+    tiebreak_field = 'id'
+    invalid_cursor_message = 'Неверный курсор.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset, cursor = self.get_page_queryset(queryset, request)
+        return self.build_page(list(queryset), cursor)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset, cursor = self.get_page_queryset(queryset, request)
+        return self.build_page([item async for item in queryset], cursor)
+
+    def get_page_queryset(self, queryset, request):
+        """Возвращает срез страницы (с одной лишней записью) и курсор."""
+        self.base_url = request.build_absolute_uri()
+        cursor = self.decode_cursor(request)
+        reverse = cursor is not None and cursor[2]
+
+        position, tiebreak = self.position_field, self.tiebreak_field
+        if reverse:
+            queryset = queryset.order_by(position, tiebreak)
+        else:
+            queryset = queryset.order_by(f'-{position}', f'-{tiebreak}')
+        if cursor is not None:
+            value, pk = cursor[0], cursor[1]
+            lookup = 'gt' if reverse else 'lt'
+            queryset = queryset.filter(
+                Q(**{f'{position}__{lookup}': value})
+                | Q(**{position: value, f'{tiebreak}__{lookup}': pk})
+            )
+        return queryset[:self.page_size + 1], cursor
+
+    def build_page(self, page, cursor):
+        reverse = cursor is not None and cursor[2]
+        has_more = len(page) > self.page_size
+        page = page[:self.page_size]
+        if reverse:
+            page.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, cursor is not None
+
+        self.next_position = (
+            self.get_position(page[-1]) if has_next and page else None
+        )
+        self.previous_position = (
+            self.get_position(page[0]) if has_previous and page else None
+        )
+        return page
+
+    def get_position(self, item):
+        if isinstance(item, dict):
+            return item[self.position_field], item[self.tiebreak_field]
+        return (
+            getattr(item, self.position_field),
+            getattr(item, self.tiebreak_field),
+        )
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = urlsafe_b64decode(encoded.encode('ascii')).decode('ascii')
+            value, pk, reverse = raw.split('|')
+            value = self.parse_position(value)
+            pk = int(pk)
+        except (BinasciiError, UnicodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if value is None or reverse not in ('0', '1'):
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk, reverse == '1'
+
+    def parse_position(self, value):
+        """Значение position_field из курсора или None."""
+        return parse_datetime(value)
+
+    def format_position(self, value):
+        return value.isoformat()
+
+    def encode_cursor(self, position, reverse):
+        value, pk = position
+        raw = f'{self.format_position(value)}|{pk}|{int(reverse)}'
+        return replace_query_param(
+            self.base_url,
+            self.cursor_query_param,
+            urlsafe_b64encode(raw.encode('ascii')).decode('ascii'),
+        )
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position, reverse=False)
+
+    def get_previous_link(self):
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+
+class RankingPagination(KeysetPagination):
+    """
+    Курсорная пагинация рейтингов лидеров.
+
+    Записи идут по убыванию байесовской оценки, при равных оценках —
+    по убыванию id произведения. Оба ключа берутся из строки
+    TitleRanking, поэтому страница читается по индексу рейтинга.
+    Размер страницы задаётся параметром `page_size`, не больше
+    MAX_PAGE_SIZE.
+    """
+
+    position_field = 'leaderboard_score'
+    tiebreak_field = 'leaderboard_title_id'
+    page_size_query_param = 'page_size'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        return await super().apaginate_queryset(queryset, request, view)
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=get_pagination_settings()['MAX_PAGE_SIZE'],
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def parse_position(self, value):
+        value = float(value)
+        return value if math.isfinite(value) else None
+
+    def format_position(self, value):
+        return repr(value)
+
+
+class CountedPagination(PageNumberPagination):
+    """
+    PageNumberPagination с размером страницы от клиента и кэшем COUNT.
+
+    Клиент задаёт размер страницы параметром `page_size`, не больше
+    MAX_PAGE_SIZE из settings.PAGINATION. Количество записей кэшируется
+    на COUNT_CACHE_TIMEOUT секунд для каждого набора фильтров; ключ
+    включает версии областей кэша вьюсета (get_cache_scopes), поэтому
+    запись в модель сбрасывает его сигналами, как и кэш ответов. Если
+    вьюсет уже посчитал записи списка (known_count, см.
+    api.conditional), запрос COUNT(*) не повторяется. Асинхронный
+    вариант читает страницу асинхронным ORM.
+    """
+
+    page_size_query_param = 'page_size'
+
+    @property
+    def max_page_size(self):
+        return get_pagination_settings()['MAX_PAGE_SIZE']
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        count = getattr(view, 'known_count', None)
+        if count is None:
+            count = self.aggregate(
+                queryset, request, view, count=Count('pk')
+            )['count']
+        paginator, number, page_queryset = self.get_page_slice(
+            queryset, request, page_size, count
+        )
+        return self.set_page(paginator, number, list(page_queryset), request)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        count = getattr(view, 'known_count', None)
+        if count is None:
+            count = (await sync_to_async(self.aggregate)(
+                queryset, request, view, count=Count('pk')
+            ))['count']
+        paginator, number, page_queryset = self.get_page_slice(
+            queryset, request, page_size, count
+        )
+        return self.set_page(
+            paginator, number, [item async for item in page_queryset],
+            request,
+        )
+
+    def get_ignored_query_params(self):
+        """Параметры, которые не меняют выборку списка."""
+        return {self.page_query_param, self.page_size_query_param}
+
+    def get_aggregate_key(self, request, view, aggregates):
+        if (
+            not get_pagination_settings()['COUNT_CACHE_TIMEOUT']
+            or not hasattr(view, 'get_cache_scopes')
+        ):
+            return None
+        return build_list_key(
+            request,
+            view.get_cache_scopes(),
+            self.get_ignored_query_params(),
+            repr(sorted(aggregates.items())),
+        )
+
+    def aggregate(self, queryset, request, view, **aggregates):
+        """
+        queryset.aggregate() списка с кэшем на COUNT_CACHE_TIMEOUT.
+
+        Значения общие для всех страниц и размеров страниц одного
+        набора фильтров. Без областей кэша у вьюсета не кэшируются. При
+        чтении с реплики кэш не используется: значения отстающей реплики
+        не должны попасть к остальным клиентам, а значения из default —
+        расходиться со строками страницы с реплики.
+        """
+        key = self.get_aggregate_key(request, view, aggregates)
+        if key is None or is_read_from_replica():
+            return queryset.aggregate(**aggregates)
+        cache = get_response_cache()
+        values = cache.get(key)
+        if values is None:
+            values = queryset.aggregate(**aggregates)
+            cache.set(
+                key, values,
+                get_pagination_settings()['COUNT_CACHE_TIMEOUT'],
+            )
+        return values
+
+    def is_counted(self, request):
+        """Считает ли пагинация все записи списка."""
+        return True
+
+    def get_page_slice(self, queryset, request, page_size, count):
+        """Проверяет номер страницы и возвращает срез queryset."""
+        paginator = self.django_paginator_class(queryset, page_size)
+        # Paginator.count — cached_property: подставляем готовое значение.
+        paginator.count = count
+        page_number = self.get_page_number(request, paginator)
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            ))
+        bottom = (number - 1) * paginator.per_page
+        top = bottom + paginator.per_page
+        if top + paginator.orphans >= paginator.count:
+            top = paginator.count
+        return paginator, number, queryset[bottom:top]
+
+    def set_page(self, paginator, number, objects, request):
+        self.page = paginator._get_page(objects, number, paginator)
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        self.request = request
+        return list(self.page)
+
+
+class FeedPagination(CountedPagination):
+    """
+    Пагинация лент отзывов и комментариев.
+
+    По умолчанию работает как PageNumberPagination (count/next/previous).
+    Параметр `?pagination=cursor` или переданный `cursor` включают
+    курсорную пагинацию KeysetPagination без подсчёта количества.
+    """
+
+    mode_query_param = 'pagination'
+    cursor_mode = 'cursor'
+    keyset_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.get_keyset(request)
+        if self.keyset is not None:
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.get_keyset(request)
+        if self.keyset is not None:
+            return await self.keyset.apaginate_queryset(
+                queryset, request, view
+            )
+        return await super().apaginate_queryset(queryset, request, view)
+
+    def is_counted(self, request):
+        return self.get_keyset(request) is None
+
+    def get_ignored_query_params(self):
+        return {
+            *super().get_ignored_query_params(),
+            self.mode_query_param,
+            self.keyset_class.cursor_query_param,
+        }
+
+    def get_keyset(self, request):
+        if (
+            request.query_params.get(self.mode_query_param)
+            == self.cursor_mode
+            or self.keyset_class.cursor_query_param in request.query_params
+        ):
+            keyset = self.keyset_class()
+            keyset.page_size = self.get_page_size(request)
+            return keyset
+        return None
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_next_link(self):
+        if self.keyset is not None:
+            return self.keyset.get_next_link()
+        return super().get_next_link()
+
+    def get_previous_link(self):
+        if self.keyset is not None:
+            return self.keyset.get_previous_link()
+        return super().get_previous_link()
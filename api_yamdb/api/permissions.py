@@ -1,5 +1,7 @@
 from rest_framework import permissions
 
+from api.metrics import get_metrics_settings
+
 
 class IsAdmin(permissions.BasePermission):
     """Permission, проверяющий, что пользователь - администратор."""
@@ -30,3 +32,13 @@ class IsOwnerModeratorAdminOrReadOnly(permissions.BasePermission):
             or request.user.is_moderator
             or request.user.is_admin
         )
+
+
+class CanReadMetrics(permissions.BasePermission):
+    """
+    Доступ к метрикам: администратору или всем при METRICS['PUBLIC'].
+    """
+    def has_permission(self, request, view):
+        return get_metrics_settings()['PUBLIC'] or (
+            request.user.is_authenticated and request.user.is_admin
+        )
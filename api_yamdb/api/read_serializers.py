@@ -0,0 +1,196 @@
+from collections import defaultdict
+
+from rest_framework import serializers
+
+from reviews.models import Title
+
+
+DATETIME_FIELD = serializers.DateTimeField()
+
+
+class ValuesListSerializer(serializers.ListSerializer):
+    """Список ValuesSerializer: связи догружаются на всю страницу."""
+
+    def prefetch(self):
+        self.child.prefetch(self.instance)
+
+    async def aprefetch(self):
+        await self.child.aprefetch(self.instance)
+
+    def to_representation(self, data):
+        rows = list(data)
+        if not self.child.prefetched:
+            self.child.prefetch(rows)
+        return [self.child.to_representation(row) for row in rows]
+
+
+class ValuesSerializer(serializers.BaseSerializer):
+    """
+    Сериализатор только для чтения строк queryset.values().
+
+    source_fields задаёт поля ответа в порядке вывода и их источники в
+    .values() (например, 'author__username'), converters — функции
+    преобразования значений. Ответ собирается словарём без объектов
+    моделей и полей DRF на каждую запись; вывод совпадает с
+    соответствующим ModelSerializer. Связи, которых нет в .values(),
+    догружаются одним запросом на страницу в prefetch().
+    """
+
+    source_fields = {}
+    converters = {}
+    prefetched = False
+
+    class Meta:
+        list_serializer_class = ValuesListSerializer
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.compiled_fields = tuple(
+            (name, source, cls.converters.get(name))
+            for name, source in cls.source_fields.items()
+        )
+
+    @classmethod
+    def get_values_fields(cls):
+        return tuple(dict.fromkeys(cls.source_fields.values()))
+
+    @classmethod
+    def get_values_queryset(cls, queryset):
+        return queryset.values(*cls.get_values_fields())
+
+    def get_related_queryset(self, rows):
+        """Запрос связей страницы или None, если догружать нечего."""
+        return None
+
+    def set_related(self, related):
+        pass
+
+    def prefetch(self, rows=None):
+        rows = [self.instance] if rows is None else rows
+        queryset = self.get_related_queryset(rows)
+        self.set_related([] if queryset is None else list(queryset))
+        self.prefetched = True
+
+    async def aprefetch(self, rows=None):
+        rows = [self.instance] if rows is None else rows
+        queryset = self.get_related_queryset(rows)
+        self.set_related(
+            [] if queryset is None else [item async for item in queryset]
+        )
+        self.prefetched = True
+
+    def to_representation(self, row):
+        ret = {}
+        for name, source, convert in self.compiled_fields:
+            value = row[source]
+            ret[name] = value if convert is None else convert(value)
+        return ret
+
+
+class CategoryValuesSerializer(ValuesSerializer):
+    """Чтение категорий, как CategorySerializer."""
+
+    source_fields = {'name': 'name', 'slug': 'slug'}
+
+
+class GenreValuesSerializer(ValuesSerializer):
+    """Чтение жанров, как GenreSerializer."""
+
+    source_fields = {'name': 'name', 'slug': 'slug'}
+
+
+class TitleValuesSerializer(ValuesSerializer):
+    """
+    Чтение произведений, как TitleReadSerializer.
+
+    Категория читается JOIN-ом в той же выборке, жанры страницы — одним
+    запросом к промежуточной таблице.
+    """
+
+    source_fields = {
+        'id': 'id',
+        'name': 'name',
+        'year': 'year',
+        'description': 'description',
+        'rating_sum': 'rating_sum',
+        'rating_count': 'rating_count',
+        'category_id': 'category_id',
+        'category__name': 'category__name',
+        'category__slug': 'category__slug',
+    }
+
+    def get_related_queryset(self, rows):
+        return Title.genre.through.objects.filter(
+            title_id__in=[row['id'] for row in rows]
+        ).order_by('title_id', 'genre_id').values_list(
+            'title_id', 'genre__name', 'genre__slug'
+        )
+
+    def set_related(self, related):
+        self.genres = defaultdict(list)
+        for title_id, name, slug in related:
+            self.genres[title_id].append({'name': name, 'slug': slug})
+
+    def to_representation(self, row):
+        if not self.prefetched:
+            self.prefetch([row])
+        count = row['rating_count']
+        category = None
+        if row['category_id'] is not None:
+            category = {
+                'name': row['category__name'],
+                'slug': row['category__slug'],
+            }
+        return {
+            'id': row['id'],
+            'name': row['name'],
+            'year': row['year'],
+            # IntegerField TitleReadSerializer отбрасывает дробную часть.
+            'rating': int(row['rating_sum'] / count) if count else None,
+            'description': row['description'],
+            'category': category,
+            'genre': self.genres.get(row['id'], []),
+        }
+
+
+class LeaderboardValuesSerializer(TitleValuesSerializer):
+    """
+    Произведение в рейтинге лидеров: поля TitleReadSerializer и
+    байесовская оценка bayesian_rating.
+    """
+
+    source_fields = {
+        **TitleValuesSerializer.source_fields,
+        'leaderboard_score': 'leaderboard_score',
+        'leaderboard_title_id': 'leaderboard_title_id',
+    }
+
+    def to_representation(self, row):
+        ret = super().to_representation(row)
+        ret['bayesian_rating'] = round(row['leaderboard_score'], 2)
+        return ret
+
+
+class ReviewValuesSerializer(ValuesSerializer):
+    """Чтение отзывов, как ReviewSerializer."""
+
+    source_fields = {
+        'id': 'id',
+        'text': 'text',
+        'author': 'author__username',
+        'score': 'score',
+        'pub_date': 'pub_date',
+    }
+    converters = {'pub_date': DATETIME_FIELD.to_representation}
+
+
+class CommentValuesSerializer(ValuesSerializer):
+    """Чтение комментариев, как CommentSerializer."""
+
+    source_fields = {
+        'id': 'id',
+        'text': 'text',
+        'author': 'author__username',
+        'pub_date': 'pub_date',
+    }
+    converters = {'pub_date': DATETIME_FIELD.to_representation}
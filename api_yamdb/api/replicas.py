@@ -0,0 +1,141 @@
+import random
+
+from asgiref.local import Local
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework import permissions
+
+
+# Local из asgiref переносит флаг в потоки sync_to_async и обратно.
+_state = Local()
+
+
+def get_replica_settings():
+    return {
+        'DATABASES': [],
+        # Сколько секунд после записи пользователь читает с основной базы.
+        'STICKY_SECONDS': 10,
+        'CACHE_ALIAS': 'default',
+        'KEY_PREFIX': 'replica-sticky',
+        **getattr(settings, 'READ_REPLICAS', {}),
+    }
+
+
+def get_replica_aliases():
+    return list(get_replica_settings()['DATABASES'])
+
+
+def set_read_from_replica(enabled):
+    """
+    Включает чтение с реплики для текущего запроса.
+
+    Реплика выбирается один раз на запрос, чтобы COUNT и строки
+    страницы читались с одной и той же копии.
+    """
+    aliases = get_replica_aliases()
+    _state.replica = random.choice(aliases) if enabled and aliases else None
+
+
+def get_read_replica():
+    return getattr(_state, 'replica', None)
+
+
+def is_read_from_replica():
+    return get_read_replica() is not None
+
+
+def _sticky_key(user):
+    return f'{get_replica_settings()["KEY_PREFIX"]}:{user.pk}'
+
+
+def mark_sticky(user):
+    """Направляет чтения пользователя в основную базу на STICKY_SECONDS."""
+    replica_settings = get_replica_settings()
+    if replica_settings['STICKY_SECONDS'] > 0:
+        caches[replica_settings['CACHE_ALIAS']].set(
+            _sticky_key(user), True, replica_settings['STICKY_SECONDS']
+        )
+
+
+def is_sticky(user):
+    return caches[get_replica_settings()['CACHE_ALIAS']].get(
+        _sticky_key(user), False
+    )
+
+
+class ReplicaRouter:
+    """
+    Направляет чтения в реплики из READ_REPLICAS['DATABASES'].
+
+    Реплика выбирается случайно на весь HTTP-запрос, но только пока
+    обрабатывается чтение вьюсета с ReplicaReadMixin. Остальные
+    чтения и все записи идут в default. Реплики не мигрируются: это
+    копии default, которые обновляет внешняя репликация.
+    """
+
+    def db_for_read(self, model, **hints):
+        return get_read_replica()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *get_replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in get_replica_aliases():
+            return False
+        return None
+
+
+class ReplicaReadMixin:
+    """
+    Чтение вьюсета из реплик с чтением своих записей.
+
+    GET и HEAD после аутентификации и проверки прав выполняются с
+    реплики. Успешный изменяющий запрос закрепляет пользователя за
+    основной базой на STICKY_SECONDS, чтобы он сразу видел свои
+    изменения, пока реплики догоняют default.
+
+    Ответы, прочитанные с реплики, кэш ответов хранит только
+    RESPONSE_CACHE['REPLICA_TIMEOUT'] (см. api.cache).
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        # Флаг сбрасывается при любом исходе, чтобы следующий запрос
+        # потока не унаследовал реплику.
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            set_read_from_replica(False)
+
+    async def async_dispatch(self, request, *args, **kwargs):
+        try:
+            return await super().async_dispatch(request, *args, **kwargs)
+        finally:
+            set_read_from_replica(False)
+
+    def initial(self, request, *args, **kwargs):
+        set_read_from_replica(False)
+        super().initial(request, *args, **kwargs)
+        set_read_from_replica(
+            request.method in permissions.SAFE_METHODS
+            and not (
+                request.user.is_authenticated and is_sticky(request.user)
+            )
+        )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        set_read_from_replica(False)
+        if (
+            get_replica_aliases()
+            and request.method not in permissions.SAFE_METHODS
+            and response.status_code < 400
+            and request.user.is_authenticated
+        ):
+            mark_sticky(request.user)
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from rest_framework.relations import SlugRelatedField
+from rest_framework.settings import api_settings
 from django.contrib.auth.tokens import default_token_generator
+from django.db import IntegrityError, transaction
 from django.shortcuts import get_object_or_404
 
 from reviews.models import Category, Comment, Genre, Review, Title
@@ -53,8 +55,40 @@ class TitleWriteSerializer(serializers.ModelSerializer):
             'genre'
         )
 
+    saved_genres = None
+
+    def create(self, validated_data):
+        genres = validated_data.get('genre')
+        instance = super().create(validated_data)
+        self.saved_genres = self._sorted_genres(genres)
+        return instance
+
+    def update(self, instance, validated_data):
+        genres = validated_data.get('genre')
+        instance = super().update(instance, validated_data)
+        self.saved_genres = self._sorted_genres(genres)
+        return instance
+
+    @staticmethod
+    def _sorted_genres(genres):
+        """
+        Сохранённые жанры без повторов и в порядке чтения из базы
+        (по id), как их вернёт GET-запрос.
+        """
+        if genres is None:
+            return None
+        unique = {genre.pk: genre for genre in genres}
+        return [unique[pk] for pk in sorted(unique)]
+
     def to_representation(self, instance):
-        return TitleReadSerializer(instance).data
+        serializer = TitleReadSerializer(instance)
+        if self.saved_genres is None:
+            return serializer.data
+        # Только что сохранённые жанры не перечитываются из базы.
+        genre_field = serializer.fields.pop('genre')
+        data = serializer.data
+        data['genre'] = genre_field.to_representation(self.saved_genres)
+        return data
 
 
 class TitleReadSerializer(serializers.ModelSerializer):
@@ -92,19 +126,25 @@ class ReviewSerializer(serializers.ModelSerializer):
             'pub_date'
         )
 
-    def validate(self, data):
-        """Валидация только для создания отзыва."""
-
-        request = self.context['request']
-
-        if request.method == 'POST':
-            title = self.context['view'].get_title()
-            user = request.user
-            if Review.objects.filter(author=user, title=title).exists():
-                raise serializers.ValidationError(
-                    'Вы уже оставляли отзыв на это произведение'
-                )
-        return data
+    def create(self, validated_data):
+        """
+        Создаёт отзыв; повторный отзыв отсекает ограничение БД
+        unique_review_per_author, без предварительной проверки.
+        """
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            if not Review.objects.filter(
+                author=validated_data['author'],
+                title=validated_data['title'],
+            ).exists():
+                raise
+        raise serializers.ValidationError({
+            api_settings.NON_FIELD_ERRORS_KEY: [
+                'Вы уже оставляли отзыв на это произведение'
+            ]
+        })
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -181,6 +221,7 @@ class TokenSerializer(serializers.Serializer):
         if not default_token_generator.check_token(user, confirmation_code):
             raise serializers.ValidationError('Неверный код подтверждения.')
 
+        data['user'] = user
         return data
 
 
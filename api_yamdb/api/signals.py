@@ -0,0 +1,99 @@
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api.authentication import revoke_user_claims
+from api.cache import (
+    comments_scope,
+    invalidate_scopes,
+    reviews_scope,
+    title_scopes,
+)
+from api.metrics import install_query_recorder
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.versions import touch_author_entries
+from users.models import YamdbUser
+
+
+def invalidate_on_commit(*scopes):
+    transaction.on_commit(lambda: invalidate_scopes(*scopes))
+
+
+@receiver((post_save, post_delete), sender=Category)
+def invalidate_categories(sender, **kwargs):
+    invalidate_on_commit('categories')
+
+
+@receiver((post_save, post_delete), sender=Genre)
+def invalidate_genres(sender, **kwargs):
+    invalidate_on_commit('genres')
+
+
+@receiver((post_save, post_delete), sender=Title)
+def invalidate_title(sender, instance, **kwargs):
+    invalidate_on_commit(*title_scopes(instance.pk))
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres(sender, instance, **kwargs):
+    if isinstance(instance, Title):
+        invalidate_on_commit(*title_scopes(instance.pk))
+    else:
+        invalidate_on_commit('titles')
+
+
+@receiver((post_save, post_delete), sender=Review)
+def invalidate_review(sender, instance, **kwargs):
+    # Отзыв меняет рейтинг, поэтому сбрасываются и записи произведения.
+    invalidate_on_commit(
+        reviews_scope(instance.title_id),
+        comments_scope(instance.pk),
+        *title_scopes(instance.title_id),
+    )
+
+
+@receiver((post_save, post_delete), sender=Comment)
+def invalidate_comment(sender, instance, **kwargs):
+    invalidate_on_commit(comments_scope(instance.review_id))
+
+
+@receiver(post_save, sender=YamdbUser)
+def handle_user_changes(sender, instance, created, **kwargs):
+    """Отзывает claims токенов и сбрасывает ленты при смене данных."""
+    changed = set() if created else instance.get_changed_fields()
+    instance._loaded_values = {
+        field: instance.__dict__[field]
+        for field in YamdbUser.TRACKED_FIELDS
+        if field in instance.__dict__
+    }
+    if changed & {'role', 'is_superuser', 'is_active'}:
+        revoke_user_claims(instance.pk)
+    if 'username' in changed:
+        revoke_user_claims(instance.pk)
+        touch_author_entries(instance)
+        invalidate_author_feeds(instance)
+
+
+@receiver(post_delete, sender=YamdbUser)
+def revoke_deleted_user_claims(sender, instance, **kwargs):
+    revoke_user_claims(instance.pk)
+
+
+def invalidate_author_feeds(user):
+    """Сбрасывает ленты, в которых выводится изменённый username."""
+    title_ids = Review.objects.filter(author=user).values_list(
+        'title_id', flat=True
+    )
+    review_ids = Comment.objects.filter(author=user).values_list(
+        'review_id', flat=True
+    )
+    invalidate_on_commit(
+        *{reviews_scope(title_id) for title_id in title_ids},
+        *{comments_scope(review_id) for review_id in review_ids},
+    )
+
+
+@receiver(connection_created)
+def record_connection_queries(sender, connection, **kwargs):
+    install_query_recorder(connection)
@@ -2,7 +2,7 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from . import views
-from .views import SignUpView, TokenView, UserViewSet
+from .views import MetricsView, SignUpView, TokenView, UserViewSet
 
 
 v1_router = DefaultRouter()
@@ -20,10 +20,14 @@ v1_router.register(
     basename='comments'
 )
 v1_router.register('users', UserViewSet, basename='users')
+v1_router.register(
+    'leaderboards', views.LeaderboardViewSet, basename='leaderboards'
+)
 
 
 urlpatterns = [
     path('v1/auth/signup/', SignUpView.as_view(), name='signup'),
     path('v1/auth/token/', TokenView.as_view(), name='token'),
+    path('v1/metrics/', MetricsView.as_view(), name='metrics'),
     path('v1/', include(v1_router.urls)),
 ]
@@ -1,23 +1,48 @@
-from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db import transaction
+from django.db.models import F
+from django.http import HttpResponse
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import permissions, status, viewsets
+from rest_framework import mixins, permissions, status, viewsets
 from rest_framework.decorators import action
-from rest_framework.generics import get_object_or_404
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.generics import GenericAPIView, get_object_or_404
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import AccessToken
-from django.db.models import Avg
 
+from api.async_views import AsyncReadMixin
+from api.authentication import RoleAccessToken
+from api.conditional import ConditionalGetMixin
+from api.cache import (
+    ListResponseCacheMixin,
+    ResponseCacheMixin,
+    comments_scope,
+    reviews_scope,
+    title_scope,
+)
 from api.filters import TitleFilter
+from api.metrics import MetricsMixin, render_prometheus
+from api.mixins import NestedResourceMixin, QueryPlanMixin, ValuesReadMixin
+from api.pagination import (
+    CountedPagination,
+    FeedPagination,
+    RankingPagination,
+)
 from api.permissions import (
+    CanReadMetrics,
     IsAdmin,
     IsAdminOrReadOnly,
     IsOwnerModeratorAdminOrReadOnly
 )
+from api.read_serializers import (
+    CategoryValuesSerializer,
+    CommentValuesSerializer,
+    GenreValuesSerializer,
+    LeaderboardValuesSerializer,
+    ReviewValuesSerializer,
+    TitleValuesSerializer,
+)
+from api.replicas import ReplicaReadMixin
 from api.serializers import (
     CategorySerializer,
     CommentSerializer,
@@ -31,8 +56,19 @@ from api.serializers import (
     UserSerializer,
 )
 from api.viewsets import CategoryGenreViewSet
-from reviews.models import Category, Genre, Review, Title
+from api.writes import WriteCoordinatorMixin
+from reviews.models import (
+    Category,
+    Comment,
+    Genre,
+    Review,
+    Title,
+    TitleRanking,
+    TitleScoreCount,
+)
+from reviews.ratings import get_score_stats
 from users.models import YamdbUser
+from users.outbox import enqueue_email
 
 
 class CategoryViewSet(CategoryGenreViewSet):
@@ -40,6 +76,8 @@ class CategoryViewSet(CategoryGenreViewSet):
 
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    values_serializer_class = CategoryValuesSerializer
+    cache_scope = 'categories'
 
 
 class GenreViewSet(CategoryGenreViewSet):
@@ -47,16 +85,28 @@ class GenreViewSet(CategoryGenreViewSet):
 
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
-
-
-class TitleViewSet(viewsets.ModelViewSet):
+    values_serializer_class = GenreValuesSerializer
+    cache_scope = 'genres'
+
+
+class TitleViewSet(
+    MetricsMixin,
+    WriteCoordinatorMixin,
+    ReplicaReadMixin,
+    ResponseCacheMixin,
+    ConditionalGetMixin,
+    AsyncReadMixin,
+    ValuesReadMixin,
+    QueryPlanMixin,
+    viewsets.ModelViewSet
+):
     """ViewSet, реализующий CRUD к модели Title."""
 
-    queryset = Title.objects.all().annotate(
-        rating=Avg('reviews__score'))
+    queryset = Title.objects.all()
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
-    pagination_class = PageNumberPagination
+    values_serializer_class = TitleValuesSerializer
+    pagination_class = CountedPagination
     http_method_names = ('get', 'post', 'patch', 'delete', 'head', 'options')
     permission_classes = (IsAdminOrReadOnly,)
 
@@ -65,76 +115,171 @@ class TitleViewSet(viewsets.ModelViewSet):
             return TitleReadSerializer
         return TitleWriteSerializer
 
-
-class ReviewViewSet(viewsets.ModelViewSet):
+    def get_cache_scopes(self):
+        if self.action == 'retrieve':
+            scope = title_scope(self.kwargs[self.lookup_field])
+        else:
+            scope = 'titles'
+        return (scope, 'categories', 'genres')
+
+    @action(detail=True, methods=['get'])
+    def stats(self, request, pk=None):
+        """Распределение оценок, среднее и медиана отзывов произведения."""
+        title = get_object_or_404(Title.objects.only('id'), pk=pk)
+        counts = dict(
+            TitleScoreCount.objects.filter(title=title).values_list(
+                'score', 'count'
+            )
+        )
+        return Response({'id': title.id, **get_score_stats(counts)})
+
+
+class ReviewViewSet(
+    MetricsMixin,
+    WriteCoordinatorMixin,
+    ReplicaReadMixin,
+    ResponseCacheMixin,
+    ConditionalGetMixin,
+    NestedResourceMixin,
+    AsyncReadMixin,
+    ValuesReadMixin,
+    QueryPlanMixin,
+    viewsets.ModelViewSet
+):
     """ViewSet, реализующий CRUD к модели Review."""
 
+    queryset = Review.objects.all()
     serializer_class = ReviewSerializer
+    values_serializer_class = ReviewValuesSerializer
+    pagination_class = FeedPagination
     permission_classes = (
         permissions.IsAuthenticatedOrReadOnly,
         IsOwnerModeratorAdminOrReadOnly,
     )
     http_method_names = ('get', 'post', 'patch', 'delete', 'head', 'options')
+    parent_field = 'title'
+    parent_lookups = {'title_id': 'title_id'}
 
-    def get_title(self):
-        return get_object_or_404(Title, id=self.kwargs.get('title_id'))
-
-    def get_queryset(self):
-        return self.get_title().reviews.all()
+    def get_cache_scopes(self):
+        return (reviews_scope(self.kwargs.get('title_id')),)
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, title=self.get_title())
-
-
-class CommentViewSet(viewsets.ModelViewSet):
+        serializer.save(author=self.request.user, title=self.get_parent())
+
+
+class CommentViewSet(
+    MetricsMixin,
+    WriteCoordinatorMixin,
+    ReplicaReadMixin,
+    ResponseCacheMixin,
+    ConditionalGetMixin,
+    NestedResourceMixin,
+    AsyncReadMixin,
+    ValuesReadMixin,
+    QueryPlanMixin,
+    viewsets.ModelViewSet
+):
     """ViewSet, реализующий CRUD к модели Comment."""
 
+    queryset = Comment.objects.all()
     serializer_class = CommentSerializer
+    values_serializer_class = CommentValuesSerializer
+    pagination_class = FeedPagination
     permission_classes = (
         permissions.IsAuthenticatedOrReadOnly,
         IsOwnerModeratorAdminOrReadOnly,
     )
     http_method_names = ('get', 'post', 'patch', 'delete', 'head', 'options')
+    parent_field = 'review'
+    parent_lookups = {
+        'title_id': 'review__title_id',
+        'review_id': 'review_id',
+    }
 
-    def get_review(self):
-        return get_object_or_404(
-            Review,
-            id=self.kwargs.get('review_id'),
-            title_id=self.kwargs.get('title_id')
-        )
+    def get_cache_scopes(self):
+        return (comments_scope(self.kwargs.get('review_id')),)
+
+    def perform_create(self, serializer):
+        serializer.save(author=self.request.user, review=self.get_parent())
+
+
+class LeaderboardViewSet(
+    MetricsMixin,
+    ReplicaReadMixin,
+    ListResponseCacheMixin,
+    mixins.ListModelMixin,
+    viewsets.GenericViewSet
+):
+    """
+    Рейтинги лидеров: общий, по категории и по жанру.
+
+    Произведения отдаются по убыванию байесовской оценки из
+    материализованной таблицы TitleRanking (см. reviews.rankings)
+    страницами по курсору: страница читается по индексу без сортировки
+    и подсчёта всех произведений.
+    """
+
+    serializer_class = LeaderboardValuesSerializer
+    pagination_class = RankingPagination
+    permission_classes = (IsAdminOrReadOnly,)
+    http_method_names = ('get', 'head', 'options')
+    cache_actions = ('list', 'category', 'genre')
+    group = (TitleRanking.ALL, 0)
+
+    def get_cache_scopes(self):
+        return ('titles', 'categories', 'genres')
 
     def get_queryset(self):
-        return self.get_review().comments.all()
+        kind, group_id = self.group
+        return LeaderboardValuesSerializer.get_values_queryset(
+            Title.objects.filter(
+                rankings__kind=kind,
+                rankings__group_id=group_id,
+                rankings__score__isnull=False,
+            ).annotate(
+                leaderboard_score=F('rankings__score'),
+                leaderboard_title_id=F('rankings__title_id'),
+            )
+        )
 
-    def perform_create(self, serializer):
-        serializer.save(author=self.request.user, review=self.get_review())
+    @action(detail=False, url_path=r'categories/(?P<slug>[-\w]+)')
+    def category(self, request, slug):
+        category = get_object_or_404(Category.objects.only('id'), slug=slug)
+        self.group = (TitleRanking.CATEGORY, category.id)
+        return self.list(request)
 
+    @action(detail=False, url_path=r'genres/(?P<slug>[-\w]+)')
+    def genre(self, request, slug):
+        genre = get_object_or_404(Genre.objects.only('id'), slug=slug)
+        self.group = (TitleRanking.GENRE, genre.id)
+        return self.list(request)
 
-class SignUpView(APIView):
+
+class SignUpView(MetricsMixin, WriteCoordinatorMixin, GenericAPIView):
     """API View для регистрации новых пользователей."""
     permission_classes = (permissions.AllowAny,)
+    serializer_class = SignUpSerializer
 
     def post(self, request):
-        serializer = SignUpSerializer(data=request.data)
+        serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
         email = serializer.validated_data['email']
         username = serializer.validated_data['username']
 
-        user, created = YamdbUser.objects.get_or_create(
-            email=email,
-            username=username,
-        )
+        with transaction.atomic():
+            user, created = YamdbUser.objects.get_or_create(
+                email=email,
+                username=username,
+            )
 
-        confirmation_code = default_token_generator.make_token(user)
+            confirmation_code = default_token_generator.make_token(user)
 
-        send_mail(
-            subject='Код подтверждения',
-            message=f'Ваш код: {confirmation_code}',
-            from_email=settings.EMAIL_HOST_USER,
-            recipient_list=[user.email],
-            fail_silently=False,
-        )
+            enqueue_email(
+                recipient=user.email,
+                subject='Код подтверждения',
+                message=f'Ваш код: {confirmation_code}',
+            )
 
         return Response(
             {'email': user.email, 'username': user.username},
@@ -142,33 +287,29 @@ class SignUpView(APIView):
         )
 
 
-class TokenView(APIView):
+class TokenView(MetricsMixin, WriteCoordinatorMixin, GenericAPIView):
     """API View для получения JWT-токена."""
     permission_classes = (permissions.AllowAny,)
+    serializer_class = TokenSerializer
 
     def post(self, request):
-        serializer = TokenSerializer(data=request.data)
+        serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        username = serializer.validated_data['username']
-        confirmation_code = serializer.validated_data['confirmation_code']
+        user = serializer.validated_data['user']
+        # last_login входит в хэш кода подтверждения: его обновление
+        # делает код одноразовым, остальные поля не перезаписываются.
+        user.last_login = timezone.now()
+        user.save(update_fields=('last_login',))
 
-        user = get_object_or_404(YamdbUser, username=username)
-
-        if not default_token_generator.check_token(user, confirmation_code):
-            return Response(
-                {'error': 'Неверный код подтверждения.'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        user.save()
-
-        token = AccessToken.for_user(user)
+        token = RoleAccessToken.for_user(user)
 
         return Response({'token': str(token)}, status=status.HTTP_200_OK)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(
+    MetricsMixin, WriteCoordinatorMixin, viewsets.ModelViewSet
+):
     """ViewSet для управления пользователями."""
     queryset = YamdbUser.objects.all()
     serializer_class = UserSerializer
@@ -190,16 +331,30 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer_class=UserMeSerializer
     )
     def me(self, request):
+        # request.user может быть собран из claims токена без полей
+        # профиля, поэтому профиль читается из БД одним запросом.
+        user = get_object_or_404(YamdbUser, pk=request.user.pk)
         if request.method == 'GET':
-            serializer = self.get_serializer(request.user)
+            serializer = self.get_serializer(user)
             return Response(serializer.data)
 
         elif request.method == 'PATCH':
             serializer = self.get_serializer(
-                request.user,
+                user,
                 data=request.data,
                 partial=True
             )
             serializer.is_valid(raise_exception=True)
             serializer.save()
             return Response(serializer.data)
+
+
+class MetricsView(APIView):
+    """Метрики API в текстовом формате Prometheus."""
+    permission_classes = (CanReadMetrics,)
+
+    def get(self, request):
+        return HttpResponse(
+            render_prometheus(),
+            content_type='text/plain; version=0.0.4; charset=utf-8',
+        )
@@ -1,16 +1,28 @@
-from rest_framework import filters
 from rest_framework.mixins import (
     CreateModelMixin,
     DestroyModelMixin,
     ListModelMixin
 )
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.viewsets import GenericViewSet
 
+from api.cache import ListResponseCacheMixin
+from api.conditional import ListConditionalGetMixin
+from api.filters import FullTextSearchFilter
+from api.metrics import MetricsMixin
+from api.mixins import ValuesReadMixin
+from api.pagination import CountedPagination
 from api.permissions import IsAdminOrReadOnly
+from api.replicas import ReplicaReadMixin
+from api.writes import WriteCoordinatorMixin
 
 
 class CategoryGenreViewSet(
+    MetricsMixin,
+    WriteCoordinatorMixin,
+    ReplicaReadMixin,
+    ListResponseCacheMixin,
+    ListConditionalGetMixin,
+    ValuesReadMixin,
     GenericViewSet,
     ListModelMixin,
     CreateModelMixin,
@@ -18,8 +30,12 @@ class CategoryGenreViewSet(
 ):
     """Миксин для получения списка объектов, создания и удаления объекта."""
 
-    filter_backends = (filters.SearchFilter,)
+    filter_backends = (FullTextSearchFilter,)
     search_fields = ('name',)
-    pagination_class = PageNumberPagination
+    pagination_class = CountedPagination
     lookup_field = 'slug'
     permission_classes = (IsAdminOrReadOnly,)
+    cache_scope = None
+
+    def get_cache_scopes(self):
+        return (self.cache_scope,)
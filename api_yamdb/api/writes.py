@@ -0,0 +1,138 @@
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    OperationalError,
+    connections,
+    transaction,
+)
+from rest_framework import permissions, status
+from rest_framework.exceptions import APIException
+
+from api.metrics import write_metrics
+
+
+_write_lock = threading.Lock()
+
+
+def get_write_settings():
+    return {
+        'ENABLED': True,
+        # Общее время на ожидание блокировки и повторы одной записи.
+        'RETRY_BUDGET_MS': 10000,
+        'BACKOFF_MS': 10,
+        'MAX_BACKOFF_MS': 500,
+        # Записи процесса выполняются по одной (очередь на Lock).
+        'SERIALIZE': False,
+        **getattr(settings, 'WRITE_COORDINATOR', {}),
+    }
+
+
+class DatabaseBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'База данных занята, повторите запрос позже.'
+    default_code = 'database_busy'
+
+
+def is_locked_error(exc):
+    message = str(exc).lower()
+    return 'database is locked' in message or 'database is busy' in message
+
+
+def get_backoff(attempt, write_settings):
+    """Случайная пауза (full jitter) с экспоненциальным пределом, в с."""
+    limit = min(
+        write_settings['MAX_BACKOFF_MS'],
+        write_settings['BACKOFF_MS'] * 2 ** attempt,
+    )
+    return random.uniform(0, limit) / 1000
+
+
+def run_write(func, using=DEFAULT_DB_ALIAS):
+    """
+    Выполняет func в транзакции записи с повторами при блокировке.
+
+    Транзакция начинается с BEGIN IMMEDIATE (OPTIONS transaction_mode),
+    поэтому блокировка записи берётся до первого чтения и SQLite не
+    обрывает транзакцию посередине. При "database is locked" транзакция
+    откатывается, а func повторяется после случайной паузы, пока не
+    исчерпан RETRY_BUDGET_MS; затем клиент получает 503. Повтор
+    безопасен: обработчики on_commit выполняются только после
+    успешной фиксации. Внутри внешней транзакции и на других СУБД func
+    выполняется в обычном atomic без повторов, при ENABLED=False — как
+    есть.
+    """
+    write_settings = get_write_settings()
+    if not write_settings['ENABLED']:
+        return func()
+    connection = connections[using]
+    if connection.vendor != 'sqlite' or connection.in_atomic_block:
+        with transaction.atomic(using=using):
+            return func()
+
+    started = time.perf_counter()
+    deadline = started + write_settings['RETRY_BUDGET_MS'] / 1000
+    if not write_settings['SERIALIZE']:
+        return _retry_write(func, using, write_settings, started, deadline)
+    if not _write_lock.acquire(timeout=max(deadline - started, 0)):
+        write_metrics.record(time.perf_counter() - started, 0, failed=True)
+        raise DatabaseBusy
+    try:
+        return _retry_write(func, using, write_settings, started, deadline)
+    finally:
+        _write_lock.release()
+
+
+def _retry_write(func, using, write_settings, started, deadline):
+    wait = time.perf_counter() - started
+    attempt = 0
+    while True:
+        begin = time.perf_counter()
+        begun = False
+        try:
+            with transaction.atomic(using=using):
+                wait += time.perf_counter() - begin
+                begun = True
+                result = func()
+        except OperationalError as exc:
+            if not begun:
+                wait += time.perf_counter() - begin
+            if not is_locked_error(exc):
+                raise
+            attempt += 1
+            delay = get_backoff(attempt, write_settings)
+            if time.perf_counter() + delay >= deadline:
+                write_metrics.record(wait, attempt, failed=True)
+                raise DatabaseBusy from exc
+            time.sleep(delay)
+            wait += delay
+            continue
+        write_metrics.record(wait, attempt, failed=False)
+        return result
+
+
+class WriteCoordinatorMixin:
+    """
+    Выполняет обработчики изменяющих запросов через run_write.
+
+    POST, PUT, PATCH и DELETE, включая дополнительные действия
+    вьюсета, выполняются в одной транзакции записи с повтором при
+    блокировке SQLite. Права проверяются до начала транзакции, тело
+    запроса разбирается один раз: при повторе request.data берётся из
+    кэша DRF.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        method = request.method.lower()
+        handler = getattr(self, method, None)
+        if (
+            request.method not in permissions.SAFE_METHODS
+            and handler is not None
+        ):
+            setattr(self, method, lambda *args, **kwargs: run_write(
+                lambda: handler(*args, **kwargs)
+            ))
+        return super().dispatch(request, *args, **kwargs)
@@ -4,5 +4,7 @@ from django.core.asgi import get_asgi_application
 
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+# Под ASGI списки и объекты каталога читаются асинхронными представлениями.
+os.environ.setdefault('ASYNC_READS', 'True')
 
 application = get_asgi_application()
@@ -25,6 +25,16 @@ EMAIL_USE_SSL = True
 EMAIL_HOST_USER = os.getenv('EMAIL_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_PASSWORD')
 
+# Письма ставятся в очередь и отправляются командой send_emails.
+# EAGER отправляет их сразу после фиксации транзакции (без обработчика),
+# то есть в запросе, поэтому по умолчанию выключен.
+EMAIL_OUTBOX = {
+    'EAGER': os.getenv('EMAIL_OUTBOX_EAGER', 'False') == 'True',
+    'BATCH_SIZE': 100,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_DELAY': 30,
+}
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -43,6 +53,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -80,7 +91,111 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Соединение переиспользуется запросами одного потока. Под ASGI
+        # синхронный код идёт в потоках запросов, там лучше 0.
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
+        # Транзакции сразу берут блокировку записи (см. api.writes).
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE'},
+    }
+}
+
+# Реплики для чтения каталога: пути к копиям базы через запятую.
+# Копии обновляет внешняя репликация (для SQLite — копирование файла).
+READ_REPLICAS = {
+    'DATABASES': [],
+    'STICKY_SECONDS': int(os.getenv('DB_REPLICA_STICKY_SECONDS', 10)),
+}
+for index, name in enumerate(
+    filter(None, os.getenv('DB_REPLICAS', '').split(',')), 1
+):
+    alias = f'replica{index}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'NAME': name.strip(),
+        'OPTIONS': {},
+        'TEST': {'MIRROR': 'default'},
     }
+    READ_REPLICAS['DATABASES'].append(alias)
+
+DATABASE_ROUTERS = ['api.replicas.ReplicaRouter']
+
+# PRAGMA каждого нового соединения SQLite (см. reviews.sqlite);
+# None отключает PRAGMA.
+SQLITE_PRAGMAS = {
+    'busy_timeout': 5000,
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'cache_size': -64 * 1024,
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'memory',
+}
+
+
+# Cache
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'api-yamdb',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+    # Метки claims пользователей: общий для всех процессов кэш отдельно
+    # от кэша ответов, чтобы ответы их не вытесняли. По умолчанию —
+    # файловый кэш; для нескольких серверов — Redis или Memcached.
+    'auth': {
+        'BACKEND': os.getenv(
+            'AUTH_CACHE_BACKEND',
+            'django.core.cache.backends.filebased.FileBasedCache',
+        ),
+        'LOCATION': os.getenv(
+            'AUTH_CACHE_LOCATION', str(BASE_DIR / 'tmp/auth-cache')
+        ),
+        'OPTIONS': {
+            'MAX_ENTRIES': 100000,
+        },
+    },
+}
+
+# Асинхронные list и retrieve каталога (api.async_views). Выигрыш есть
+# только под ASGI: api_yamdb.asgi включает их через переменную окружения.
+ASYNC_READS = {
+    'ENABLED': os.getenv('ASYNC_READS', 'False') == 'True',
+}
+
+# Ответы, прочитанные с реплики, хранятся REPLICA_TIMEOUT секунд, чтобы
+# страница отстающей реплики быстро вытеснялась из общего кэша.
+RESPONSE_CACHE = {
+    'ENABLED': True,
+    'ALIAS': 'default',
+    'TIMEOUT': 60,
+    'REPLICA_TIMEOUT': 5,
+}
+
+# Изменяющие запросы: повторы при "database is locked" в пределах
+# RETRY_BUDGET_MS; SERIALIZE выполняет записи процесса по одной.
+WRITE_COORDINATOR = {
+    'ENABLED': True,
+    'RETRY_BUDGET_MS': 10000,
+    'SERIALIZE': os.getenv('WRITE_SERIALIZE', 'False') == 'True',
+}
+
+# Размер страницы задаётся параметром page_size; количество записей
+# списков кэшируется на COUNT_CACHE_TIMEOUT секунд (0 — без кэша).
+PAGINATION = {
+    'MAX_PAGE_SIZE': 100,
+    'COUNT_CACHE_TIMEOUT': 30,
+}
+
+METRICS = {
+    'ENABLED': os.getenv('METRICS_ENABLED', 'True') == 'True',
+    # True открывает /api/v1/metrics/ без авторизации: только если
+    # эндпоинт закрыт от внешней сети.
+    'PUBLIC': os.getenv('METRICS_PUBLIC', 'False') == 'True',
+    'SLOW_REQUEST_MS': int(os.getenv('METRICS_SLOW_REQUEST_MS', 500)),
+    'SLOW_SAMPLE_RATE': 1.0,
 }
 
 
@@ -125,13 +240,31 @@ AUTH_USER_MODEL = 'users.YamdbUser'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.ClaimsJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.CountedPagination',
     'PAGE_SIZE': 5,
+    # orjson, если установлен, иначе стандартный json.
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+# Claims роли в JWT принимаются без запроса к БД, пока совпадают с меткой
+# пользователя в кэше CACHE_ALIAS; метка живёт MARKER_SECONDS и удаляется
+# при изменении пользователя.
+AUTH_CLAIMS = {
+    'MARKER_SECONDS': 60,
+    'CACHE_ALIAS': 'auth',
 }
 
 SIMPLE_JWT = {
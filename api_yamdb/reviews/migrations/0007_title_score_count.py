@@ -0,0 +1,58 @@
+# Generated by Django 5.1.1 on 2026-10-18 19:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+from reviews.constants import MAX_VALUE_VALIDATOR, MIN_VALUE_VALIDATOR
+
+
+def fill_score_counts(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    Title = apps.get_model('reviews', 'Title')
+    TitleScoreCount = apps.get_model('reviews', 'TitleScoreCount')
+    totals = {
+        (row['title_id'], row['score']): row['score_count']
+        for row in Review.objects.values('title_id', 'score')
+        .annotate(score_count=Count('id'))
+        .order_by()
+    }
+    TitleScoreCount.objects.bulk_create(
+        (
+            TitleScoreCount(
+                title_id=title_id,
+                score=score,
+                count=totals.get((title_id, score), 0),
+            )
+            for title_id in Title.objects.values_list('id', flat=True)
+            for score in range(MIN_VALUE_VALIDATOR, MAX_VALUE_VALIDATOR + 1)
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleScoreCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.PositiveSmallIntegerField(verbose_name='оценка')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='количество отзывов')),
+                ('title', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='reviews.title', verbose_name='произведение')),
+            ],
+            options={
+                'verbose_name': 'распределение оценок',
+                'verbose_name_plural': 'Распределения оценок',
+                'ordering': ('title', 'score'),
+                'default_related_name': 'score_counts',
+                'constraints': [models.UniqueConstraint(fields=('title', 'score'), name='unique_score_count_per_title')],
+            },
+        ),
+        migrations.RunPython(fill_score_counts, migrations.RunPython.noop),
+    ]
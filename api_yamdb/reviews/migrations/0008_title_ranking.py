@@ -0,0 +1,79 @@
+# Generated by Django 5.1.1 on 2026-10-18 19:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+# Значения LEADERBOARD по умолчанию; при других настройках рейтинги
+# пересчитываются командой recompute_rankings.
+PRIOR_COUNT = 10
+MIN_REVIEWS = 1
+
+
+def fill_rankings(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    TitleRanking = apps.get_model('reviews', 'TitleRanking')
+    totals = Title.objects.aggregate(
+        score_sum=Sum('rating_sum'), score_count=Sum('rating_count')
+    )
+    prior_mean = 5.5
+    if totals['score_count']:
+        prior_mean = totals['score_sum'] / totals['score_count']
+    genres = {}
+    for title_id, genre_id in Title.genre.through.objects.values_list(
+        'title_id', 'genre_id'
+    ):
+        genres.setdefault(title_id, []).append(genre_id)
+    rankings = []
+    for title in Title.objects.only(
+        'id', 'category_id', 'rating_sum', 'rating_count'
+    ).iterator():
+        score = None
+        if title.rating_count >= MIN_REVIEWS:
+            score = (title.rating_sum + PRIOR_COUNT * prior_mean) / (
+                title.rating_count + PRIOR_COUNT
+            )
+        groups = [('all', 0)]
+        if title.category_id is not None:
+            groups.append(('category', title.category_id))
+        groups.extend(
+            ('genre', genre_id) for genre_id in genres.get(title.id, ())
+        )
+        rankings.extend(
+            TitleRanking(
+                title_id=title.id, kind=kind, group_id=group_id,
+                score=score, prior_mean=prior_mean,
+            )
+            for kind, group_id in groups
+        )
+    TitleRanking.objects.bulk_create(rankings, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_title_score_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleRanking',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('all', 'все произведения'), ('category', 'категория'), ('genre', 'жанр')], max_length=8, verbose_name='рейтинг')),
+                ('group_id', models.PositiveIntegerField(default=0, verbose_name='группа')),
+                ('score', models.FloatField(null=True, verbose_name='байесовская оценка')),
+                ('prior_mean', models.FloatField(verbose_name='средняя оценка')),
+                ('title', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='reviews.title', verbose_name='произведение')),
+            ],
+            options={
+                'verbose_name': 'место в рейтинге',
+                'verbose_name_plural': 'Рейтинги произведений',
+                'default_related_name': 'rankings',
+                'indexes': [models.Index(fields=['kind', 'group_id', 'score', 'title'], name='ranking_kind_group_score_idx')],
+                'constraints': [models.UniqueConstraint(fields=('title', 'kind', 'group_id'), name='unique_ranking_per_title_group')],
+            },
+        ),
+        migrations.RunPython(fill_rankings, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,5 @@
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
 
 from api_yamdb.settings import AUTH_USER_MODEL
 from reviews.constants import (
@@ -13,11 +13,17 @@ from reviews.validators import validate_year
 
 
 class BaseNameModel(models.Model):
-    """Абстрактная модель с именем."""
+    """Абстрактная модель с именем и временем последнего изменения."""
     name = models.CharField(
         max_length=NAME_STR_LENGTH,
         verbose_name='Название'
     )
+    # Валидатор условных GET-запросов (ETag, Last-Modified): обновляется
+    # и при изменении связанных записей, которые выводятся в ответе.
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения'
+    )
 
     class Meta:
         abstract = True
@@ -67,6 +73,18 @@ class Title(BaseNameModel):
         on_delete=models.SET_NULL,
         verbose_name='Категория',
         null=True,
+        # Покрывается индексом (category, name, year).
+        db_index=False,
+    )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Сумма оценок',
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок',
     )
 
     class Meta:
@@ -74,10 +92,45 @@ class Title(BaseNameModel):
         verbose_name_plural = 'Произведения'
         default_related_name = 'titles'
         ordering = ('name', 'year')
+        # Индексы повторяют сортировку списка произведений, чтобы
+        # фильтры по категории и году не сортировали выборку.
+        indexes = [
+            models.Index(
+                fields=('name', 'year'), name='title_name_year_idx'
+            ),
+            models.Index(
+                fields=('category', 'name', 'year'),
+                name='title_category_name_idx',
+            ),
+            models.Index(
+                fields=('year', 'name'), name='title_year_name_idx'
+            ),
+        ]
+
+    # Меняются только через F()-выражения в reviews.ratings.
+    RATING_FIELDS = frozenset(('rating_sum', 'rating_count'))
 
     def __str__(self):
         return f'Произведение - {self.name}'
 
+    def save(self, *args, **kwargs):
+        # Обычное сохранение не перезаписывает рейтинг загруженными
+        # значениями: иначе теряются приращения параллельных отзывов.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.RATING_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    @property
+    def rating(self):
+        """Средняя оценка произведения или None, если отзывов нет."""
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
 
 class Review(BaseNameModel):
     """Модель отзыва."""
@@ -92,7 +145,9 @@ class Review(BaseNameModel):
         Title,
         on_delete=models.CASCADE,
         verbose_name='произведение',
-        help_text='Для какого произведения отзыв'
+        help_text='Для какого произведения отзыв',
+        # Покрывается индексом (title, pub_date, id).
+        db_index=False,
     )
     text = models.TextField(
         verbose_name='текст',
@@ -124,6 +179,14 @@ class Review(BaseNameModel):
         verbose_name_plural = 'Отзывы'
         ordering = ('-pub_date',)
         default_related_name = 'reviews'
+        # Лента отзывов произведения читается по индексу в порядке
+        # pub_date, id без сортировки всех отзывов.
+        indexes = [
+            models.Index(
+                fields=('title', 'pub_date', 'id'),
+                name='review_title_pub_date_idx',
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['author', 'title'],
@@ -134,6 +197,20 @@ class Review(BaseNameModel):
     def __str__(self):
         return self.text[:REVIEW_STR_LENGTH]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Запоминаем загруженную оценку, чтобы при сохранении
+        # пересчитать рейтинг произведения только на разницу.
+        instance._loaded_score = instance.__dict__.get('score')
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Отзыв и рейтинг произведения сохраняются в одной транзакции:
+        # рейтинг обновляется в обработчике post_save.
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+
 
 class Comment(BaseNameModel):
     """Модель комментария."""
@@ -148,7 +225,9 @@ class Comment(BaseNameModel):
         Review,
         on_delete=models.CASCADE,
         verbose_name='отзыв',
-        help_text='Для какого отзыва комментарий'
+        help_text='Для какого отзыва комментарий',
+        # Покрывается индексом (review, pub_date, id).
+        db_index=False,
     )
     text = models.TextField(
         verbose_name='текст',
@@ -166,6 +245,107 @@ class Comment(BaseNameModel):
         verbose_name_plural = 'Комментарии'
         ordering = ('-pub_date',)
         default_related_name = 'comments'
+        indexes = [
+            models.Index(
+                fields=('review', 'pub_date', 'id'),
+                name='comment_review_pub_date_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.text[:COMMENT_STR_LENGTH]
+
+
+class TitleScoreCount(models.Model):
+    """Число отзывов произведения с данной оценкой."""
+
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        verbose_name='произведение',
+        # Покрывается уникальным ограничением (title, score).
+        db_index=False,
+    )
+    score = models.PositiveSmallIntegerField(verbose_name='оценка')
+    count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='количество отзывов',
+    )
+
+    class Meta:
+        verbose_name = 'распределение оценок'
+        verbose_name_plural = 'Распределения оценок'
+        ordering = ('title', 'score')
+        default_related_name = 'score_counts'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['title', 'score'],
+                name='unique_score_count_per_title'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.title_id}: {self.score} - {self.count}'
+
+
+class TitleRanking(models.Model):
+    """
+    Место произведения в рейтинге: общем, категории или жанра.
+
+    score — байесовская оценка (см. reviews.rankings), NULL, пока у
+    произведения мало отзывов. prior_mean — средняя оценка, с которой
+    считался score; полный пересчёт обновляет её во всех строках.
+    """
+
+    ALL = 'all'
+    CATEGORY = 'category'
+    GENRE = 'genre'
+    KINDS = (
+        (ALL, 'все произведения'),
+        (CATEGORY, 'категория'),
+        (GENRE, 'жанр'),
+    )
+
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        verbose_name='произведение',
+        # Покрывается уникальным ограничением (title, kind, group_id).
+        db_index=False,
+    )
+    kind = models.CharField(
+        max_length=8,
+        choices=KINDS,
+        verbose_name='рейтинг',
+    )
+    # id категории или жанра; 0 для общего рейтинга.
+    group_id = models.PositiveIntegerField(
+        default=0,
+        verbose_name='группа',
+    )
+    score = models.FloatField(
+        null=True,
+        verbose_name='байесовская оценка',
+    )
+    prior_mean = models.FloatField(verbose_name='средняя оценка')
+
+    class Meta:
+        verbose_name = 'место в рейтинге'
+        verbose_name_plural = 'Рейтинги произведений'
+        default_related_name = 'rankings'
+        # Страница рейтинга читается по индексу без сортировки.
+        indexes = [
+            models.Index(
+                fields=('kind', 'group_id', 'score', 'title'),
+                name='ranking_kind_group_score_idx',
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['title', 'kind', 'group_id'],
+                name='unique_ranking_per_title_group'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.kind}:{self.group_id} - {self.title_id}: {self.score}'
@@ -0,0 +1,156 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, FloatField, OuterRef, Subquery, Sum
+from django.db.models.expressions import Case, When
+from django.db.models.lookups import GreaterThanOrEqual
+
+from reviews.constants import MAX_VALUE_VALIDATOR, MIN_VALUE_VALIDATOR
+from reviews.models import Title, TitleRanking
+
+
+def get_leaderboard_settings():
+    return {
+        # Вес априорной средней: столько "средних" отзывов добавляется
+        # к отзывам каждого произведения.
+        'PRIOR_COUNT': 10,
+        # Априорная средняя; None — средняя оценка всех отзывов.
+        'PRIOR_MEAN': None,
+        # Произведения с меньшим числом отзывов в рейтинг не попадают.
+        'MIN_REVIEWS': 1,
+        **getattr(settings, 'LEADERBOARD', {}),
+    }
+
+
+def get_prior_mean():
+    """Априорная средняя для байесовской оценки."""
+    prior_mean = get_leaderboard_settings()['PRIOR_MEAN']
+    if prior_mean is not None:
+        return float(prior_mean)
+    totals = Title.objects.aggregate(
+        score_sum=Sum('rating_sum'), score_count=Sum('rating_count')
+    )
+    if not totals['score_count']:
+        # Отзывов ещё нет: середина шкалы оценок.
+        return (MIN_VALUE_VALIDATOR + MAX_VALUE_VALIDATOR) / 2
+    return totals['score_sum'] / totals['score_count']
+
+
+def get_bayesian_score(rating_sum, rating_count, prior_mean):
+    """
+    Байесовская оценка (v * R + m * C) / (v + m).
+
+    v — число отзывов, R — их средняя, C — prior_mean, m — PRIOR_COUNT.
+    Произведение с одним отзывом 10/10 получает оценку, близкую к C, а
+    не 10. None, если отзывов меньше MIN_REVIEWS.
+    """
+    leaderboard_settings = get_leaderboard_settings()
+    if rating_count < leaderboard_settings['MIN_REVIEWS']:
+        return None
+    prior_count = leaderboard_settings['PRIOR_COUNT']
+    return (rating_sum + prior_count * prior_mean) / (
+        rating_count + prior_count
+    )
+
+
+def build_rankings(titles, prior_mean):
+    """Строки рейтингов произведений: общего, категории и жанров."""
+    genres = {}
+    for title_id, genre_id in Title.genre.through.objects.filter(
+        title_id__in=[title.id for title in titles]
+    ).values_list('title_id', 'genre_id'):
+        genres.setdefault(title_id, []).append(genre_id)
+    for title in titles:
+        score = get_bayesian_score(
+            title.rating_sum, title.rating_count, prior_mean
+        )
+        groups = [(TitleRanking.ALL, 0)]
+        if title.category_id is not None:
+            groups.append((TitleRanking.CATEGORY, title.category_id))
+        groups.extend(
+            (TitleRanking.GENRE, genre_id)
+            for genre_id in genres.get(title.id, ())
+        )
+        for kind, group_id in groups:
+            yield TitleRanking(
+                title_id=title.id,
+                kind=kind,
+                group_id=group_id,
+                score=score,
+                prior_mean=prior_mean,
+            )
+
+
+def _ranked_titles():
+    return Title.objects.only(
+        'id', 'category_id', 'rating_sum', 'rating_count'
+    ).order_by('id')
+
+
+def rebuild_title_rankings(title_ids):
+    """
+    Пересобирает строки рейтингов произведений.
+
+    Нужен при создании произведения и смене его категории или жанров.
+    Средняя C берётся из существующих строк, чтобы оценки оставались
+    сравнимы с остальными до полного пересчёта.
+    """
+    titles = list(_ranked_titles().filter(pk__in=title_ids))
+    prior_mean = TitleRanking.objects.values_list(
+        'prior_mean', flat=True
+    ).first()
+    if prior_mean is None:
+        prior_mean = get_prior_mean()
+    with transaction.atomic():
+        TitleRanking.objects.filter(title_id__in=title_ids).delete()
+        TitleRanking.objects.bulk_create(build_rankings(titles, prior_mean))
+
+
+def delete_group_rankings(kind, group_id):
+    """Удаляет рейтинг удалённой категории или жанра."""
+    TitleRanking.objects.filter(kind=kind, group_id=group_id).delete()
+
+
+def update_title_score(title_id):
+    """
+    Пересчитывает оценку произведения во всех его рейтингах.
+
+    Один UPDATE по текущим rating_sum и rating_count произведения и
+    prior_mean строк: вызывается после каждого изменения отзывов.
+    """
+    leaderboard_settings = get_leaderboard_settings()
+    prior_count = leaderboard_settings['PRIOR_COUNT']
+    title = Title.objects.filter(pk=OuterRef('title_id'))
+    rating_sum = Subquery(title.values('rating_sum'))
+    rating_count = Subquery(title.values('rating_count'))
+    TitleRanking.objects.filter(title_id=title_id).update(score=Case(
+        When(
+            GreaterThanOrEqual(
+                rating_count, leaderboard_settings['MIN_REVIEWS']
+            ),
+            then=(rating_sum + prior_count * F('prior_mean'))
+            / (rating_count + prior_count),
+        ),
+        default=None,
+        output_field=FloatField(),
+    ))
+
+
+def recompute_rankings(batch_size=1000):
+    """
+    Полный пересчёт рейтингов с текущей средней оценкой всех отзывов.
+
+    Возвращает количество записанных строк рейтингов.
+    """
+    prior_mean = get_prior_mean()
+    count = 0
+    with transaction.atomic():
+        TitleRanking.objects.all().delete()
+        titles = _ranked_titles().iterator(chunk_size=batch_size)
+        while True:
+            batch = [title for _, title in zip(range(batch_size), titles)]
+            if not batch:
+                break
+            count += len(TitleRanking.objects.bulk_create(
+                build_rankings(batch, prior_mean), batch_size=batch_size
+            ))
+    return count
@@ -0,0 +1,158 @@
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from reviews.constants import MAX_VALUE_VALIDATOR, MIN_VALUE_VALIDATOR
+from reviews.models import Review, Title, TitleScoreCount
+
+
+SCORES = range(MIN_VALUE_VALIDATOR, MAX_VALUE_VALIDATOR + 1)
+
+
+def change_title_rating(title_id, score_delta, count_delta=0):
+    """Атомарно изменяет сумму и количество оценок произведения."""
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=F('rating_sum') + score_delta,
+        rating_count=F('rating_count') + count_delta,
+        updated_at=timezone.now(),
+    )
+
+
+def create_score_counts(title_ids):
+    """Создаёт нулевые строки распределения для всех оценок."""
+    TitleScoreCount.objects.bulk_create(
+        (
+            TitleScoreCount(title_id=title_id, score=score)
+            for title_id in title_ids
+            for score in SCORES
+        ),
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+def change_score_count(title_id, score, delta):
+    """Атомарно изменяет число отзывов произведения с оценкой score."""
+    counts = TitleScoreCount.objects.filter(title_id=title_id, score=score)
+    if counts.update(count=F('count') + delta) or delta < 0:
+        return
+    # Строки создаются вместе с произведением; сюда попадают только
+    # произведения, созданные в обход сигналов.
+    create_score_counts((title_id,))
+    counts.update(count=F('count') + delta)
+
+
+def _score_at(counts, position):
+    """Оценка на позиции position в отсортированном списке оценок."""
+    seen = 0
+    for score, count in counts.items():
+        seen += count
+        if seen > position:
+            return score
+
+
+def get_score_stats(counts):
+    """
+    Распределение, среднее и медиана по словарю {оценка: количество}.
+
+    Работает за O(число оценок) независимо от количества отзывов.
+    """
+    counts = {score: counts.get(score, 0) for score in SCORES}
+    total = sum(counts.values())
+    stats = {
+        'count': total,
+        'mean': None,
+        'median': None,
+        'distribution': [
+            {'score': score, 'count': count}
+            for score, count in counts.items()
+        ],
+    }
+    if not total:
+        return stats
+    stats['mean'] = round(
+        sum(score * count for score, count in counts.items()) / total, 2
+    )
+    # Медиана — среднее оценок на позициях (total - 1) // 2 и total // 2.
+    stats['median'] = (
+        _score_at(counts, (total - 1) // 2) + _score_at(counts, total // 2)
+    ) / 2
+    return stats
+
+
+def recalculate_ratings(title_ids=None):
+    """
+    Пересчитывает рейтинг произведений по таблице отзывов.
+
+    Возвращает количество произведений, рейтинг которых был исправлен.
+    """
+    titles = Title.objects.only('id', 'rating_sum', 'rating_count')
+    reviews = Review.objects.all()
+    if title_ids is not None:
+        titles = titles.filter(pk__in=title_ids)
+        reviews = reviews.filter(title_id__in=title_ids)
+    totals = {
+        row['title_id']: (row['score_sum'], row['score_count'])
+        for row in reviews.values('title_id').annotate(
+            score_sum=Sum('score'), score_count=Count('id')
+        ).order_by()
+    }
+    changed = []
+    now = timezone.now()
+    for title in titles.iterator():
+        rating_sum, rating_count = totals.get(title.id, (0, 0))
+        if (title.rating_sum, title.rating_count) != (
+            rating_sum, rating_count
+        ):
+            title.rating_sum = rating_sum
+            title.rating_count = rating_count
+            title.updated_at = now
+            changed.append(title)
+    Title.objects.bulk_update(
+        changed, ('rating_sum', 'rating_count', 'updated_at'),
+        batch_size=1000,
+    )
+    return len(changed)
+
+
+def recalculate_score_counts(title_ids=None):
+    """
+    Пересобирает распределение оценок произведений по таблице отзывов.
+
+    Возвращает количество записанных строк распределения.
+    """
+    titles = Title.objects.all()
+    reviews = Review.objects.all()
+    score_counts = TitleScoreCount.objects.all()
+    if title_ids is not None:
+        titles = titles.filter(pk__in=title_ids)
+        reviews = reviews.filter(title_id__in=title_ids)
+        score_counts = score_counts.filter(title_id__in=title_ids)
+    totals = {
+        (row['title_id'], row['score']): row['score_count']
+        for row in reviews.values('title_id', 'score').annotate(
+            score_count=Count('id')
+        ).order_by()
+    }
+    with transaction.atomic():
+        score_counts.delete()
+        created = TitleScoreCount.objects.bulk_create(
+            (
+                TitleScoreCount(
+                    title_id=title_id,
+                    score=score,
+                    count=totals.get((title_id, score), 0),
+                )
+                for title_id in titles.values_list('id', flat=True)
+                for score in SCORES
+            ),
+            batch_size=1000,
+        )
+    return len(created)
+
+
+def recalculate_scores(title_ids=None):
+    """Пересчитывает рейтинг и распределение оценок произведений."""
+    changed = recalculate_ratings(title_ids)
+    recalculate_score_counts(title_ids)
+    return changed
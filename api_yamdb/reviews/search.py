@@ -0,0 +1,138 @@
+import re
+
+from django.db import DatabaseError, connections, router
+from django.db.models.expressions import RawSQL
+
+from reviews.models import Category, Genre, Title
+
+
+SEARCH_MODELS = (Title, Category, Genre)
+SEARCH_FIELD = 'name'
+
+_TOKEN_RE = re.compile(r'\w+')
+_available = {}
+
+
+def get_index_table(model):
+    return f'{model._meta.db_table}_fts'
+
+
+def _index_statements(model):
+    table = model._meta.db_table
+    index = get_index_table(model)
+    field = SEARCH_FIELD
+    return (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {index} USING fts5("
+        f"{field}, content='{table}', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS {index}_ai AFTER INSERT ON {table} "
+        f"BEGIN INSERT INTO {index}(rowid, {field}) "
+        f"VALUES (new.id, new.{field}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {index}_ad AFTER DELETE ON {table} "
+        f"BEGIN INSERT INTO {index}({index}, rowid, {field}) "
+        f"VALUES ('delete', old.id, old.{field}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {index}_au "
+        f"AFTER UPDATE OF id, {field} ON {table} "
+        f"BEGIN INSERT INTO {index}({index}, rowid, {field}) "
+        f"VALUES ('delete', old.id, old.{field}); "
+        f"INSERT INTO {index}(rowid, {field}) "
+        f"VALUES (new.id, new.{field}); END",
+    )
+
+
+def install_search_index(connection):
+    """
+    Создаёт FTS5-индексы и триггеры синхронизации для SEARCH_MODELS.
+
+    Триггеры обновляют индекс и при bulk_create/update, которые не
+    вызывают сигналы. SQLite удаляет триггеры вместе с таблицей при её
+    пересоздании в миграциях, поэтому функция вызывается и после каждой
+    миграции: недостающие триггеры создаются, индекс перестраивается.
+    На других СУБД и без модуля fts5 ничего не делает.
+    """
+    _available.clear()
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger'"
+        )
+        triggers = {row[0] for row in cursor.fetchall()}
+        existing_tables = set(connection.introspection.table_names(cursor))
+        for model in SEARCH_MODELS:
+            index = get_index_table(model)
+            if model._meta.db_table not in existing_tables:
+                continue
+            if {f'{index}_ai', f'{index}_ad', f'{index}_au'} <= triggers:
+                continue
+            try:
+                for statement in _index_statements(model):
+                    cursor.execute(statement)
+            except DatabaseError:
+                # SQLite собран без fts5: поиск работает через LIKE.
+                return
+            cursor.execute(
+                f"INSERT INTO {index}({index}) VALUES ('rebuild')"
+            )
+
+
+def uninstall_search_index(connection):
+    _available.clear()
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for model in SEARCH_MODELS:
+            index = get_index_table(model)
+            for suffix in ('ai', 'ad', 'au'):
+                cursor.execute(f'DROP TRIGGER IF EXISTS {index}_{suffix}')
+            cursor.execute(f'DROP TABLE IF EXISTS {index}')
+
+
+def is_search_available(model, using=None):
+    """Проверяет, есть ли в базе FTS-индекс для модели."""
+    using = using or router.db_for_read(model)
+    key = (using, model)
+    if key not in _available:
+        connection = connections[using]
+        _available[key] = (
+            model in SEARCH_MODELS
+            and connection.vendor == 'sqlite'
+            and get_index_table(model)
+            in connection.introspection.table_names()
+        )
+    return _available[key]
+
+
+def build_match_query(text):
+    """
+    Превращает поисковую строку в запрос FTS5.
+
+    Каждое слово ищется по префиксу, все слова должны встретиться.
+    """
+    tokens = _TOKEN_RE.findall(text.lower())
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def search(queryset, text):
+    """
+    Фильтрует queryset по названию и сортирует по релевантности.
+
+    Без FTS-индекса выполняется прежний поиск через icontains.
+    """
+    model = queryset.model
+    match = build_match_query(text)
+    if not match or not is_search_available(model, queryset.db):
+        return queryset.filter(**{f'{SEARCH_FIELD}__icontains': text})
+    table = model._meta.db_table
+    index = get_index_table(model)
+    return queryset.filter(
+        pk__in=RawSQL(
+            f'SELECT rowid FROM {index} WHERE {index} MATCH %s', (match,)
+        )
+    ).annotate(
+        search_rank=RawSQL(
+            f'SELECT bm25({index}) FROM {index} '
+            f'WHERE {index} MATCH %s AND rowid = "{table}"."id"',
+            (match,),
+        )
+    ).order_by('search_rank', *model._meta.ordering)
@@ -0,0 +1,139 @@
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+
+from reviews.models import Category, Genre, Review, Title, TitleRanking
+from reviews.rankings import (
+    delete_group_rankings,
+    rebuild_title_rankings,
+    update_title_score,
+)
+from reviews.ratings import (
+    change_score_count,
+    change_title_rating,
+    create_score_counts,
+)
+from reviews.search import install_search_index
+from reviews.sqlite import configure_connection
+from reviews.versions import touch, touch_titles_of
+
+
+@receiver(post_save, sender=Title)
+def create_title_score_counts(sender, instance, created, **kwargs):
+    """Заводит распределение оценок нового произведения."""
+    if created:
+        create_score_counts((instance.pk,))
+
+
+@receiver(post_save, sender=Title)
+def rebuild_rankings_on_title_save(sender, instance, **kwargs):
+    """Категория произведения могла измениться: строки пересобираются."""
+    rebuild_title_rankings((instance.pk,))
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def rebuild_rankings_on_genres_change(sender, instance, action, reverse,
+                                      pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        rebuild_title_rankings((instance.pk,))
+    elif action == 'post_clear':
+        delete_group_rankings(TitleRanking.GENRE, instance.pk)
+    else:
+        rebuild_title_rankings(pk_set)
+
+
+@receiver(pre_delete, sender=Category)
+def delete_category_rankings(sender, instance, **kwargs):
+    delete_group_rankings(TitleRanking.CATEGORY, instance.pk)
+
+
+@receiver(pre_delete, sender=Genre)
+def delete_genre_rankings(sender, instance, **kwargs):
+    delete_group_rankings(TitleRanking.GENRE, instance.pk)
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, **kwargs):
+    """Учитывает новую или изменённую оценку в рейтинге и распределении."""
+    if created:
+        change_title_rating(instance.title_id, instance.score, 1)
+        change_score_count(instance.title_id, instance.score, 1)
+        update_title_score(instance.title_id)
+    else:
+        loaded_score = getattr(instance, '_loaded_score', None)
+        if loaded_score is not None and loaded_score != instance.score:
+            change_title_rating(
+                instance.title_id, instance.score - loaded_score
+            )
+            change_score_count(instance.title_id, loaded_score, -1)
+            change_score_count(instance.title_id, instance.score, 1)
+            update_title_score(instance.title_id)
+    instance._loaded_score = instance.score
+
+
+def _is_title_deletion(origin):
+    """Удаление начато с произведения (или QuerySet произведений)."""
+    return isinstance(origin, Title) or getattr(origin, 'model', None) is Title
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, origin=None, **kwargs):
+    """Исключает оценку удалённого отзыва из рейтинга произведения."""
+    if _is_title_deletion(origin):
+        # Рейтинг, распределение и рейтинги лидеров удаляются вместе с
+        # произведением.
+        return
+    change_title_rating(instance.title_id, -instance.score, -1)
+    change_score_count(instance.title_id, instance.score, -1)
+    update_title_score(instance.title_id)
+
+
+@receiver(post_migrate)
+def repair_search_index(sender, using, **kwargs):
+    """Восстанавливает триггеры поиска после пересоздания таблиц."""
+    if sender.name == 'reviews':
+        install_search_index(connections[using])
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def touch_category_titles(sender, instance, **kwargs):
+    if not kwargs.get('created'):
+        touch_titles_of(category=instance)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(pre_delete, sender=Genre)
+def touch_genre_titles(sender, instance, **kwargs):
+    if not kwargs.get('created'):
+        touch_titles_of(genre=instance)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def touch_titles_on_genres_change(sender, instance, action, reverse,
+                                  pk_set, **kwargs):
+    """Изменение набора жанров меняет вывод произведения."""
+    if action == 'pre_clear':
+        if reverse:
+            touch_titles_of(genre=instance)
+        else:
+            touch(Title.objects.filter(pk=instance.pk))
+    elif action in ('post_add', 'post_remove'):
+        touch(Title.objects.filter(
+            pk__in=pk_set if reverse else (instance.pk,)
+        ))
+
+
+@receiver(connection_created)
+def tune_sqlite_connection(sender, connection, **kwargs):
+    """Настраивает каждое новое соединение SQLite (WAL, кэш, mmap)."""
+    configure_connection(connection)
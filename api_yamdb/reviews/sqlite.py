@@ -0,0 +1,50 @@
+import re
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+
+# Значения по умолчанию; busy_timeout задаётся первым, чтобы смена
+# journal_mode ждала блокировку, а не падала с "database is locked".
+DEFAULT_PRAGMAS = {
+    'busy_timeout': 5000,
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'cache_size': -64 * 1024,
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'memory',
+}
+
+_NAME_RE = re.compile(r'^[a-z_]+$')
+_VALUE_RE = re.compile(r'^-?\w+$')
+
+
+def get_sqlite_pragmas():
+    """PRAGMA новых соединений SQLite; None отключает PRAGMA."""
+    pragmas = {**DEFAULT_PRAGMAS, **getattr(settings, 'SQLITE_PRAGMAS', {})}
+    for name, value in pragmas.items():
+        if not _NAME_RE.match(name) or (
+            value is not None and not _VALUE_RE.match(str(value))
+        ):
+            raise ImproperlyConfigured(
+                f'Недопустимая PRAGMA в SQLITE_PRAGMAS: {name}={value!r}.'
+            )
+    return {
+        name: value for name, value in pragmas.items() if value is not None
+    }
+
+
+def configure_connection(connection):
+    """
+    Выполняет PRAGMA из SQLITE_PRAGMAS на новом соединении SQLite.
+
+    WAL позволяет читать во время записи, synchronous=normal в WAL
+    сбрасывает журнал на диск только при checkpoint. Для базы в памяти
+    SQLite оставляет journal_mode=memory. На других СУБД ничего не
+    делает.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in get_sqlite_pragmas().items():
+            cursor.execute(f'PRAGMA {name} = {value}')
@@ -0,0 +1,22 @@
+from django.utils import timezone
+
+from reviews.models import Comment, Review, Title
+
+
+def touch(queryset):
+    """Отмечает записи изменёнными, не вызывая save() и сигналы."""
+    return queryset.update(updated_at=timezone.now())
+
+
+def touch_titles_of(category=None, genre=None):
+    """Произведения выводят названия категории и жанров."""
+    if category is not None:
+        touch(Title.objects.filter(category=category))
+    if genre is not None:
+        touch(Title.objects.filter(genre=genre))
+
+
+def touch_author_entries(user):
+    """Отзывы и комментарии выводят username автора."""
+    touch(Review.objects.filter(author=user))
+    touch(Comment.objects.filter(author=user))
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 
-from .models import YamdbUser
+from .models import OutgoingEmail, YamdbUser
 
 
 @admin.register(YamdbUser)
@@ -14,3 +14,12 @@ class UserAdmin(UserAdmin):
     add_fieldsets = UserAdmin.add_fieldsets + (
         ('Custom Fields', {'fields': ('email', 'bio', 'role')}),
     )
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'recipient', 'subject', 'created_at', 'sent_at', 'attempts'
+    )
+    list_filter = ('sent_at',)
+    search_fields = ('recipient',)
@@ -3,3 +3,4 @@ MAX_LENGTH_EMAIL = 254
 MAX_LENGTH_ROLE = 20
 MAX_LENGTH_CONFIRMATION_CODE = 100
 FORBIDDEN_USERNAMES = ['me']
+MAX_LENGTH_EMAIL_SUBJECT = 255
@@ -1,7 +1,10 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 from .constants import (
+    MAX_LENGTH_EMAIL,
+    MAX_LENGTH_EMAIL_SUBJECT,
     MAX_LENGTH_ROLE,
     MAX_LENGTH_USERNAME,
 )
@@ -39,6 +42,8 @@ class YamdbUser(AbstractUser):
         default=Role.USER,
     )
 
+    TRACKED_FIELDS = ('username', 'role', 'is_superuser', 'is_active')
+
     class Meta:
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
@@ -46,6 +51,26 @@ class YamdbUser(AbstractUser):
     def __str__(self):
         return self.username
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Загруженные значения нужны, чтобы при сохранении понять,
+        # изменились ли username (выводится в отзывах) и права доступа.
+        instance._loaded_values = {
+            field: instance.__dict__[field]
+            for field in cls.TRACKED_FIELDS
+            if field in instance.__dict__
+        }
+        return instance
+
+    def get_changed_fields(self):
+        """Возвращает отслеживаемые поля, изменённые после загрузки."""
+        loaded_values = getattr(self, '_loaded_values', {})
+        return {
+            field for field, value in loaded_values.items()
+            if self.__dict__.get(field, value) != value
+        }
+
     @property
     def is_admin(self):
         return self.role == self.Role.ADMIN or self.is_superuser
@@ -53,3 +78,52 @@ class YamdbUser(AbstractUser):
     @property
     def is_moderator(self):
         return self.role == self.Role.MODERATOR
+
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди на отправку (outbox)."""
+
+    recipient = models.EmailField(
+        'получатель',
+        max_length=MAX_LENGTH_EMAIL,
+    )
+    subject = models.CharField(
+        'тема',
+        max_length=MAX_LENGTH_EMAIL_SUBJECT,
+    )
+    message = models.TextField('текст')
+    created_at = models.DateTimeField(
+        'дата создания',
+        auto_now_add=True,
+    )
+    sent_at = models.DateTimeField(
+        'дата отправки',
+        null=True,
+        blank=True,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        'попыток отправки',
+        default=0,
+    )
+    next_attempt_at = models.DateTimeField(
+        'следующая попытка',
+        default=timezone.now,
+    )
+    last_error = models.TextField(
+        'последняя ошибка',
+        blank=True,
+    )
+
+    class Meta:
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        ordering = ('next_attempt_at',)
+        indexes = [
+            models.Index(
+                fields=('sent_at', 'next_attempt_at'),
+                name='outgoing_email_pending_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.subject} -> {self.recipient}'
@@ -0,0 +1,129 @@
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+
+def get_outbox_settings():
+    return {
+        'EAGER': False,
+        'BATCH_SIZE': 100,
+        'MAX_ATTEMPTS': 5,
+        'RETRY_DELAY': 30,
+        'MAX_RETRY_DELAY': 3600,
+        'LEASE': 300,
+        **getattr(settings, 'EMAIL_OUTBOX', {}),
+    }
+
+
+def enqueue_email(recipient, subject, message):
+    """
+    Ставит письмо в очередь в текущей транзакции.
+
+    В режиме EAGER письмо отправляется сразу после фиксации транзакции,
+    иначе его отправит команда send_emails. Ошибка немедленной отправки
+    не откатывает запрос: письмо останется в очереди.
+    """
+    email = OutgoingEmail.objects.create(
+        recipient=recipient, subject=subject, message=message
+    )
+    if get_outbox_settings()['EAGER']:
+        transaction.on_commit(
+            lambda: deliver_pending(ids=[email.pk]), robust=True
+        )
+    return email
+
+
+def get_retry_delay(attempts):
+    """Экспоненциальная задержка перед повтором со случайным разбросом."""
+    outbox_settings = get_outbox_settings()
+    delay = min(
+        outbox_settings['RETRY_DELAY'] * 2 ** (attempts - 1),
+        outbox_settings['MAX_RETRY_DELAY'],
+    )
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def claim_batch(batch_size, ids=None):
+    """
+    Резервирует пачку писем, которые пора отправлять.
+
+    Письма получают время аренды в next_attempt_at, поэтому параллельно
+    запущенный обработчик не возьмёт их повторно.
+    """
+    outbox_settings = get_outbox_settings()
+    now = timezone.now()
+    due = OutgoingEmail.objects.filter(
+        sent_at__isnull=True,
+        next_attempt_at__lte=now,
+        attempts__lt=outbox_settings['MAX_ATTEMPTS'],
+    )
+    if ids is not None:
+        due = due.filter(pk__in=ids)
+    due_ids = list(due.values_list('pk', flat=True)[:batch_size])
+    if not due_ids:
+        return []
+    lease = now + timedelta(seconds=outbox_settings['LEASE'])
+    OutgoingEmail.objects.filter(
+        pk__in=due_ids, next_attempt_at__lte=now
+    ).update(next_attempt_at=lease)
+    return list(
+        OutgoingEmail.objects.filter(pk__in=due_ids, next_attempt_at=lease)
+    )
+
+
+def deliver_pending(batch_size=None, ids=None, connection=None):
+    """
+    Отправляет пачку писем из очереди через одно соединение.
+
+    Возвращает пару (отправлено, не отправлено).
+    """
+    batch_size = batch_size or get_outbox_settings()['BATCH_SIZE']
+    emails = claim_batch(batch_size, ids)
+    if not emails:
+        return 0, 0
+    own_connection = connection is None
+    if own_connection:
+        connection = get_connection()
+    sent_ids, failed = [], []
+    try:
+        connection.open()
+        for email in emails:
+            message = EmailMessage(
+                subject=email.subject,
+                body=email.message,
+                from_email=settings.EMAIL_HOST_USER,
+                to=[email.recipient],
+                connection=connection,
+            )
+            try:
+                message.send()
+            # Ошибка одного письма не должна останавливать всю пачку.
+            except Exception as error:
+                failed.append((email, error))
+            else:
+                sent_ids.append(email.pk)
+    finally:
+        if own_connection:
+            connection.close()
+
+    now = timezone.now()
+    # Текст отправленного письма содержит код подтверждения и больше
+    # не нужен.
+    OutgoingEmail.objects.filter(pk__in=sent_ids).update(
+        sent_at=now, attempts=F('attempts') + 1, message=''
+    )
+    for email, error in failed:
+        email.attempts += 1
+        email.last_error = repr(error)
+        email.next_attempt_at = now + get_retry_delay(email.attempts)
+        email.save(
+            update_fields=('attempts', 'last_error', 'next_attempt_at')
+        )
+    return len(sent_ids), len(failed)
@@ -0,0 +1,338 @@
+"""
+Нагрузочный бенчмарк всех GET-маршрутов v1_router.
+
+Генерирует синтетический каталог (см. benchmarks.datagen), загружает
+его командой import_csv в тестовую базу и опрашивает каждый маршрут
+через тестовый клиент Django (WSGI) и AsyncClient (ASGI внутри
+процесса). Для каждого маршрута сохраняются пропускная способность,
+p50/p95/p99 и число SQL-запросов. Результаты пишутся в JSON-файл;
+с --baseline они сравниваются с сохранёнными ранее, и при регрессии
+команда завершается с кодом 1.
+
+Запуск из корня репозитория:
+    python -m benchmarks.api_load --titles 5000 --output base.json
+    python -m benchmarks.api_load --titles 5000 --baseline base.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import re
+import sqlite3
+import sys
+import tempfile
+import time
+import warnings
+from io import StringIO
+from pathlib import Path
+
+from benchmarks.datagen import Scale, generate
+from benchmarks.utils import percentile, setup_django
+
+
+DEFAULT_OUTPUT = Path(__file__).resolve().parent / 'results' / 'latest.json'
+CLIENTS = ('wsgi', 'asgi')
+
+
+def summarize(timings, elapsed):
+    return {
+        'requests': len(timings),
+        'throughput_rps': round(len(timings) / elapsed, 1),
+        'p50_ms': round(percentile(timings, 50) * 1000, 3),
+        'p95_ms': round(percentile(timings, 95) * 1000, 3),
+        'p99_ms': round(percentile(timings, 99) * 1000, 3),
+    }
+
+
+def get_sample_objects():
+    """Объекты с наибольшим числом вложенных записей для detail-URL."""
+    from django.contrib.auth import get_user_model
+    from django.db.models import Count
+
+    from reviews.models import Category, Comment, Genre, Review, Title
+
+    title = Title.objects.order_by('-rating_count', 'pk').first()
+    review = (
+        Review.objects.filter(title=title)
+        .annotate(comments_count=Count('comments'))
+        .order_by('-comments_count', 'pk').first()
+    )
+    comment = Comment.objects.filter(review=review).order_by('pk').first()
+    user = get_user_model().objects.order_by('pk').first()
+    return {
+        Title: title,
+        Review: review,
+        Comment: comment,
+        Category: title.category,
+        Genre: title.genre.order_by('pk').first(),
+        get_user_model(): user,
+    }
+
+
+def get_viewset_model(viewset):
+    queryset = getattr(viewset, 'queryset', None)
+    if queryset is not None:
+        return queryset.model
+    return viewset.serializer_class.Meta.model
+
+
+def collect_endpoints():
+    """Возвращает [(имя маршрута, URL)] для всех GET-маршрутов."""
+    from django.urls import reverse
+
+    from api.urls import v1_router
+    from reviews.models import Category, Genre, Review, Title
+
+    samples = get_sample_objects()
+    parents = {'title_id': samples[Title], 'review_id': samples[Review]}
+    # Объекты для параметров в url_path дополнительных действий.
+    action_models = {'category': Category, 'genre': Genre}
+    endpoints = []
+    for prefix, viewset, basename in v1_router.registry:
+        kwargs = {
+            name: parents[name].pk
+            for name in re.findall(r'\(\?P<(\w+)>', prefix)
+        }
+        for route in v1_router.get_routes(viewset):
+            # У дополнительных действий mapping — MethodMapper, его
+            # метод get() служит декоратором, а не чтением словаря.
+            action = dict(route.mapping).get('get')
+            if action is None or not hasattr(viewset, action):
+                continue
+            route_kwargs = dict(kwargs)
+            params = re.findall(r'\(\?P<(\w+)>', route.url)
+            if params:
+                sample = samples.get(action_models.get(action))
+                if sample is None:
+                    continue
+                route_kwargs.update(
+                    {param: getattr(sample, param) for param in params}
+                )
+            if route.detail:
+                sample = samples.get(get_viewset_model(viewset))
+                if sample is None:
+                    continue
+                route_kwargs[viewset.lookup_field] = getattr(
+                    sample, viewset.lookup_field
+                )
+            name = route.name.format(basename=basename)
+            endpoints.append((name, reverse(name, kwargs=route_kwargs)))
+    return endpoints
+
+
+def count_queries(client, url, headers):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as context:
+        client.get(url, headers=headers)
+    return len(context.captured_queries)
+
+
+def run_wsgi(client, url, headers, warmup, requests):
+    for _ in range(warmup):
+        client.get(url, headers=headers)
+    timings = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        request_started = time.perf_counter()
+        response = client.get(url, headers=headers)
+        timings.append(time.perf_counter() - request_started)
+    assert response.status_code == 200, (url, response.status_code)
+    return summarize(timings, time.perf_counter() - started)
+
+
+async def run_asgi(client, url, headers, warmup, requests):
+    for _ in range(warmup):
+        await client.get(url, headers=headers)
+    timings = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        request_started = time.perf_counter()
+        response = await client.get(url, headers=headers)
+        timings.append(time.perf_counter() - request_started)
+    assert response.status_code == 200, (url, response.status_code)
+    return summarize(timings, time.perf_counter() - started)
+
+
+def run_benchmarks(options):
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from django.core.paginator import UnorderedObjectListWarning
+    from django.test import AsyncClient, Client, override_settings
+
+    from api.authentication import RoleAccessToken
+
+    warnings.simplefilter('ignore', UnorderedObjectListWarning)
+    logging.getLogger('django.request').setLevel(logging.ERROR)
+
+    scale = Scale.from_options(options)
+    with tempfile.TemporaryDirectory() as generated_dir:
+        data_dir = options.data_dir
+        if data_dir is None:
+            data_dir = generated_dir
+            generate(data_dir, scale)
+        call_command(
+            'import_csv', data_dir=data_dir, batch_size=5000,
+            stdout=StringIO(), stderr=StringIO(),
+        )
+
+    admin = get_user_model().objects.create_user(
+        username='benchmark-admin', email='benchmark-admin@yamdb.fake',
+        role='admin',
+    )
+    admin_headers = {
+        'Authorization': f'Bearer {RoleAccessToken.for_user(admin)}'
+    }
+    sync_client, async_client = Client(), AsyncClient()
+    results = []
+    with override_settings(
+        RESPONSE_CACHE={'ENABLED': options.response_cache}
+    ):
+        for name, url in collect_endpoints():
+            # Маршруты, закрытые для анонимов, опрашиваются админом.
+            headers = {}
+            if sync_client.get(url).status_code in (401, 403):
+                headers = admin_headers
+            queries = count_queries(sync_client, url, headers)
+            for client_name in options.clients:
+                if client_name == 'wsgi':
+                    summary = run_wsgi(
+                        sync_client, url, headers,
+                        options.warmup, options.requests,
+                    )
+                else:
+                    summary = asyncio.run(run_asgi(
+                        async_client, url, headers,
+                        options.warmup, options.requests,
+                    ))
+                results.append({
+                    'endpoint': name,
+                    'url': url,
+                    'client': client_name,
+                    'queries': queries,
+                    **summary,
+                })
+                print(format_result(results[-1]))
+    return {'meta': get_meta(options, scale), 'results': results}
+
+
+def get_meta(options, scale):
+    import django
+
+    return {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'scale': None if options.data_dir else scale.as_dict(),
+        'data_dir': str(options.data_dir) if options.data_dir else None,
+        'requests': options.requests,
+        'response_cache': options.response_cache,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'sqlite': sqlite3.sqlite_version,
+    }
+
+
+def format_result(result):
+    return (
+        f'{result["endpoint"]:<20} {result["client"]:<5} '
+        f'{result["throughput_rps"]:>8.1f} rps  '
+        f'p50 {result["p50_ms"]:>8.2f} ms  '
+        f'p95 {result["p95_ms"]:>8.2f} ms  '
+        f'p99 {result["p99_ms"]:>8.2f} ms  '
+        f'queries {result["queries"]}'
+    )
+
+
+def compare_results(baseline, current, threshold):
+    """
+    Сравнивает результаты с базовыми.
+
+    Возвращает строки отчёта и список регрессий: рост p50/p95 или
+    падение пропускной способности больше threshold (доля), а также
+    любой рост числа SQL-запросов.
+    """
+    lines, regressions = [], []
+    if baseline['meta'].get('scale') != current['meta'].get('scale'):
+        lines.append('Внимание: размеры каталогов не совпадают.')
+    base = {
+        (result['endpoint'], result['client']): result
+        for result in baseline['results']
+    }
+    for result in current['results']:
+        key = (result['endpoint'], result['client'])
+        old = base.get(key)
+        if old is None:
+            lines.append(f'{key[0]} {key[1]}: нет в базовых результатах')
+            continue
+        changes = []
+        for field, worse_if_higher in (
+            ('p50_ms', True), ('p95_ms', True), ('throughput_rps', False),
+        ):
+            delta = 0.0
+            if old[field]:
+                delta = (result[field] - old[field]) / old[field]
+            changes.append(f'{field} {delta * 100:+.1f}%')
+            if (delta if worse_if_higher else -delta) > threshold:
+                regressions.append(f'{key[0]} {key[1]}: {field}')
+        if result['queries'] != old['queries']:
+            changes.append(f'queries {old["queries"]} -> {result["queries"]}')
+            if result['queries'] > old['queries']:
+                regressions.append(f'{key[0]} {key[1]}: queries')
+        lines.append(f'{key[0]:<20} {key[1]:<5} ' + ', '.join(changes))
+    return lines, regressions
+
+
+def report_comparison(baseline_path, current, threshold):
+    with open(baseline_path, encoding='utf-8') as file:
+        baseline = json.load(file)
+    lines, regressions = compare_results(baseline, current, threshold)
+    print(f'\nСравнение с {baseline_path}:')
+    print('\n'.join(lines))
+    if regressions:
+        print('\nРегрессии:\n' + '\n'.join(regressions))
+    return not regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    Scale.add_arguments(parser)
+    parser.add_argument(
+        '--data-dir', type=Path, default=None,
+        help='готовые CSV вместо сгенерированных',
+    )
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument(
+        '--clients', nargs='+', choices=CLIENTS, default=list(CLIENTS)
+    )
+    parser.add_argument(
+        '--response-cache', action='store_true',
+        help='не отключать кэш ответов для анонимных запросов',
+    )
+    parser.add_argument('--output', type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument('--baseline', type=Path, default=None)
+    parser.add_argument(
+        '--threshold', type=float, default=0.1,
+        help='допустимое ухудшение (доля), по умолчанию 0.1',
+    )
+    options = parser.parse_args()
+
+    setup_django()
+    current = run_benchmarks(options)
+
+    options.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(options.output, 'w', encoding='utf-8') as file:
+        json.dump(current, file, ensure_ascii=False, indent=2)
+    print(f'Результаты записаны в {options.output}')
+
+    if options.baseline and not report_comparison(
+        options.baseline, current, options.threshold
+    ):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,239 @@
+"""
+Параллельность синхронного и асинхронного чтения при медленной БД.
+
+Каждый SELECT задерживается на --latency-ms, как при сетевой базе
+данных. Один и тот же набор GET-запросов к произведениям, отзывам и
+комментариям выполняется:
+    wsgi  — синхронными представлениями через WSGIHandler в пуле из
+            --workers потоков: одновременно обслуживается не больше
+            --workers запросов;
+    asgi  — асинхронными представлениями через ASGIHandler в одном
+            цикле событий с --concurrency одновременными запросами.
+
+Асинхронный ORM Django выполняет SQL в потоках sync_to_async, поэтому
+выигрыш даёт не отсутствие потоков, а то, что ожидающий базу запрос не
+занимает воркер сервера.
+
+Запуск из корня репозитория:
+    python -m benchmarks.async_reads --latency-ms 50 --workers 8 \\
+        --concurrency 64
+"""
+import argparse
+import asyncio
+import itertools
+import logging
+import os
+import sys
+import tempfile
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from wsgiref.util import setup_testing_defaults
+
+from benchmarks.datagen import Scale, generate
+from benchmarks.utils import percentile, setup_django
+
+
+SYNC_URLCONF = 'benchmarks.async_reads_sync_urls'
+
+
+def install_latency(latency):
+    """Добавляет задержку ко всем SELECT на всех соединениях."""
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+
+    def slow_select(execute, sql, params, many, context):
+        if sql.lstrip().upper().startswith('SELECT'):
+            time.sleep(latency)
+        return execute(sql, params, many, context)
+
+    def install(connection, **kwargs):
+        connection.execute_wrappers.append(slow_select)
+
+    # Асинхронные запросы открывают соединения в новых потоках.
+    connection_created.connect(install, weak=False)
+    for connection in connections.all():
+        install(connection)
+
+
+def build_sync_urlconf():
+    """URLconf с теми же маршрутами v1, но синхронными list/retrieve."""
+    from django.urls import include, path
+    from rest_framework.routers import DefaultRouter
+
+    from api.async_views import AsyncReadMixin
+    from api.urls import v1_router
+
+    router = DefaultRouter()
+    for prefix, viewset, basename in v1_router.registry:
+        if issubclass(viewset, AsyncReadMixin):
+            viewset = type(
+                viewset.__name__, (viewset,), {'async_actions': ()}
+            )
+        router.register(prefix, viewset, basename=basename)
+    module = types.ModuleType(SYNC_URLCONF)
+    module.urlpatterns = [path('api/v1/', include(router.urls))]
+    sys.modules[SYNC_URLCONF] = module
+
+
+def get_urls():
+    from reviews.models import Comment, Review, Title
+
+    title = Title.objects.order_by('-rating_count', 'pk').first()
+    review = Review.objects.filter(title=title).order_by('pk').first()
+    comment = Comment.objects.filter(review=review).order_by('pk').first()
+    reviews_url = f'/api/v1/titles/{title.pk}/reviews/'
+    comments_url = f'{reviews_url}{review.pk}/comments/'
+    return [
+        ('/api/v1/titles/', 'page=2'),
+        (f'/api/v1/titles/{title.pk}/', ''),
+        (reviews_url, ''),
+        (reviews_url, 'pagination=cursor'),
+        (f'{reviews_url}{review.pk}/', ''),
+        (comments_url, ''),
+        (f'{comments_url}{comment.pk}/', ''),
+    ]
+
+
+def wsgi_get(handler, path, query):
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'HTTP_HOST': 'testserver',
+    }
+    setup_testing_defaults(environ)
+    statuses = []
+    started = time.perf_counter()
+    result = handler(
+        environ, lambda status, headers: statuses.append(status)
+    )
+    b''.join(result)
+    result.close()
+    assert statuses[0].startswith('200'), (path, statuses[0])
+    return time.perf_counter() - started
+
+
+def run_wsgi(urls, workers):
+    from django.core.handlers.wsgi import WSGIHandler
+
+    handler = WSGIHandler()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        started = time.perf_counter()
+        timings = list(executor.map(
+            lambda url: wsgi_get(handler, *url), urls
+        ))
+    return timings, time.perf_counter() - started
+
+
+async def asgi_get(application, path, query):
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query.encode(),
+        'root_path': '',
+        'headers': [(b'host', b'testserver')],
+        'client': ('127.0.0.1', 0),
+        'server': ('testserver', 80),
+    }
+    body_sent = False
+    disconnected = asyncio.Event()
+    messages = []
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # Клиент не отключается: ASGIHandler отменит ожидание сам.
+        await disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        messages.append(message)
+
+    started = time.perf_counter()
+    await application(scope, receive, send)
+    elapsed = time.perf_counter() - started
+    assert messages[0]['status'] == 200, (path, messages[0]['status'])
+    return elapsed
+
+
+async def run_asgi(urls, concurrency):
+    from django.core.asgi import get_asgi_application
+
+    application = get_asgi_application()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(url):
+        async with semaphore:
+            return await asgi_get(application, *url)
+
+    started = time.perf_counter()
+    timings = await asyncio.gather(*(limited(url) for url in urls))
+    return timings, time.perf_counter() - started
+
+
+def format_run(label, timings, elapsed):
+    return (
+        f'{label:<28} {len(timings) / elapsed:>8.1f} rps  '
+        f'p50 {percentile(timings, 50) * 1000:>8.2f} ms  '
+        f'p95 {percentile(timings, 95) * 1000:>8.2f} ms'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    Scale.add_arguments(parser)
+    parser.add_argument('--latency-ms', type=float, default=50.0)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--requests', type=int, default=400)
+    options = parser.parse_args()
+
+    # Основной URLconf — с асинхронными представлениями, как под ASGI.
+    os.environ['ASYNC_READS'] = 'True'
+    setup_django()
+
+    from django.core.management import call_command
+    from django.test import override_settings
+
+    logging.getLogger('django.request').setLevel(logging.ERROR)
+    logging.getLogger('api.metrics').setLevel(logging.ERROR)
+    with tempfile.TemporaryDirectory() as data_dir:
+        generate(data_dir, Scale.from_options(options))
+        call_command(
+            'import_csv', data_dir=data_dir, batch_size=5000,
+            stdout=StringIO(), stderr=StringIO(),
+        )
+    urls = list(itertools.islice(
+        itertools.cycle(get_urls()), options.requests
+    ))
+    build_sync_urlconf()
+    install_latency(options.latency_ms / 1000)
+
+    print(
+        f'latency: {options.latency_ms} ms на SELECT, '
+        f'запросов: {options.requests}'
+    )
+    with override_settings(RESPONSE_CACHE={'ENABLED': False}):
+        with override_settings(ROOT_URLCONF=SYNC_URLCONF):
+            timings, elapsed = run_wsgi(urls, options.workers)
+        print(format_run(f'wsgi, {options.workers} потоков', timings, elapsed))
+        for concurrency in sorted({options.workers, options.concurrency}):
+            timings, elapsed = asyncio.run(run_asgi(urls, concurrency))
+            print(format_run(
+                f'asgi, {concurrency} одновременно', timings, elapsed
+            ))
+
+
+if __name__ == '__main__':
+    main()
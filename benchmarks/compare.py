@@ -0,0 +1,29 @@
+"""
+Сравнение двух сохранённых результатов benchmarks.api_load.
+
+Запуск из корня репозитория:
+    python -m benchmarks.compare base.json new.json --threshold 0.1
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from benchmarks.api_load import report_comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('baseline', type=Path)
+    parser.add_argument('current', type=Path)
+    parser.add_argument('--threshold', type=float, default=0.1)
+    options = parser.parse_args()
+
+    with open(options.current, encoding='utf-8') as file:
+        current = json.load(file)
+    if not report_comparison(options.baseline, current, options.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
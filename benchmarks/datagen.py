@@ -0,0 +1,223 @@
+"""
+Генерация синтетического каталога в формате CSV из static/data.
+
+Заголовки колонок берутся из файлов static/data, поэтому результат
+загружается теми же командами import_csv и load_all. При одинаковых
+параметрах и seed генерируются одинаковые данные.
+
+Запуск из корня репозитория:
+    python -m benchmarks.datagen /tmp/yamdb-data --titles 10000 \\
+        --reviews-per-title 20 --comments-per-review 2
+"""
+import argparse
+import csv
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from benchmarks.utils import PROJECT_DIR
+
+
+STATIC_DATA_DIR = PROJECT_DIR / 'static' / 'data'
+ROLES = ('user', 'user', 'user', 'moderator')
+START_DATE = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+class Scale:
+    """Размер генерируемого каталога."""
+
+    def __init__(self, titles=1000, categories=10, genres=30, users=500,
+                 genres_per_title=2, reviews_per_title=10,
+                 comments_per_review=2, seed=0):
+        self.titles = titles
+        self.categories = categories
+        self.genres = genres
+        self.users = users
+        self.genres_per_title = min(genres_per_title, genres)
+        self.reviews_per_title = min(reviews_per_title, users)
+        self.comments_per_review = comments_per_review
+        self.seed = seed
+
+    def as_dict(self):
+        return dict(vars(self))
+
+    @classmethod
+    def add_arguments(cls, parser):
+        defaults = cls()
+        for name, value in defaults.as_dict().items():
+            parser.add_argument(
+                f'--{name.replace("_", "-")}', type=int, default=value
+            )
+
+    @classmethod
+    def from_options(cls, options):
+        return cls(**{
+            name: getattr(options, name) for name in cls().as_dict()
+        })
+
+
+def read_header(filename):
+    with open(STATIC_DATA_DIR / filename, encoding='utf-8', newline='') as f:
+        return next(csv.reader(f))
+
+
+def read_texts():
+    """Тексты отзывов и комментариев из static/data как образец."""
+    texts = []
+    for filename in ('review.csv', 'comments.csv'):
+        with open(
+            STATIC_DATA_DIR / filename, encoding='utf-8', newline=''
+        ) as file:
+            texts.extend(row['text'] for row in csv.DictReader(file))
+    return texts
+
+
+def _write(data_dir, filename, rows):
+    header = read_header(filename)
+    with open(
+        data_dir / filename, 'w', encoding='utf-8', newline=''
+    ) as file:
+        writer = csv.DictWriter(file, fieldnames=header)
+        writer.writeheader()
+        count = 0
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def _date(index):
+    return (START_DATE + timedelta(minutes=index)).isoformat().replace(
+        '+00:00', 'Z'
+    )
+
+
+class CatalogGenerator:
+    """Строки CSV-файлов каталога заданного размера."""
+
+    FIRST_USER_ID = 100
+
+    def __init__(self, scale):
+        self.scale = scale
+        self.rng = random.Random(scale.seed)
+        self.texts = read_texts()
+        self.user_ids = range(
+            self.FIRST_USER_ID, self.FIRST_USER_ID + scale.users
+        )
+
+    def users(self):
+        for user_id in self.user_ids:
+            yield {
+                'id': user_id,
+                'username': f'user{user_id}',
+                'email': f'user{user_id}@yamdb.fake',
+                'role': self.rng.choice(ROLES),
+                'bio': '',
+                'first_name': '',
+                'last_name': '',
+            }
+
+    def categories(self):
+        for category_id in range(1, self.scale.categories + 1):
+            yield {
+                'id': category_id,
+                'name': f'Категория {category_id}',
+                'slug': f'category-{category_id}',
+            }
+
+    def genres(self):
+        for genre_id in range(1, self.scale.genres + 1):
+            yield {
+                'id': genre_id,
+                'name': f'Жанр {genre_id}',
+                'slug': f'genre-{genre_id}',
+            }
+
+    def titles(self):
+        for title_id in range(1, self.scale.titles + 1):
+            yield {
+                'id': title_id,
+                'name': f'Произведение {title_id}',
+                'year': self.rng.randint(1950, 2024),
+                'category': self.rng.randint(1, self.scale.categories),
+            }
+
+    def genres_titles(self):
+        genre_ids = range(1, self.scale.genres + 1)
+        row_id = 0
+        for title_id in range(1, self.scale.titles + 1):
+            for genre_id in self.rng.sample(
+                genre_ids, self.scale.genres_per_title
+            ):
+                row_id += 1
+                yield {
+                    'id': row_id, 'title_id': title_id, 'genre_id': genre_id
+                }
+
+    def reviews(self):
+        review_id = 0
+        for title_id in range(1, self.scale.titles + 1):
+            for author in self.rng.sample(
+                self.user_ids, self.scale.reviews_per_title
+            ):
+                review_id += 1
+                yield {
+                    'id': review_id,
+                    'title_id': title_id,
+                    'text': self.rng.choice(self.texts),
+                    'author': author,
+                    'score': self.rng.randint(1, 10),
+                    'pub_date': _date(review_id),
+                }
+
+    def comments(self):
+        reviews_count = self.scale.titles * self.scale.reviews_per_title
+        comment_id = 0
+        for review_id in range(1, reviews_count + 1):
+            for _ in range(self.scale.comments_per_review):
+                comment_id += 1
+                yield {
+                    'id': comment_id,
+                    'review_id': review_id,
+                    'text': self.rng.choice(self.texts),
+                    'author': self.rng.choice(self.user_ids),
+                    'pub_date': _date(reviews_count + comment_id),
+                }
+
+
+FILES = (
+    ('users.csv', CatalogGenerator.users),
+    ('category.csv', CatalogGenerator.categories),
+    ('genre.csv', CatalogGenerator.genres),
+    ('titles.csv', CatalogGenerator.titles),
+    ('genre_title.csv', CatalogGenerator.genres_titles),
+    ('review.csv', CatalogGenerator.reviews),
+    ('comments.csv', CatalogGenerator.comments),
+)
+
+
+def generate(data_dir, scale):
+    """Записывает CSV-файлы каталога и возвращает число строк в каждом."""
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    generator = CatalogGenerator(scale)
+    return {
+        filename: _write(data_dir, filename, rows(generator))
+        for filename, rows in FILES
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument('data_dir', type=Path)
+    Scale.add_arguments(parser)
+    options = parser.parse_args()
+    counts = generate(options.data_dir, Scale.from_options(options))
+    for filename, count in counts.items():
+        print(f'{filename}: {count}')
+
+
+if __name__ == '__main__':
+    main()
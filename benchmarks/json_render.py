@@ -0,0 +1,90 @@
+"""
+Сравнение JSONRenderer и FastJSONRenderer на страницах API.
+
+Страницы строятся из данных benchmarks.datagen сериализаторами
+TitleReadSerializer (с категорией и жанрами) и ReviewSerializer в
+формате ответа пагинации. Перед замером проверяется, что оба
+рендерера выдают одинаковые байты.
+
+Запуск из корня репозитория:
+    python -m benchmarks.json_render --titles 2000 --page-size 100
+"""
+import argparse
+import tempfile
+from io import StringIO
+
+from benchmarks.datagen import Scale, generate
+from benchmarks.utils import format_timings, measure, setup_django
+
+
+def build_pages(page_size):
+    from django.db.models import Prefetch
+
+    from api.serializers import ReviewSerializer, TitleReadSerializer
+    from reviews.models import Genre, Review, Title
+
+    titles = Title.objects.select_related('category').prefetch_related(
+        Prefetch('genre', queryset=Genre.objects.order_by('slug'))
+    ).order_by('name', 'year')[:page_size]
+    reviews = Review.objects.select_related('author').order_by(
+        '-pub_date', '-pk'
+    )[:page_size]
+    return {
+        'titles': TitleReadSerializer(titles, many=True).data,
+        'reviews': ReviewSerializer(reviews, many=True).data,
+    }
+
+
+def wrap_page(results):
+    return {
+        'count': len(results),
+        'next': 'http://testserver/api/v1/titles/?page=2',
+        'previous': None,
+        'results': results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    Scale.add_arguments(parser)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=200)
+    options = parser.parse_args()
+
+    setup_django()
+
+    from django.core.management import call_command
+    from rest_framework.renderers import JSONRenderer
+
+    from api.renderers import FastJSONRenderer, orjson
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        generate(data_dir, Scale.from_options(options))
+        call_command(
+            'import_csv', data_dir=data_dir, batch_size=5000,
+            stdout=StringIO(), stderr=StringIO(),
+        )
+    pages = build_pages(options.page_size)
+
+    print(
+        f'orjson: {orjson.__version__ if orjson else "не установлен"}, '
+        f'размер страницы: {options.page_size}'
+    )
+    for name, results in pages.items():
+        data = wrap_page(results)
+        expected = JSONRenderer().render(data)
+        assert FastJSONRenderer().render(data) == expected, name
+        for renderer in (JSONRenderer(), FastJSONRenderer()):
+            timings = measure(
+                lambda: renderer.render(data), options.repeat
+            )
+            print(format_timings(
+                f'{name:<8} {type(renderer).__name__:<16}', timings
+            ))
+        print(f'{name:<8} {len(expected)} байт')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Рейтинги лидеров: материализованная таблица против сортировки по Avg.
+
+Сравниваются первая страница лучших произведений, посчитанная на
+запрос через Avg('reviews__score') с сортировкой всех произведений, и
+ответы /api/v1/leaderboards/ (общий, категории, жанра) из TitleRanking
+через WSGIHandler с отключённым кэшем ответов. Отдельно замеряется
+полный пересчёт recompute_rankings. С --check код выхода 1, если p95
+ответа рейтинга больше --budget-ms.
+
+Запуск из корня репозитория:
+    python -m benchmarks.leaderboards --titles 10000 --reviews-per-title 20
+"""
+import argparse
+import sys
+import tempfile
+import time
+from io import StringIO
+from pathlib import Path
+
+from benchmarks.datagen import Scale, generate
+from benchmarks.utils import (
+    format_timings,
+    measure,
+    percentile,
+    setup_django,
+    wsgi_request,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    Scale.add_arguments(parser)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--page-size', type=int, default=10)
+    parser.add_argument('--budget-ms', type=float, default=10)
+    parser.add_argument('--check', action='store_true')
+    options = parser.parse_args()
+
+    setup_django()
+
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.core.management import call_command
+    from django.db.models import Avg
+    from django.test import override_settings
+
+    from reviews.models import Title
+    from reviews.rankings import recompute_rankings
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        generate(Path(data_dir), Scale.from_options(options))
+        call_command(
+            'import_csv', data_dir=data_dir, batch_size=5000,
+            stdout=StringIO(), stderr=StringIO(),
+        )
+
+    def aggregated_page():
+        list(
+            Title.objects.annotate(rating_avg=Avg('reviews__score'))
+            .filter(rating_avg__isnull=False)
+            .order_by('-rating_avg', '-id')
+            .values('id', 'name', 'rating_avg')[:options.page_size]
+        )
+
+    handler = WSGIHandler()
+    query = f'page_size={options.page_size}'
+    paths = {
+        'overall': '/api/v1/leaderboards/',
+        'category': '/api/v1/leaderboards/categories/category-1/',
+        'genre': '/api/v1/leaderboards/genres/genre-1/',
+    }
+
+    print(
+        f'titles: {options.titles}, '
+        f'reviews: {options.titles * options.reviews_per_title}'
+    )
+    print(format_timings(
+        'Avg(reviews__score), ORM', measure(aggregated_page, options.repeat)
+    ))
+    failed = False
+    with override_settings(RESPONSE_CACHE={'ENABLED': False}):
+        for name, path in paths.items():
+            def request():
+                status, _ = wsgi_request(handler, 'GET', path, query)
+                assert status == 200, status
+            timings = measure(request, options.repeat)
+            print(format_timings(f'leaderboard {name}, API', timings))
+            if percentile(timings, 95) * 1000 > options.budget_ms:
+                failed = True
+
+    started = time.perf_counter()
+    rows = recompute_rankings()
+    print(
+        f'recompute_rankings: {rows} строк за '
+        f'{(time.perf_counter() - started) * 1000:.0f} ms'
+    )
+    if options.check and failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Накладные расходы сбора метрик запросов.
+
+Один и тот же список произведений запрашивается через весь стек
+middleware с включёнными и выключенными метриками; кэш ответов
+отключён, чтобы каждый запрос доходил до БД.
+
+Запуск из корня репозитория:
+    python -m benchmarks.metrics_overhead --titles 200 --repeat 500
+"""
+import argparse
+import statistics
+
+from benchmarks.utils import format_timings, measure, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.test import Client, override_settings
+
+    from reviews.models import Category, Genre, Title
+
+    category = Category.objects.create(name='Фильм', slug='films')
+    genre = Genre.objects.create(name='Драма', slug='drama')
+    titles = Title.objects.bulk_create(
+        Title(name=f'Произведение {i}', year=2000, category=category)
+        for i in range(args.titles)
+    )
+    Title.genre.through.objects.bulk_create(
+        Title.genre.through(title_id=title.pk, genre_id=genre.pk)
+        for title in titles
+    )
+    client = Client()
+
+    def request_list():
+        response = client.get('/api/v1/titles/', {'page': 2})
+        assert response.status_code == 200
+
+    results = {}
+    # Чередование прогонов сглаживает прогрев и шум машины.
+    for _ in range(3):
+        for enabled in (False, True):
+            with override_settings(
+                METRICS={'ENABLED': enabled},
+                RESPONSE_CACHE={'ENABLED': False},
+            ):
+                results.setdefault(enabled, []).extend(
+                    measure(request_list, args.repeat)
+                )
+
+    print(f'titles: {args.titles}')
+    print(format_timings('метрики выключены', results[False]))
+    print(format_timings('метрики включены', results[True]))
+    overhead = (
+        statistics.median(results[True]) / statistics.median(results[False])
+        - 1
+    )
+    print(f'накладные расходы: {overhead * 100:.1f}%')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Сравнение ModelSerializer и сериализаторов .values() на больших страницах.
+
+Для произведений, отзывов и комментариев одна страница читается и
+сериализуется двумя способами:
+    model  — объекты моделей с select_related/prefetch_related и
+             сериализатор из api.serializers;
+    values — словари queryset.values() и сериализатор из
+             api.read_serializers.
+Перед замером проверяется, что результаты совпадают. Кроме времени
+выводится пик памяти Python за один проход (tracemalloc).
+
+Запуск из корня репозитория:
+    python -m benchmarks.read_serializers --titles 2000 --page-size 500
+"""
+import argparse
+import tempfile
+import tracemalloc
+from io import StringIO
+
+from benchmarks.datagen import Scale, generate
+from benchmarks.utils import format_timings, measure, setup_django
+
+
+def get_cases(page_size):
+    from api.mixins import get_related_lookups
+    from api.read_serializers import (
+        CommentValuesSerializer,
+        ReviewValuesSerializer,
+        TitleValuesSerializer,
+    )
+    from api.serializers import (
+        CommentSerializer,
+        ReviewSerializer,
+        TitleReadSerializer,
+    )
+    from reviews.models import Comment, Review, Title
+
+    return [
+        (name, queryset.order_by(*ordering)[:page_size], serializer_class,
+         values_serializer_class, get_related_lookups(serializer_class))
+        for name, queryset, ordering, serializer_class,
+        values_serializer_class in (
+            ('titles', Title.objects.all(), ('name', 'year'),
+             TitleReadSerializer, TitleValuesSerializer),
+            ('reviews', Review.objects.all(), ('-pub_date', '-id'),
+             ReviewSerializer, ReviewValuesSerializer),
+            ('comments', Comment.objects.all(), ('-pub_date', '-id'),
+             CommentSerializer, CommentValuesSerializer),
+        )
+    ]
+
+
+def measure_peak_memory(func):
+    """Пик памяти (в КиБ), выделенной Python за вызов func."""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    Scale.add_arguments(parser)
+    parser.add_argument('--page-size', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=20)
+    options = parser.parse_args()
+
+    setup_django()
+
+    from django.core.management import call_command
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        generate(data_dir, Scale.from_options(options))
+        call_command(
+            'import_csv', data_dir=data_dir, batch_size=5000,
+            stdout=StringIO(), stderr=StringIO(),
+        )
+
+    print(f'размер страницы: {options.page_size}')
+    for name, queryset, serializer_class, values_serializer_class, (
+        select, prefetch
+    ) in get_cases(options.page_size):
+
+        def model_page():
+            page = queryset.select_related(*select).prefetch_related(
+                *prefetch
+            )
+            return serializer_class(page, many=True).data
+
+        def values_page():
+            page = values_serializer_class.get_values_queryset(queryset)
+            return values_serializer_class(page, many=True).data
+
+        assert model_page() == values_page(), name
+        for label, func in (('model', model_page), ('values', values_page)):
+            timings = measure(func, options.repeat)
+            print(
+                format_timings(f'{name:<8} {label:<6}', timings)
+                + f', peak {measure_peak_memory(func):.0f} KiB'
+            )
+
+
+if __name__ == '__main__':
+    main()
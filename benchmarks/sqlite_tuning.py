@@ -0,0 +1,194 @@
+"""
+Смешанная нагрузка чтения и записи на SQLite до и после настройки.
+
+Потоки --threads выполняют через WSGIHandler --requests запросов:
+GET /api/v1/titles/?page=N и, с долей --write-ratio, POST новых
+отзывов. База лежит в файле, кэш ответов отключён. Нагрузка
+выполняется дважды:
+    before — журнал отката (journal_mode=delete), PRAGMA SQLite по
+             умолчанию, новое соединение на каждый запрос;
+    after  — SQLITE_PRAGMAS и CONN_MAX_AGE из настроек проекта.
+
+Запуск из корня репозитория:
+    python -m benchmarks.sqlite_tuning --threads 8 --requests 2000 \\
+        --write-ratio 0.2
+"""
+import argparse
+import logging
+import queue
+import random
+import tempfile
+import threading
+import time
+from io import StringIO
+from pathlib import Path
+
+from benchmarks.datagen import Scale, generate
+from benchmarks.utils import percentile, setup_django, wsgi_request
+
+
+BEFORE_PRAGMAS = {
+    'busy_timeout': None,
+    'journal_mode': 'delete',
+    'synchronous': None,
+    'cache_size': None,
+    'mmap_size': None,
+    'temp_store': None,
+}
+
+
+def build_operations(options, count, title_ids, writers):
+    """Список операций ('read', page) и ('write', title_id, token)."""
+    rng = random.Random(options.seed)
+    pages = max(1, len(title_ids) // 5)
+    pairs = (
+        (title_id, token) for token in writers for title_id in title_ids
+    )
+    operations = []
+    for _ in range(count):
+        if rng.random() < options.write_ratio:
+            operations.append(('write', *next(pairs)))
+        else:
+            operations.append(('read', rng.randint(1, pages)))
+    return operations
+
+
+def create_writers(options, count, titles_count):
+    """Пользователи без отзывов и их токены для POST-запросов."""
+    from django.contrib.auth import get_user_model
+
+    from api.authentication import RoleAccessToken
+
+    User = get_user_model()
+    writes = int(count * options.write_ratio * 1.5) + 1
+    count = writes // titles_count + 1
+    users = User.objects.bulk_create(
+        User(username=f'bench{i}', email=f'bench{i}@yamdb.fake')
+        for i in range(count)
+    )
+    return [str(RoleAccessToken.for_user(user)) for user in users]
+
+
+def run_load(handler, operations, threads):
+    from django.db import connections
+
+    tasks = queue.Queue()
+    for operation in operations:
+        tasks.put(operation)
+    timings = {'read': [], 'write': []}
+    errors = []
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            try:
+                operation = tasks.get_nowait()
+            except queue.Empty:
+                break
+            started = time.perf_counter()
+            if operation[0] == 'read':
+                status, _ = wsgi_request(
+                    handler, 'GET', '/api/v1/titles/',
+                    f'page={operation[1]}',
+                )
+                expected = 200
+            else:
+                _, title_id, token = operation
+                status, _ = wsgi_request(
+                    handler, 'POST', f'/api/v1/titles/{title_id}/reviews/',
+                    body={'text': 'Нагрузка', 'score': 7}, token=token,
+                )
+                expected = 201
+            elapsed = time.perf_counter() - started
+            with lock:
+                timings[operation[0]].append(elapsed)
+                if status != expected:
+                    errors.append(status)
+        # Постоянные соединения потока закрываются до следующего прогона.
+        connections.close_all()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return timings, errors, time.perf_counter() - started
+
+
+def format_run(label, timings, errors, elapsed):
+    total = sum(len(values) for values in timings.values())
+    lines = [
+        f'{label}: {total / elapsed:.1f} запросов/с, ошибок {len(errors)}'
+    ]
+    for kind, values in timings.items():
+        if values:
+            lines.append(
+                f'    {kind:<5} p50 {percentile(values, 50) * 1000:8.2f} ms'
+                f'  p95 {percentile(values, 95) * 1000:8.2f} ms'
+                f'  n {len(values)}'
+            )
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    Scale.add_arguments(parser)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--write-ratio', type=float, default=0.2)
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        setup_django(database_name=Path(work_dir) / 'benchmark.sqlite3')
+
+        from django.conf import settings
+        from django.core.handlers.wsgi import WSGIHandler
+        from django.core.management import call_command
+        from django.db import connection, connections
+        from django.test import override_settings
+
+        from reviews.models import Title
+
+        logging.getLogger('django.request').setLevel(logging.CRITICAL)
+        logging.getLogger('api.metrics').setLevel(logging.ERROR)
+        data_dir = Path(work_dir) / 'data'
+        generate(data_dir, Scale.from_options(options))
+        call_command(
+            'import_csv', data_dir=data_dir, batch_size=5000,
+            stdout=StringIO(), stderr=StringIO(),
+        )
+        title_ids = list(Title.objects.values_list('id', flat=True))
+        # Каждый прогон пишет свои отзывы: операции на оба прогона.
+        count = options.requests * 2
+        writers = create_writers(options, count, len(title_ids))
+        operations = build_operations(options, count, title_ids, writers)
+        middle = options.requests
+        conn_max_age = connection.settings_dict['CONN_MAX_AGE']
+        handler = WSGIHandler()
+
+        print(
+            f'потоков: {options.threads}, запросов: {options.requests}, '
+            f'доля записи: {options.write_ratio}'
+        )
+        runs = (
+            ('before', BEFORE_PRAGMAS, 0, operations[:middle]),
+            ('after', settings.SQLITE_PRAGMAS, conn_max_age,
+             operations[middle:]),
+        )
+        with override_settings(RESPONSE_CACHE={'ENABLED': False}):
+            for label, pragmas, max_age, run_operations in runs:
+                connections.close_all()
+                connection.settings_dict['CONN_MAX_AGE'] = max_age
+                with override_settings(SQLITE_PRAGMAS=pragmas):
+                    timings, errors, elapsed = run_load(
+                        handler, run_operations, options.threads
+                    )
+                print(format_run(label, timings, errors, elapsed))
+        connections.close_all()
+
+
+if __name__ == '__main__':
+    main()
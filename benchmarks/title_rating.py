@@ -0,0 +1,102 @@
+"""
+Сравнение времени выдачи списка произведений.
+
+Старый вариант считает рейтинг через Avg('reviews__score') на каждый
+запрос, новый читает сохранённые rating_sum/rating_count.
+
+Запуск из корня репозитория:
+    python -m benchmarks.title_rating --titles 10000 --reviews 1000000
+"""
+import argparse
+import random
+
+from benchmarks.utils import format_timings, measure, setup_django
+
+
+BATCH_SIZE = 10000
+
+
+def populate(titles_count, reviews_count):
+    from django.contrib.auth import get_user_model
+
+    from reviews.models import Category, Review, Title
+    from reviews.ratings import recalculate_ratings
+
+    User = get_user_model()
+    reviews_per_title = max(1, reviews_count // titles_count)
+    category = Category.objects.create(name='Фильм', slug='films')
+    User.objects.bulk_create(
+        User(username=f'user{i}', email=f'user{i}@yamdb.fake')
+        for i in range(reviews_per_title)
+    )
+    Title.objects.bulk_create(
+        (
+            Title(name=f'Произведение {i}', year=2000, category=category)
+            for i in range(titles_count)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    user_ids = list(User.objects.values_list('id', flat=True))
+    title_ids = list(Title.objects.values_list('id', flat=True))
+    batch = []
+    for title_id in title_ids:
+        for author_id in user_ids:
+            batch.append(Review(
+                title_id=title_id,
+                author_id=author_id,
+                text='Отзыв',
+                score=random.randint(1, 10),
+            ))
+        if len(batch) >= BATCH_SIZE:
+            Review.objects.bulk_create(batch)
+            batch = []
+    Review.objects.bulk_create(batch)
+    recalculate_ratings()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=10000)
+    parser.add_argument('--reviews', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from asgiref.sync import async_to_sync
+    from django.db.models import Avg
+    from django.test import override_settings
+    from rest_framework.test import APIRequestFactory
+
+    from api.views import TitleViewSet
+    from reviews.models import Title
+
+    populate(args.titles, args.reviews)
+
+    factory = APIRequestFactory()
+    list_view = async_to_sync(TitleViewSet.as_view({'get': 'list'}))
+
+    def request_list():
+        response = list_view(factory.get('/api/v1/titles/', {'page': 2}))
+        response.render()
+
+    def aggregated_list():
+        TitleViewSet.queryset = Title.objects.annotate(
+            rating_avg=Avg('reviews__score')
+        ).order_by('name', 'year')
+        request_list()
+
+    # Повторные анонимные запросы иначе отдавались бы из кэша ответов.
+    with override_settings(RESPONSE_CACHE={'ENABLED': False}):
+        stored_queryset = TitleViewSet.queryset
+        aggregated = measure(aggregated_list, args.repeat)
+        TitleViewSet.queryset = stored_queryset
+        stored = measure(request_list, args.repeat)
+
+    print(f'titles: {args.titles}, reviews: {args.reviews}')
+    print(format_timings('Avg(reviews__score)', aggregated))
+    print(format_timings('rating_sum/rating_count', stored))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Пропускная способность выдачи JWT-токена.
+
+Старый вариант загружает пользователя и проверяет код подтверждения
+дважды, а затем перезаписывает все поля пользователя. Новый вариант —
+POST /api/v1/auth/token/ с одной загрузкой, одной проверкой и
+обновлением только last_login.
+
+Запуск из корня репозитория:
+    python -m benchmarks.token_issuance --users 2000
+"""
+import argparse
+import statistics
+
+from benchmarks.utils import format_timings, measure, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.contrib.auth.tokens import default_token_generator
+    from rest_framework.generics import get_object_or_404
+    from rest_framework.response import Response
+    from rest_framework.test import APIRequestFactory
+
+    from api.authentication import RoleAccessToken
+    from api.serializers import TokenSerializer
+    from api.views import TokenView
+    from users.models import YamdbUser
+
+    YamdbUser.objects.bulk_create(
+        YamdbUser(username=f'user{i}', email=f'user{i}@yamdb.fake')
+        for i in range(args.users)
+    )
+    factory = APIRequestFactory()
+
+    def make_requests():
+        return iter([
+            {
+                'username': user.username,
+                'confirmation_code': default_token_generator.make_token(user),
+            }
+            for user in YamdbUser.objects.all()
+        ])
+
+    class DoubleCheckTokenView(TokenView):
+        """Прежняя реализация TokenView.post."""
+
+        def post(self, request):
+            serializer = TokenSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            user = get_object_or_404(
+                YamdbUser, username=serializer.validated_data['username']
+            )
+            assert default_token_generator.check_token(
+                user, serializer.validated_data['confirmation_code']
+            )
+            user.save()
+            token = RoleAccessToken.for_user(user)
+            return Response({'token': str(token)})
+
+    def issue_token(view, data):
+        response = view(factory.post('/api/v1/auth/token/', data))
+        assert response.status_code == 200, response.data
+
+    print(f'users: {args.users}')
+    for label, view_class in (
+        ('двойная проверка + save()', DoubleCheckTokenView),
+        ('TokenView', TokenView),
+    ):
+        view = view_class.as_view()
+        requests = make_requests()
+        timings = measure(
+            lambda: issue_token(view, next(requests)), args.users
+        )
+        print(format_timings(label, timings))
+        print(f'  {1 / statistics.mean(timings):.0f} токенов/с')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+import json
+import os
+import statistics
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+from wsgiref.util import setup_testing_defaults
+
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+PROJECT_DIR = ROOT_DIR / 'api_yamdb'
+
+
+def setup_django(database_name=None):
+    """
+    Настраивает Django и создаёт пустую тестовую базу данных.
+
+    Бенчмарки никогда не работают с рабочей базой проекта. database_name
+    задаёт файл тестовой базы вместо базы в памяти.
+    """
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+    import django
+    from django.test.utils import setup_test_environment
+
+    django.setup()
+    setup_test_environment()
+
+    from django.db import connection
+
+    if database_name is not None:
+        connection.settings_dict['TEST']['NAME'] = str(database_name)
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+
+def measure(func, repeat):
+    """Возвращает длительности (в секундах) повторных вызовов func."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def percentile(timings, percent):
+    ordered = sorted(timings)
+    index = min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def format_timings(label, timings):
+    return (
+        f'{label}: median {statistics.median(timings) * 1000:.2f} ms, '
+        f'p95 {percentile(timings, 95) * 1000:.2f} ms, '
+        f'runs {len(timings)}'
+    )
+
+
+def wsgi_request(handler, method, path, query='', body=None, token=None):
+    """Запрос к WSGI-приложению; возвращает статус и тело ответа."""
+    environ = {
+        'REQUEST_METHOD': method,
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'HTTP_HOST': 'testserver',
+    }
+    if body is not None:
+        content = json.dumps(body).encode()
+        environ.update({
+            'CONTENT_TYPE': 'application/json',
+            'CONTENT_LENGTH': str(len(content)),
+            'wsgi.input': BytesIO(content),
+        })
+    if token is not None:
+        environ['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+    setup_testing_defaults(environ)
+    statuses = []
+    result = handler(
+        environ, lambda status, headers: statuses.append(status)
+    )
+    content = b''.join(result)
+    result.close()
+    return int(statuses[0].split()[0]), content
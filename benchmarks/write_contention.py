@@ -0,0 +1,172 @@
+"""
+Конкурентная запись в SQLite: --writers потоков одновременно.
+
+Каждый поток — отдельный пользователь: он создаёт отзыв на
+произведение и комментарий к нему через WSGIHandler. База лежит в
+файле. Режимы (--modes):
+    deferred   — без координатора записи, транзакции BEGIN DEFERRED;
+    immediate  — api.writes: BEGIN IMMEDIATE и повторы с паузами;
+    serialized — то же, записи процесса выполняются по одной.
+Для каждого режима выводятся отказы (ответы не 2xx), задержки и
+метрики ожидания блокировки. С --check код выхода 1, если в режимах с
+координатором были отказы.
+
+Запуск из корня репозитория:
+    python -m benchmarks.write_contention --writers 200 --check
+"""
+import argparse
+import json
+import logging
+import sys
+import tempfile
+import threading
+import time
+from io import StringIO
+from pathlib import Path
+
+from benchmarks.datagen import Scale, generate
+from benchmarks.utils import percentile, setup_django, wsgi_request
+
+
+MODES = ('deferred', 'immediate', 'serialized')
+
+
+def create_writers(prefix, count):
+    from django.contrib.auth import get_user_model
+
+    from api.authentication import RoleAccessToken
+
+    User = get_user_model()
+    users = User.objects.bulk_create(
+        User(username=f'{prefix}{i}', email=f'{prefix}{i}@yamdb.fake')
+        for i in range(count)
+    )
+    return [str(RoleAccessToken.for_user(user)) for user in users]
+
+
+def run_writers(handler, tokens, title_ids):
+    """Возвращает задержки записей и статусы отказов."""
+    from django.db import connections
+
+    barrier = threading.Barrier(len(tokens))
+    timings = []
+    failures = []
+    lock = threading.Lock()
+
+    def post(path, body, token, expected):
+        started = time.perf_counter()
+        status, content = wsgi_request(
+            handler, 'POST', path, body=body, token=token
+        )
+        with lock:
+            timings.append(time.perf_counter() - started)
+            if status != expected:
+                failures.append(status)
+        return json.loads(content) if status == expected else None
+
+    def writer(index, token):
+        title_id = title_ids[index % len(title_ids)]
+        reviews_url = f'/api/v1/titles/{title_id}/reviews/'
+        barrier.wait()
+        try:
+            review = post(
+                reviews_url, {'text': 'Конкурентный отзыв', 'score': 8},
+                token, 201,
+            )
+            if review is not None:
+                post(
+                    f'{reviews_url}{review["id"]}/comments/',
+                    {'text': 'Конкурентный комментарий'}, token, 201,
+                )
+        finally:
+            connections.close_all()
+
+    threads = [
+        threading.Thread(target=writer, args=(index, token))
+        for index, token in enumerate(tokens)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return timings, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    Scale.add_arguments(parser)
+    parser.add_argument('--writers', type=int, default=200)
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=MODES)
+    parser.add_argument('--check', action='store_true')
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        setup_django(database_name=Path(work_dir) / 'benchmark.sqlite3')
+
+        from django.conf import settings
+        from django.core.handlers.wsgi import WSGIHandler
+        from django.core.management import call_command
+        from django.db import connection, connections
+        from django.test import override_settings
+
+        from api.metrics import QUANTILES, write_metrics
+        from reviews.models import Title
+
+        logging.getLogger('django.request').setLevel(logging.CRITICAL)
+        logging.getLogger('api.metrics').setLevel(logging.ERROR)
+        data_dir = Path(work_dir) / 'data'
+        generate(data_dir, Scale.from_options(options))
+        call_command(
+            'import_csv', data_dir=data_dir, batch_size=5000,
+            stdout=StringIO(), stderr=StringIO(),
+        )
+        title_ids = list(Title.objects.values_list('id', flat=True))
+        handler = WSGIHandler()
+        database_options = connection.settings_dict['OPTIONS']
+        transaction_mode = database_options.get('transaction_mode')
+
+        print(f'писателей: {options.writers}')
+        failed = False
+        for mode in options.modes:
+            tokens = create_writers(f'{mode}-', options.writers)
+            connections.close_all()
+            if mode == 'deferred':
+                database_options.pop('transaction_mode', None)
+            else:
+                database_options['transaction_mode'] = 'IMMEDIATE'
+            write_metrics.reset()
+            with override_settings(
+                RESPONSE_CACHE={'ENABLED': False},
+                WRITE_COORDINATOR={
+                    **settings.WRITE_COORDINATOR,
+                    'ENABLED': mode != 'deferred',
+                    'SERIALIZE': mode == 'serialized',
+                },
+            ):
+                started = time.perf_counter()
+                timings, failures = run_writers(handler, tokens, title_ids)
+                elapsed = time.perf_counter() - started
+            waits, _, _, retries, _ = write_metrics.snapshot()
+            wait_p90 = waits[QUANTILES.index(0.9)] / 1000
+            print(
+                f'{mode:<10} записей {len(timings)}, отказов '
+                f'{len(failures)}, {len(timings) / elapsed:.1f} записей/с, '
+                f'p50 {percentile(timings, 50) * 1000:.1f} ms, '
+                f'p95 {percentile(timings, 95) * 1000:.1f} ms, '
+                f'ожидание блокировки p90 {wait_p90:.1f} ms, '
+                f'повторов {retries}'
+            )
+            if mode != 'deferred' and failures:
+                failed = True
+        if transaction_mode is not None:
+            database_options['transaction_mode'] = transaction_mode
+        connections.close_all()
+
+    if options.check and failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,26 @@
+import importlib
+import warnings
+
+import pytest
+from django.urls import clear_url_caches
+
+
+def reload_urlconf(root_urlconf):
+    """Заново создаёт представления вьюсетов v1 по текущим настройкам."""
+    with warnings.catch_warnings():
+        # DRF повторно регистрирует конвертер суффикса формата.
+        warnings.simplefilter('ignore', PendingDeprecationWarning)
+        for name in ('api.urls', root_urlconf):
+            importlib.reload(importlib.import_module(name))
+    clear_url_caches()
+
+
+@pytest.fixture
+def async_reads(settings):
+    """Асинхронные представления чтения, как под ASGI."""
+    original = settings.ASYNC_READS
+    settings.ASYNC_READS = {'ENABLED': True}
+    reload_urlconf(settings.ROOT_URLCONF)
+    yield
+    settings.ASYNC_READS = original
+    reload_urlconf(settings.ROOT_URLCONF)
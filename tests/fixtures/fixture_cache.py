@@ -0,0 +1,11 @@
+import pytest
+
+from django.core.cache import caches
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """База очищается между тестами, поэтому очищается и кэш."""
+    for cache in caches.all():
+        cache.clear()
+    yield
@@ -0,0 +1,10 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def eager_emails(settings):
+    """
+    По умолчанию письма ждут обработчика send_emails; тесты регистрации
+    проверяют mail.outbox сразу после запроса.
+    """
+    settings.EMAIL_OUTBOX = {**settings.EMAIL_OUTBOX, 'EAGER': True}
@@ -0,0 +1,128 @@
+from http import HTTPStatus
+
+import pytest
+
+from django.core.management import call_command
+
+from reviews.models import Title
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json()['rating']
+
+    def test_01_rating_follows_reviews(self, client, admin_client,
+                                       user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Отлично', 10)
+        review_id = create_single_review(
+            moderator_client, title_id, 'Так себе', 4
+        ).json()['id']
+        assert self.get_rating(client, title_id) == 7, (
+            'Проверьте, что рейтинг произведения пересчитывается после '
+            'создания отзыва.'
+        )
+
+        response = moderator_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review_id
+            ),
+            data={'score': 8}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(client, title_id) == 9, (
+            'Проверьте, что рейтинг произведения пересчитывается после '
+            'изменения оценки в отзыве.'
+        )
+
+        response = moderator_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review_id
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(client, title_id) == 10, (
+            'Проверьте, что рейтинг произведения пересчитывается после '
+            'удаления отзыва.'
+        )
+        assert self.get_rating(client, titles[1]['id']) is None
+
+    def test_02_rating_after_author_deleted(self, client, admin_client,
+                                            user, user_client,
+                                            moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Плохо', 1)
+        create_single_review(moderator_client, title_id, 'Хорошо', 9)
+
+        user.delete()
+
+        assert self.get_rating(client, title_id) == 9, (
+            'Проверьте, что при удалении пользователя его оценки '
+            'исключаются из рейтинга произведений.'
+        )
+
+    def test_03_recalculate_ratings(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Хорошо', 6)
+        Title.objects.filter(pk=title_id).update(rating_sum=0, rating_count=5)
+
+        call_command('recalculate_ratings')
+
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count) == (6, 1), (
+            'Проверьте, что команда `recalculate_ratings` восстанавливает '
+            'рейтинг произведений по отзывам.'
+        )
+
+    def test_04_save_keeps_rating(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        stale = Title.objects.get(pk=title_id)
+        create_single_review(user_client, title_id, 'Хорошо', 6)
+
+        stale.name = 'Новое название'
+        stale.save()
+
+        title = Title.objects.get(pk=title_id)
+        assert title.name == 'Новое название'
+        assert (title.rating_sum, title.rating_count) == (6, 1), (
+            'Проверьте, что сохранение произведения не перезаписывает '
+            'рейтинг, изменённый параллельным отзывом.'
+        )
+
+    def test_05_delete_reviewed_title(self, client, admin_client,
+                                      user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        deleted_id, kept_id = titles[0]['id'], titles[1]['id']
+        create_single_review(user_client, deleted_id, 'Плохо', 1)
+        create_single_review(moderator_client, deleted_id, 'Хорошо', 9)
+        create_single_review(user_client, kept_id, 'Неплохо', 7)
+
+        response = admin_client.delete(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=deleted_id)
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT, (
+            'Проверьте, что произведение с отзывами удаляется вместе с '
+            'отзывами.'
+        )
+        assert not Title.objects.filter(pk=deleted_id).exists()
+        title = Title.objects.get(pk=kept_id)
+        assert (title.rating_sum, title.rating_count) == (7, 1), (
+            'Проверьте, что каскадное удаление отзывов произведения не '
+            'меняет рейтинг других произведений.'
+        )
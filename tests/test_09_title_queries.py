@@ -0,0 +1,98 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import (
+    check_constant_query_count,
+    count_queries,
+    create_titles,
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleQueries:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_list_query_count(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+
+        def populate():
+            for idx in range(3):
+                response = admin_client.post(self.TITLES_URL, data={
+                    'name': f'Произведение {idx}',
+                    'year': 2000,
+                    'genre': [genre['slug'] for genre in genres],
+                    'category': categories[0]['slug'],
+                })
+                assert response.status_code == HTTPStatus.CREATED
+
+        check_constant_query_count(client, self.TITLES_URL, populate)
+
+    def test_02_create_does_not_refetch_genres(self, admin_client):
+        _, categories, genres = create_titles(admin_client)
+        responses = []
+
+        def create_title():
+            responses.append(admin_client.post(self.TITLES_URL, data={
+                'name': 'Новое произведение',
+                'year': 2001,
+                'genre': [genre['slug'] for genre in genres],
+                'category': categories[1]['slug'],
+            }))
+
+        queries = count_queries(create_title)
+        assert responses[0].status_code == HTTPStatus.CREATED
+        assert len(responses[0].json()['genre']) == len(genres)
+        genre_reads = [
+            query for query in queries
+            if '"reviews_genre"."name"' in query['sql']
+            and 'reviews_title_genre' in query['sql']
+        ]
+        assert not genre_reads, (
+            'Проверьте, что ответ на POST-запрос к '
+            f'`{self.TITLES_URL}` не перечитывает из БД жанры, '
+            'которые только что были сохранены.'
+        )
+
+    def test_03_write_response_matches_read(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        slugs = [genre['slug'] for genre in genres]
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Новое произведение',
+            'year': 2001,
+            'genre': [slugs[2], slugs[0], slugs[2]],
+            'category': categories[1]['slug'],
+        })
+        assert response.status_code == HTTPStatus.CREATED
+        url = f'{self.TITLES_URL}{response.json()["id"]}/'
+        assert response.json()['genre'] == client.get(url).json()['genre'], (
+            'Проверьте, что жанры в ответе на POST-запрос совпадают с '
+            'ответом GET-запроса: без повторов и в том же порядке.'
+        )
+
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+        responses = []
+
+        def update_title():
+            responses.append(admin_client.patch(
+                url, data={'genre': [slugs[2], slugs[1]]}
+            ))
+
+        queries = count_queries(update_title)
+        assert responses[0].status_code == HTTPStatus.OK
+        assert responses[0].json()['genre'] == client.get(url).json()[
+            'genre'
+        ], (
+            'Проверьте, что жанры в ответе на PATCH-запрос совпадают с '
+            'ответом GET-запроса.'
+        )
+        genre_reads = [
+            query for query in queries
+            if '"reviews_genre"."name"' in query['sql']
+            and 'reviews_title_genre' in query['sql']
+        ]
+        assert not genre_reads, (
+            'Проверьте, что ответ на PATCH-запрос к произведению не '
+            'перечитывает из БД жанры, которые только что были сохранены.'
+        )
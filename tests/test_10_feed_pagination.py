@@ -0,0 +1,84 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Review
+from tests.utils import count_queries, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10FeedPagination:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    REVIEWS_COUNT = 12
+
+    def create_reviews(self, admin_client, django_user_model):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        for idx in range(self.REVIEWS_COUNT):
+            author = django_user_model.objects.create_user(
+                username=f'reviewer{idx}', email=f'reviewer{idx}@yamdb.fake'
+            )
+            Review.objects.create(
+                author=author, title_id=title_id, text=f'Отзыв {idx}', score=5
+            )
+        expected_ids = list(
+            Review.objects.filter(title_id=title_id)
+            .order_by('-pub_date', '-id')
+            .values_list('id', flat=True)
+        )
+        return self.REVIEWS_URL_TEMPLATE.format(title_id=title_id), (
+            expected_ids
+        )
+
+    def test_01_cursor_walk(self, client, admin_client, django_user_model):
+        url, expected_ids = self.create_reviews(
+            admin_client, django_user_model
+        )
+        pages = []
+        next_url = f'{url}?pagination=cursor'
+        while next_url:
+            response = client.get(next_url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что курсорная пагинация не возвращает `count`.'
+            )
+            pages.append(data)
+            next_url = data['next']
+        received_ids = [
+            review['id'] for page in pages for review in page['results']
+        ]
+        assert received_ids == expected_ids, (
+            'Проверьте, что курсорная пагинация отдаёт все отзывы от новых '
+            'к старым без пропусков и повторов.'
+        )
+        assert pages[0]['previous'] is None
+
+        response = client.get(pages[1]['previous'])
+        assert response.json()['results'] == pages[0]['results'], (
+            'Проверьте, что ссылка `previous` ведёт на предыдущую страницу.'
+        )
+
+    def test_02_cursor_without_count(self, client, admin_client,
+                                     django_user_model):
+        url, _ = self.create_reviews(admin_client, django_user_model)
+        queries = count_queries(client.get, f'{url}?pagination=cursor')
+        assert not [
+            query for query in queries if 'COUNT(' in query['sql']
+        ], 'Проверьте, что курсорная пагинация не выполняет COUNT(*).'
+
+    def test_03_page_number_by_default(self, client, admin_client,
+                                       django_user_model):
+        url, expected_ids = self.create_reviews(
+            admin_client, django_user_model
+        )
+        data = client.get(url).json()
+        assert data['count'] == len(expected_ids)
+        assert set(data) == {'count', 'next', 'previous', 'results'}
+
+    def test_04_invalid_cursor(self, client, admin_client,
+                               django_user_model):
+        url, _ = self.create_reviews(admin_client, django_user_model)
+        response = client.get(f'{url}?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,98 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.cache import get_cache_stats, reset_cache_stats
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ResponseCache:
+
+    CATEGORIES_URL = '/api/v1/categories/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def get(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return response
+
+    def test_01_anonymous_hit_and_miss(self, client, admin_client):
+        create_titles(admin_client)
+        reset_cache_stats()
+
+        first = self.get(client, self.CATEGORIES_URL)
+        second = self.get(client, self.CATEGORIES_URL)
+        assert first['X-Cache'] == 'MISS'
+        assert second['X-Cache'] == 'HIT', (
+            'Проверьте, что повторный анонимный GET-запрос к '
+            f'`{self.CATEGORIES_URL}` отдаётся из кэша.'
+        )
+        assert second.json() == first.json()
+        assert get_cache_stats() == {'hits': 1, 'misses': 1}
+
+        response = admin_client.get(self.CATEGORIES_URL)
+        assert 'X-Cache' not in response, (
+            'Проверьте, что запросы авторизованных пользователей не '
+            'кэшируются.'
+        )
+
+        admin_client.post(
+            self.CATEGORIES_URL, data={'name': 'Музыка', 'slug': 'music'}
+        )
+        response = self.get(client, self.CATEGORIES_URL)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['count'] == 3
+
+    def test_02_review_invalidates_only_its_title(self, client,
+                                                  admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        first_title, second_title = titles[0]['id'], titles[1]['id']
+        urls = {
+            'first_reviews': self.REVIEWS_URL_TEMPLATE.format(
+                title_id=first_title
+            ),
+            'second_reviews': self.REVIEWS_URL_TEMPLATE.format(
+                title_id=second_title
+            ),
+            'first_title': self.TITLE_DETAIL_URL_TEMPLATE.format(
+                title_id=first_title
+            ),
+            'second_title': self.TITLE_DETAIL_URL_TEMPLATE.format(
+                title_id=second_title
+            ),
+        }
+        for url in urls.values():
+            self.get(client, url)
+
+        create_single_review(user_client, first_title, 'Отлично', 10)
+
+        responses = {name: self.get(client, url) for name, url in urls.items()}
+        assert responses['first_reviews']['X-Cache'] == 'MISS'
+        assert responses['first_reviews'].json()['count'] == 1
+        assert responses['first_title']['X-Cache'] == 'MISS'
+        assert responses['first_title'].json()['rating'] == 10
+        assert responses['second_reviews']['X-Cache'] == 'HIT', (
+            'Проверьте, что новый отзыв не сбрасывает кэш отзывов других '
+            'произведений.'
+        )
+        assert responses['second_title']['X-Cache'] == 'HIT'
+
+    def test_03_file_based_backend(self, client, admin_client, settings,
+                                   tmp_path):
+        settings.CACHES = {
+            'default': {
+                'BACKEND': 'django.core.cache.backends.filebased.'
+                           'FileBasedCache',
+                'LOCATION': str(tmp_path),
+            }
+        }
+        create_titles(admin_client)
+
+        assert self.get(client, self.CATEGORIES_URL)['X-Cache'] == 'MISS'
+        assert self.get(client, self.CATEGORIES_URL)['X-Cache'] == 'HIT'
+        admin_client.delete(f'{self.CATEGORIES_URL}films/')
+        response = self.get(client, self.CATEGORIES_URL)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['count'] == 1
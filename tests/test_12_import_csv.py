@@ -0,0 +1,67 @@
+import csv
+from io import StringIO
+
+import pytest
+
+from django.core.management import call_command
+
+from api.importers import DEFAULT_DATA_DIR, SPECS
+from reviews.models import Review, Title
+
+
+def count_rows(filename, data_dir=DEFAULT_DATA_DIR):
+    with open(data_dir / filename, encoding='utf-8', newline='') as file:
+        return sum(1 for _ in csv.DictReader(file))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ImportCSV:
+
+    def test_01_import_all(self):
+        stdout = StringIO()
+        call_command('import_csv', stdout=stdout, stderr=StringIO())
+
+        for spec in SPECS.values():
+            expected = count_rows(spec.filename)
+            assert spec.model._default_manager.count() == expected, (
+                f'Проверьте, что команда `import_csv` загружает все строки '
+                f'файла `{spec.filename}`.'
+            )
+        title = Title.objects.filter(reviews__isnull=False).first()
+        scores = list(title.reviews.values_list('score', flat=True))
+        assert title.rating_sum == sum(scores), (
+            'Проверьте, что после импорта отзывов пересчитывается рейтинг '
+            'произведений.'
+        )
+        assert title.rating_count == len(scores)
+        assert 'строк/с' in stdout.getvalue()
+
+    def test_02_rejected_rows(self, tmp_path):
+        for name in ('users', 'categories', 'genres', 'titles'):
+            call_command(
+                f'import_{name}', stdout=StringIO(), stderr=StringIO()
+            )
+        title_id = Title.objects.values_list('id', flat=True).first()
+        (tmp_path / 'review.csv').write_text(
+            'id,title_id,text,author,score,pub_date\n'
+            f'1,{title_id},Хорошо,100,8,2020-01-01T00:00:00Z\n'
+            f'2,{title_id},Снова,100,9,2020-01-01T00:00:00Z\n'
+            f'3,{title_id},Плохо,101,42,2020-01-01T00:00:00Z\n'
+            '4,999999,Нет,101,5,2020-01-01T00:00:00Z\n',
+            encoding='utf-8',
+        )
+        stderr = StringIO()
+        call_command(
+            'import_reviews', data_dir=tmp_path, batch_size=2,
+            stdout=StringIO(), stderr=stderr
+        )
+
+        assert list(Review.objects.values_list('id', flat=True)) == [1]
+        errors = stderr.getvalue().splitlines()
+        assert len(errors) == 3, (
+            'Проверьте, что команда импорта сообщает о каждой отклонённой '
+            'строке.'
+        )
+        assert errors[0].startswith('review.csv:3:')
+        assert 'score' in errors[1]
+        assert 'title_id=999999' in errors[2]
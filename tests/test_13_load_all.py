@@ -0,0 +1,68 @@
+import shutil
+from io import StringIO
+
+import pytest
+
+from django.core.management import CommandError, call_command
+
+from api.importers import DEFAULT_DATA_DIR, DEPENDENCIES, SPECS
+from reviews.models import Comment, Review
+
+
+def test_dependencies_follow_foreign_keys():
+    assert DEPENDENCIES['users'] == set()
+    assert DEPENDENCIES['categories'] == set()
+    assert DEPENDENCIES['genres'] == set()
+    assert DEPENDENCIES['titles'] == {'categories'}
+    assert DEPENDENCIES['genres_titles'] == {'titles', 'genres'}
+    assert DEPENDENCIES['reviews'] == {'titles', 'users'}
+    assert DEPENDENCIES['comments'] == {'reviews', 'users'}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13LoadAll:
+
+    def test_01_load_all(self, tmp_path):
+        stdout = StringIO()
+        call_command(
+            'load_all', data_dir=DEFAULT_DATA_DIR,
+            state_file=tmp_path / 'state.json', stdout=stdout,
+            stderr=StringIO()
+        )
+        for spec in SPECS.values():
+            assert spec.model._default_manager.exists(), (
+                f'Проверьте, что `load_all` загружает `{spec.filename}`.'
+            )
+        assert not (tmp_path / 'state.json').exists()
+
+    def test_02_resume_after_failure(self, tmp_path):
+        data_dir = tmp_path / 'data'
+        shutil.copytree(DEFAULT_DATA_DIR, data_dir)
+        review_file = data_dir / 'review.csv'
+        review_file.rename(tmp_path / 'review.csv')
+        review_file.mkdir()
+
+        with pytest.raises(CommandError):
+            call_command(
+                'load_all', data_dir=data_dir, workers=1,
+                stdout=StringIO(), stderr=StringIO()
+            )
+        assert not Review.objects.exists()
+        assert not Comment.objects.exists()
+        assert (data_dir / '.load_all.json').exists()
+
+        review_file.rmdir()
+        (tmp_path / 'review.csv').rename(review_file)
+        stdout = StringIO()
+        call_command(
+            'load_all', data_dir=data_dir, workers=1,
+            stdout=stdout, stderr=StringIO()
+        )
+        output = stdout.getvalue()
+        assert 'users: уже загружен' in output, (
+            'Проверьте, что `load_all` не загружает повторно файлы, '
+            'загруженные до сбоя.'
+        )
+        assert 'reviews: создано' in output
+        assert Comment.objects.exists()
+        assert not (data_dir / '.load_all.json').exists()
@@ -0,0 +1,114 @@
+from http import HTTPStatus
+from io import StringIO
+from smtplib import SMTPException
+
+import pytest
+
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.db import OperationalError
+from django.utils import timezone
+
+from users import outbox
+from users.models import OutgoingEmail
+
+
+class FailingEmailBackend(BaseEmailBackend):
+
+    def send_messages(self, email_messages):
+        raise SMTPException('Сервер недоступен')
+
+
+@pytest.fixture
+def outbox_settings(settings):
+    settings.EMAIL_OUTBOX = {**settings.EMAIL_OUTBOX, 'EAGER': False}
+    return settings
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    SIGNUP_DATA = {'email': 'outbox@yamdb.fake', 'username': 'outbox_user'}
+
+    def test_01_signup_enqueues_email(self, client, outbox_settings):
+        outbox_before_count = len(mail.outbox)
+        response = client.post(self.URL_SIGNUP, data=self.SIGNUP_DATA)
+        assert response.status_code == HTTPStatus.OK
+        assert len(mail.outbox) == outbox_before_count, (
+            'Проверьте, что при регистрации письмо не отправляется в '
+            'запросе, а ставится в очередь.'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.recipient == self.SIGNUP_DATA['email']
+        assert email.sent_at is None
+
+        call_command('send_emails', stdout=StringIO())
+
+        assert len(mail.outbox) == outbox_before_count + 1
+        assert mail.outbox[-1].to == [self.SIGNUP_DATA['email']]
+        assert 'Ваш код' in mail.outbox[-1].body
+        email.refresh_from_db()
+        assert email.sent_at is not None
+        assert email.attempts == 1
+        assert email.message == '', (
+            'Проверьте, что текст отправленного письма с кодом '
+            'подтверждения не хранится в очереди.'
+        )
+
+    def test_02_retry_with_backoff(self, client, outbox_settings):
+        client.post(self.URL_SIGNUP, data=self.SIGNUP_DATA)
+        outbox_settings.EMAIL_BACKEND = (
+            'tests.test_14_email_outbox.FailingEmailBackend'
+        )
+        call_command('send_emails', stdout=StringIO())
+
+        email = OutgoingEmail.objects.get()
+        assert email.sent_at is None
+        assert email.attempts == 1
+        assert 'SMTPException' in email.last_error
+        assert email.next_attempt_at > timezone.now(), (
+            'Проверьте, что неотправленное письмо откладывается на время '
+            'задержки перед повтором.'
+        )
+
+        outbox_settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.locmem.EmailBackend'
+        )
+        call_command('send_emails', stdout=StringIO())
+        assert OutgoingEmail.objects.get().sent_at is None
+
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        call_command('send_emails', stdout=StringIO())
+        email.refresh_from_db()
+        assert email.sent_at is not None
+        assert email.attempts == 2
+
+    def test_03_file_based_backend(self, client, outbox_settings, tmp_path):
+        outbox_settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.filebased.EmailBackend'
+        )
+        outbox_settings.EMAIL_FILE_PATH = tmp_path
+        client.post(self.URL_SIGNUP, data=self.SIGNUP_DATA)
+
+        call_command('send_emails', stdout=StringIO())
+
+        files = list(tmp_path.iterdir())
+        assert len(files) == 1
+        assert self.SIGNUP_DATA['email'] in files[0].read_text()
+
+    def test_04_eager_failure_keeps_signup(self, client, settings,
+                                           monkeypatch):
+        settings.EMAIL_OUTBOX = {**settings.EMAIL_OUTBOX, 'EAGER': True}
+
+        def locked(**kwargs):
+            raise OperationalError('database is locked')
+
+        monkeypatch.setattr(outbox, 'deliver_pending', locked)
+        response = client.post(self.URL_SIGNUP, data=self.SIGNUP_DATA)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ошибка немедленной отправки письма не ломает '
+            'регистрацию.'
+        )
+        assert OutgoingEmail.objects.filter(sent_at__isnull=True).count() == 1
@@ -0,0 +1,113 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import caches
+
+from tests.utils import count_queries, get_claims_client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15TokenClaims:
+
+    USERS_URL = '/api/v1/users/'
+    USERS_ME_URL = '/api/v1/users/me/'
+    CATEGORIES_URL = '/api/v1/categories/'
+
+    def test_01_no_user_query(self, admin, django_user_model):
+        client = get_claims_client(admin)
+        user_table = django_user_model._meta.db_table
+        responses = []
+
+        queries = count_queries(
+            lambda: responses.append(client.get(self.CATEGORIES_URL))
+        )
+        assert responses[0].status_code == HTTPStatus.OK
+        assert not [
+            query for query in queries if user_table in query['sql']
+        ], (
+            'Проверьте, что пользователь с токеном, содержащим claims роли, '
+            'аутентифицируется без запроса к таблице пользователей.'
+        )
+
+    def test_02_demoted_admin_loses_access(self, admin):
+        client = get_claims_client(admin)
+        assert client.get(self.USERS_URL).status_code == HTTPStatus.OK
+
+        admin.role = 'user'
+        admin.save()
+
+        response = client.get(self.USERS_URL)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что смена роли отзывает claims ранее выданных '
+            'токенов и права проверяются по данным из БД.'
+        )
+        response = client.post(
+            self.CATEGORIES_URL, data={'name': 'Музыка', 'slug': 'music'}
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+        new_client = get_claims_client(admin)
+        assert new_client.get(self.USERS_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+
+    def test_03_deactivated_user_rejected(self, user):
+        client = get_claims_client(user)
+        assert client.get(self.USERS_ME_URL).status_code == HTTPStatus.OK
+
+        user.is_active = False
+        user.save()
+
+        response = client.get(self.USERS_ME_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что токен заблокированного пользователя перестаёт '
+            'приниматься.'
+        )
+
+    def test_04_me_returns_full_profile(self, user):
+        client = get_claims_client(user)
+
+        response = client.get(self.USERS_ME_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['bio'] == user.bio, (
+            f'Проверьте, что `{self.USERS_ME_URL}` возвращает все поля '
+            'профиля при аутентификации по claims токена.'
+        )
+
+        response = client.patch(
+            self.USERS_ME_URL, data={'first_name': 'Иван'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        user.refresh_from_db()
+        assert user.first_name == 'Иван'
+        assert user.email == 'testuser@yamdb.fake'
+
+    def test_05_expired_marker_restored(self, admin, django_user_model,
+                                        settings):
+        client = get_claims_client(admin)
+        user_table = django_user_model._meta.db_table
+        caches[settings.AUTH_CLAIMS['CACHE_ALIAS']].clear()
+
+        queries = count_queries(client.get, self.CATEGORIES_URL)
+        assert [query for query in queries if user_table in query['sql']], (
+            'Проверьте, что без метки claims пользователь читается из БД.'
+        )
+        queries = count_queries(client.get, self.CATEGORIES_URL)
+        assert not [
+            query for query in queries if user_table in query['sql']
+        ], (
+            'Проверьте, что после чтения из БД метка claims сохраняется '
+            'и следующие запросы обходятся без БД.'
+        )
+
+    def test_06_revocation_not_evicted_by_responses(self, admin):
+        client = get_claims_client(admin)
+        admin.role = 'user'
+        admin.save()
+        caches['default'].clear()
+
+        response = client.get(self.USERS_URL)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что метки отзыва claims хранятся отдельно от кэша '
+            'ответов и не вытесняются им.'
+        )
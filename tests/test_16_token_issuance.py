@@ -0,0 +1,49 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+
+from tests.utils import count_queries
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16TokenIssuance:
+
+    URL_TOKEN = '/api/v1/auth/token/'
+
+    def test_01_single_lookup_and_targeted_update(self, client, user):
+        data = {
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user),
+        }
+        responses = []
+
+        queries = count_queries(
+            lambda: responses.append(client.post(self.URL_TOKEN, data=data))
+        )
+        assert responses[0].status_code == HTTPStatus.OK
+        assert 'token' in responses[0].json()
+        selects = [q for q in queries if q['sql'].startswith('SELECT')]
+        updates = [q for q in queries if q['sql'].startswith('UPDATE')]
+        assert len(selects) == 1, (
+            'Проверьте, что при выдаче токена пользователь загружается '
+            'из БД один раз.'
+        )
+        assert len(updates) == 1 and 'last_login' in updates[0]['sql']
+        assert '"bio"' not in updates[0]['sql'], (
+            'Проверьте, что при выдаче токена обновляется только '
+            '`last_login`, а не все поля пользователя.'
+        )
+
+    def test_02_code_is_single_use(self, client, user):
+        data = {
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user),
+        }
+        assert client.post(self.URL_TOKEN, data=data).status_code == (
+            HTTPStatus.OK
+        )
+        response = client.post(self.URL_TOKEN, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что код подтверждения нельзя использовать повторно.'
+        )
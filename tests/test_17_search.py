@@ -0,0 +1,98 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+
+from reviews.models import Category, Title
+from reviews.search import (
+    get_index_table,
+    install_search_index,
+    is_search_available,
+)
+
+
+def get_names(client, url):
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return [item['name'] for item in response.json()['results']]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17Search:
+
+    TITLES_URL = '/api/v1/titles/'
+    CATEGORIES_URL = '/api/v1/categories/'
+
+    @pytest.fixture
+    def titles(self):
+        category = Category.objects.create(name='Фильм', slug='films')
+        Title.objects.bulk_create(
+            Title(name=name, year=2000, category=category) for name in (
+                'Абв мир длинное название произведения',
+                'Мир мир',
+                'Война и мир',
+                'Поворот туда',
+            )
+        )
+
+    def test_01_index_available(self):
+        assert is_search_available(Title), (
+            'Проверьте, что миграции создают FTS5-индекс произведений.'
+        )
+
+    def test_02_prefix_and_tokens(self, client, titles):
+        assert get_names(client, f'{self.TITLES_URL}?name=пово') == [
+            'Поворот туда'
+        ], 'Проверьте, что поиск по названию находит слова по префиксу.'
+        assert get_names(client, f'{self.TITLES_URL}?name=мир войн') == [
+            'Война и мир'
+        ], 'Проверьте, что поиск требует совпадения всех слов запроса.'
+
+    def test_03_ranked_results(self, client, titles):
+        names = get_names(client, f'{self.TITLES_URL}?name=мир')
+        assert names[0] == 'Мир мир', (
+            'Проверьте, что результаты поиска отсортированы по '
+            'релевантности.'
+        )
+        assert len(names) == 3
+
+    def test_04_index_follows_changes(self, client, titles):
+        Title.objects.filter(name='Поворот туда').update(name='Разворот')
+        assert get_names(client, f'{self.TITLES_URL}?name=пово') == []
+        assert get_names(client, f'{self.TITLES_URL}?name=разв') == [
+            'Разворот'
+        ]
+        Title.objects.filter(name='Разворот').delete()
+        assert get_names(client, f'{self.TITLES_URL}?name=разв') == []
+
+        response = client.get(f'{self.CATEGORIES_URL}?search=фил')
+        assert [item['slug'] for item in response.json()['results']] == [
+            'films'
+        ], 'Проверьте, что поиск категорий использует FTS-индекс.'
+
+    def test_05_triggers_restored(self, client, titles):
+        index = get_index_table(Title)
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TRIGGER {index}_ai')
+        install_search_index(connection)
+
+        Title.objects.create(name='Новинка', year=2020)
+        assert get_names(client, f'{self.TITLES_URL}?name=новин') == [
+            'Новинка'
+        ], (
+            'Проверьте, что триггеры поиска восстанавливаются, если таблица '
+            'была пересоздана миграцией.'
+        )
+
+    def test_06_like_fallback(self, client, titles, monkeypatch):
+        monkeypatch.setattr(
+            'reviews.search.is_search_available', lambda *args: False
+        )
+        monkeypatch.setattr(
+            'api.filters.is_search_available', lambda *args: False
+        )
+        assert get_names(client, f'{self.TITLES_URL}?name=орот') == [
+            'Поворот туда'
+        ]
+        response = client.get(f'{self.CATEGORIES_URL}?search=ильм')
+        assert response.json()['count'] == 1
@@ -0,0 +1,71 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments
+
+
+def get_query_plans(client, url, table):
+    """Возвращает планы SELECT-запросов с ORDER BY к таблице `table`."""
+    with CaptureQueriesContext(connection) as context:
+        client.get(url)
+    plans = []
+    with connection.cursor() as cursor:
+        for query in context.captured_queries:
+            sql = query['sql']
+            if not sql.startswith('SELECT') or 'ORDER BY' not in sql:
+                continue
+            if f'FROM "{table}"' not in sql:
+                continue
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            plans.append(' | '.join(row[-1] for row in cursor.fetchall()))
+    assert plans, f'Не найден запрос списка к таблице `{table}`.'
+    return plans
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18QueryPlans:
+
+    @pytest.mark.parametrize('url_template,table,index', (
+        (
+            '/api/v1/titles/{title_id}/reviews/',
+            'reviews_review',
+            'review_title_pub_date_idx',
+        ),
+        (
+            '/api/v1/titles/{title_id}/reviews/?pagination=cursor',
+            'reviews_review',
+            'review_title_pub_date_idx',
+        ),
+        (
+            '/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+            'reviews_comment',
+            'comment_review_pub_date_idx',
+        ),
+        ('/api/v1/titles/', 'reviews_title', 'title_name_year_idx'),
+        (
+            '/api/v1/titles/?category=films',
+            'reviews_title',
+            'title_category_name_idx',
+        ),
+        ('/api/v1/titles/?year=1984', 'reviews_title', 'title_year_name_idx'),
+    ))
+    def test_01_list_uses_index(self, client, admin_client, user,
+                                user_client, moderator, moderator_client,
+                                url_template, table, index):
+        _, reviews, titles = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        url = url_template.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+
+        for plan in get_query_plans(client, url, table):
+            assert index in plan, (
+                f'Проверьте, что запрос списка `{url}` использует индекс '
+                f'`{index}`. План: {plan}'
+            )
+            assert 'TEMP B-TREE' not in plan, (
+                f'Проверьте, что запрос списка `{url}` не сортирует '
+                f'выборку во временном B-дереве. План: {plan}'
+            )
@@ -0,0 +1,93 @@
+import logging
+from http import HTTPStatus
+
+import pytest
+
+from api.cache import reset_cache_stats
+from api.metrics import Histogram, registry
+from tests.utils import create_titles
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    registry.reset()
+    yield
+    registry.reset()
+
+
+def test_histogram_precision():
+    histogram = Histogram(bits=5)
+    for value in range(1, 10001):
+        histogram.record(value)
+
+    assert abs(histogram.percentile(0.5) - 5000) / 5000 < 0.04, (
+        'Проверьте, что относительная ошибка квантилей гистограммы '
+        'ограничена.'
+    )
+    assert histogram.percentile(1.0) == 10000
+    assert histogram.count == 10000
+    assert len(histogram.counts) < 300
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19Metrics:
+
+    METRICS_URL = '/api/v1/metrics/'
+    CATEGORIES_URL = '/api/v1/categories/'
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_per_route_metrics(self, client, admin_client):
+        create_titles(admin_client)
+        registry.reset()
+        reset_cache_stats()
+        client.get(self.CATEGORIES_URL)
+        client.get(self.CATEGORIES_URL)
+        client.get(self.TITLES_URL)
+
+        response = admin_client.get(self.METRICS_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'].startswith('text/plain')
+        text = response.content.decode()
+        labels = 'view="categories-list",method="GET"'
+        assert f'yamdb_request_duration_seconds_count{{{labels}}} 2' in text, (
+            f'Проверьте, что `{self.METRICS_URL}` отдаёт гистограммы времени '
+            'ответа по маршрутам.'
+        )
+        for metric in (
+            'yamdb_db_duration_seconds', 'yamdb_db_queries',
+            'yamdb_serializer_duration_seconds',
+        ):
+            assert f'{metric}_count{{{labels}}} 2' in text
+        assert 'yamdb_response_cache_hits_total 1' in text
+
+        snapshot = registry.snapshot()
+        titles = snapshot[('titles-list', 'GET')]
+        assert titles['queries'][0][-1] >= 1
+        assert titles['serializer'][1] > 0, (
+            'Проверьте, что учитывается время сериализации.'
+        )
+
+    def test_02_access(self, client, user_client, settings):
+        assert client.get(self.METRICS_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        assert user_client.get(self.METRICS_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+        settings.METRICS = {'PUBLIC': True}
+        assert client.get(self.METRICS_URL).status_code == HTTPStatus.OK
+
+    def test_03_disabled(self, client, settings):
+        settings.METRICS = {'ENABLED': False}
+        client.get(self.CATEGORIES_URL)
+        assert registry.snapshot() == {}, (
+            'Проверьте, что сбор метрик отключается настройкой.'
+        )
+
+    def test_04_slow_request_logged(self, client, settings, caplog):
+        settings.METRICS = {'SLOW_REQUEST_MS': 0}
+        with caplog.at_level(logging.WARNING, logger='api.metrics'):
+            client.get(self.CATEGORIES_URL)
+        assert 'SELECT' in caplog.text, (
+            'Проверьте, что для медленных запросов в лог пишутся SQL-запросы.'
+        )
@@ -0,0 +1,38 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from benchmarks.datagen import Scale, generate
+from reviews.models import Comment, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20BenchmarkData:
+
+    def test_01_generated_catalog_imports(self, tmp_path):
+        scale = Scale(
+            titles=20, categories=3, genres=5, users=10,
+            reviews_per_title=4, comments_per_review=2, seed=1,
+        )
+        counts = generate(tmp_path, scale)
+        assert generate(tmp_path / 'again', scale) == counts
+        assert (tmp_path / 'review.csv').read_bytes() == (
+            tmp_path / 'again' / 'review.csv'
+        ).read_bytes(), (
+            'Проверьте, что при одинаковом seed генерируются одинаковые '
+            'данные.'
+        )
+
+        stderr = StringIO()
+        call_command(
+            'import_csv', data_dir=tmp_path, stdout=StringIO(), stderr=stderr
+        )
+        assert stderr.getvalue() == '', (
+            'Проверьте, что сгенерированный каталог загружается без '
+            'отклонённых строк.'
+        )
+        assert Title.objects.count() == 20
+        assert Review.objects.count() == 80
+        assert Comment.objects.count() == 160
+        assert Title.objects.filter(rating_count=4).count() == 20
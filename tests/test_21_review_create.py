@@ -0,0 +1,52 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Review
+from tests.utils import count_queries, create_titles, get_claims_client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21ReviewCreate:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_single_select_and_insert(self, admin_client, user):
+        titles, _, _ = create_titles(admin_client)
+        user_client = get_claims_client(user)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        responses = []
+
+        queries = count_queries(lambda: responses.append(
+            user_client.post(url, data={'text': 'Отлично', 'score': 10})
+        ))
+        assert responses[0].status_code == HTTPStatus.CREATED
+        statements = [query['sql'].split()[0] for query in queries]
+        assert statements.count('SELECT') == 1, (
+            'Проверьте, что при создании отзыва произведение загружается '
+            'один раз, а повторный отзыв не ищется отдельным запросом.'
+        )
+        assert statements.count('INSERT') == 1
+
+    def test_02_duplicate_rejected_by_constraint(self, admin_client,
+                                                 user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        data = {'text': 'Отлично', 'score': 10}
+        assert user_client.post(url, data=data).status_code == (
+            HTTPStatus.CREATED
+        )
+
+        response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что повторный отзыв на произведение возвращает '
+            'ответ со статусом 400.'
+        )
+        assert response.json() == {
+            'non_field_errors': ['Вы уже оставляли отзыв на это произведение']
+        }
+        assert Review.objects.count() == 1
+        response = admin_client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert response.json()['rating'] == 10, (
+            'Проверьте, что отклонённый повторный отзыв не меняет рейтинг.'
+        )
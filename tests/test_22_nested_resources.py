@@ -0,0 +1,86 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import count_queries, create_comments, get_claims_client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22NestedResources:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    @pytest.fixture
+    def comments(self, admin_client, user, user_client, moderator,
+                 moderator_client):
+        return create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+
+    def test_01_comment_list_queries(self, client, comments):
+        _, reviews, titles = comments
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        responses = []
+
+        queries = count_queries(lambda: responses.append(client.get(url)))
+        assert responses[0].status_code == HTTPStatus.OK
+        assert responses[0].json()['count'] == 2
+        assert len(queries) == 2, (
+            'Проверьте, что список комментариев выдаётся одним запросом '
+            'и запросом количества для пагинации, без загрузки отзыва, '
+            'произведения и авторов по отдельности.'
+        )
+
+    def test_02_missing_parents(self, client, comments):
+        _, reviews, titles = comments
+        assert client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=999999)
+        ).status_code == HTTPStatus.NOT_FOUND
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[1]['id'], review_id=reviews[0]['id']
+        )
+        assert client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что комментарии отзыва нельзя получить через URL '
+            'другого произведения.'
+        )
+        comment_id = comments[0][0]['id']
+        assert client.get(f'{url}{comment_id}/').status_code == (
+            HTTPStatus.NOT_FOUND
+        )
+        response = client.get(f'{url}?pagination=cursor')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+        response = client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[1]['id'])
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['results'] == []
+
+    def test_03_comment_create_loads_review_once(self, comments, user):
+        _, reviews, titles = comments
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        user_client = get_claims_client(user)
+        responses = []
+
+        queries = count_queries(lambda: responses.append(
+            user_client.post(url, data={'text': 'Согласен'})
+        ))
+        assert responses[0].status_code == HTTPStatus.CREATED
+        statements = [query['sql'].split()[0] for query in queries]
+        assert statements.count('SELECT') == 1, (
+            'Проверьте, что при создании комментария отзыв загружается '
+            'одним запросом.'
+        )
+
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[1]['id'], review_id=reviews[0]['id']
+        )
+        response = user_client.post(url, data={'text': 'Согласен'})
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,125 @@
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.test import AsyncClient
+from django.urls import resolve
+
+from api.cache import reset_cache_stats
+from api.metrics import registry
+from api.views import TitleViewSet
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('async_reads')
+class Test23AsyncReads:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    @pytest.fixture
+    def comments(self, admin_client, user, user_client, moderator,
+                 moderator_client, settings):
+        result = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        settings.RESPONSE_CACHE = {'ENABLED': False}
+        return result
+
+    def get_urls(self, comments):
+        comments, reviews, titles = comments
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review_id
+        )
+        return [
+            self.TITLES_URL,
+            f'{self.TITLES_URL}?page=2',
+            f'{self.TITLES_URL}?genre={titles[0]["genre"][0]}',
+            f'{self.TITLES_URL}?year=1988',
+            f'{self.TITLES_URL}{title_id}/',
+            reviews_url,
+            f'{reviews_url}?pagination=cursor',
+            f'{reviews_url}{review_id}/',
+            comments_url,
+            f'{comments_url}{comments[0]["id"]}/',
+        ]
+
+    def test_01_read_views_are_async(self):
+        for url in (
+            self.TITLES_URL,
+            f'{self.TITLES_URL}1/',
+            self.REVIEWS_URL_TEMPLATE.format(title_id=1),
+            self.COMMENTS_URL_TEMPLATE.format(title_id=1, review_id=1),
+        ):
+            assert iscoroutinefunction(resolve(url).func), (
+                f'Проверьте, что `{url}` обслуживается асинхронным '
+                'представлением.'
+            )
+        assert not iscoroutinefunction(resolve('/api/v1/users/').func)
+
+    def test_02_same_responses(self, client, comments):
+        async_client = AsyncClient()
+        for url in self.get_urls(comments):
+            expected = client.get(url)
+            response = async_to_sync(async_client.get)(url)
+            assert response.status_code == expected.status_code, url
+            assert response.json() == expected.json(), (
+                f'Проверьте, что ответ на GET-запрос к `{url}` под ASGI '
+                'совпадает с ответом под WSGI.'
+            )
+
+    def test_03_errors(self, comments, user):
+        _, reviews, titles = comments
+        async_client = AsyncClient()
+        get = async_to_sync(async_client.get)
+        for url in (
+            f'{self.TITLES_URL}999999/',
+            f'{self.TITLES_URL}?page=100',
+            self.REVIEWS_URL_TEMPLATE.format(title_id=999999),
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=titles[1]['id'], review_id=reviews[0]['id']
+            ),
+        ):
+            assert get(url).status_code == HTTPStatus.NOT_FOUND, url
+
+        response = async_to_sync(async_client.post)(
+            self.TITLES_URL, data={'name': 'Новое'},
+            content_type='application/json',
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что запись через асинхронное представление '
+            'по-прежнему требует авторизации.'
+        )
+
+    def test_04_metrics_and_cache(self, comments, settings):
+        settings.RESPONSE_CACHE = {'ENABLED': True}
+        reset_cache_stats()
+        registry.reset()
+        get = async_to_sync(AsyncClient().get)
+
+        assert get(self.TITLES_URL)['X-Cache'] == 'MISS'
+        assert get(self.TITLES_URL)['X-Cache'] == 'HIT', (
+            'Проверьте, что асинхронный список использует кэш ответов.'
+        )
+        settings.RESPONSE_CACHE = {'ENABLED': False}
+        get(self.TITLES_URL)
+        fields = registry.snapshot()[('titles-list', 'GET')]
+        assert fields['total'][2] == 3
+        assert fields['queries'][0][-1] >= 2, (
+            'Проверьте, что SQL-запросы асинхронного ORM учитываются '
+            'в метриках.'
+        )
+
+    def test_05_sync_without_asgi(self, settings):
+        settings.ASYNC_READS = {'ENABLED': False}
+        view = TitleViewSet.as_view({'get': 'list'})
+        assert not iscoroutinefunction(view), (
+            'Проверьте, что без ASYNC_READS (под WSGI) представления '
+            'чтения остаются синхронными.'
+        )
@@ -0,0 +1,190 @@
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+from reviews.models import Category, Genre
+from tests.utils import count_queries, create_reviews, get_claims_client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24ConditionalGet:
+
+    TITLES_URL = '/api/v1/titles/'
+    CATEGORIES_URL = '/api/v1/categories/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    @pytest.fixture(autouse=True)
+    def disable_count_cache(self, settings):
+        # Проверяется сам запрос валидаторов, а не кэш пагинации.
+        settings.PAGINATION = {'COUNT_CACHE_TIMEOUT': 0}
+
+    @pytest.fixture
+    def reviews(self, admin_client, user, user_client, moderator,
+                moderator_client):
+        return create_reviews(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+
+    def assert_not_modified(self, client, url, etag):
+        responses = []
+        queries = count_queries(lambda: responses.append(
+            client.get(url, HTTP_IF_NONE_MATCH=etag)
+        ))
+        assert responses[0].status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с совпадающим '
+            '`If-None-Match` возвращает ответ со статусом 304.'
+        )
+        assert responses[0]['ETag'] == etag
+        assert len(queries) == 1, (
+            'Проверьте, что ответ 304 строится одним запросом валидаторов, '
+            'без чтения и сериализации данных.'
+        )
+
+    def test_01_title_detail(self, admin, reviews):
+        _, titles = reviews
+        client = get_claims_client(admin)
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        etag = response['ETag']
+        assert etag.startswith('"') and 'Last-Modified' in response, (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'строгий `ETag` и `Last-Modified`.'
+        )
+        self.assert_not_modified(client, url, etag)
+
+        response = client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        new_review_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        assert client.post(
+            new_review_url, data={'text': 'Админ', 'score': 1}
+        ).status_code == HTTPStatus.CREATED
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение рейтинга меняет ETag произведения.'
+        )
+        assert response['ETag'] != etag
+
+    def test_02_related_changes(self, admin, reviews, user):
+        _, titles = reviews
+        client = get_claims_client(admin)
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+        etag = client.get(url)['ETag']
+
+        category = Category.objects.get(slug=titles[0]['category'])
+        category.name = 'Кино'
+        category.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что переименование категории меняет ETag '
+            'произведения.'
+        )
+        etag = response['ETag']
+
+        Genre.objects.get(slug=titles[0]['genre'][0]).delete()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что удаление жанра меняет ETag произведения.'
+        )
+
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        etag = client.get(reviews_url)['ETag']
+        user.username = 'renamed'
+        user.save()
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что смена username автора меняет ETag ленты.'
+        )
+        assert 'renamed' in {
+            review['author'] for review in response.json()['results']
+        }
+
+    def test_03_review_feed(self, admin, reviews, user_client):
+        reviews, titles = reviews
+        client = get_claims_client(admin)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        etag = client.get(url)['ETag']
+        self.assert_not_modified(client, url, etag)
+
+        response = user_client.patch(
+            f'{url}{reviews[0]["id"]}/', data={'text': 'Исправлено'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что редактирование отзыва меняет ETag ленты.'
+        )
+        etag = response['ETag']
+
+        user_client.delete(f'{url}{reviews[0]["id"]}/')
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что удаление отзыва меняет ETag ленты.'
+        )
+
+        response = client.get(f'{url}?pagination=cursor')
+        assert 'ETag' not in response, (
+            'Проверьте, что курсорные страницы отдаются без валидаторов, '
+            'чтобы не считать записи.'
+        )
+
+    def test_04_cached_and_async(self, client, reviews, settings,
+                                 async_reads):
+        _, titles = reviews
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+        first = client.get(url)
+        second = client.get(url)
+        assert second['X-Cache'] == 'HIT'
+        assert second['ETag'] == first['ETag'], (
+            'Проверьте, что ответ из кэша содержит валидаторы.'
+        )
+        responses = []
+        queries = count_queries(lambda: responses.append(
+            client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        ))
+        assert responses[0].status_code == HTTPStatus.NOT_MODIFIED
+        assert not queries, (
+            'Проверьте, что кэш ответов отдаёт 304 без запросов к БД.'
+        )
+
+        settings.RESPONSE_CACHE = {'ENABLED': False}
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        get = async_to_sync(AsyncClient().get)
+        etag = get(url)['ETag']
+        response = get(url, headers={'If-None-Match': etag})
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что асинхронные представления поддерживают '
+            'условные запросы.'
+        )
+
+    def test_05_missing_object(self, admin, reviews):
+        client = get_claims_client(admin)
+        response = client.get(
+            f'{self.TITLES_URL}999999/', HTTP_IF_NONE_MATCH='*'
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_06_pages_have_own_etags(self, admin, reviews):
+        client = get_claims_client(admin)
+        first_url = f'{self.TITLES_URL}?page_size=1'
+        etag = client.get(first_url)['ETag']
+        for url in (
+            f'{self.TITLES_URL}?page_size=1&page=2',
+            f'{self.TITLES_URL}?page_size=2',
+        ):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что `ETag` одной страницы списка не подходит '
+                'к другим страницам и размерам страницы.'
+            )
+            assert response['ETag'] != etag
+        self.assert_not_modified(client, first_url, etag)
@@ -0,0 +1,110 @@
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from http import HTTPStatus
+from io import BytesIO
+from uuid import UUID
+
+import pytest
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api import parsers, renderers
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+from tests.utils import create_comments
+
+
+PAYLOAD = {
+    'name': 'Сталкер \u2028 «Пикник» \u2029 😀',
+    'quote': 'Он сказал: "\\n"\t',
+    'pub_date': datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+    'price': Decimal('10.50'),
+    'uuid': UUID('12345678-1234-5678-1234-567812345678'),
+    'nested': [{'id': 1, 'score': 9.5, 'genre': []}, None, True],
+    'big': 2 ** 70,
+    1: 'ключ',
+}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25JSONRenderer:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_render_matches_json_renderer(self, monkeypatch):
+        expected = JSONRenderer().render(PAYLOAD)
+        assert FastJSONRenderer().render(PAYLOAD) == expected, (
+            'Проверьте, что FastJSONRenderer выдаёт те же байты, что '
+            'JSONRenderer: кириллица, U+2028, даты, Decimal, UUID и '
+            'вложенные данные.'
+        )
+        assert b'\\u2028' in expected
+        monkeypatch.setattr(renderers, 'orjson', None)
+        assert FastJSONRenderer().render(PAYLOAD) == expected, (
+            'Проверьте, что без orjson используется стандартный json.'
+        )
+
+    def test_02_indent_falls_back(self):
+        context = {'indent': 2}
+        assert FastJSONRenderer().render(
+            PAYLOAD, 'application/json', context
+        ) == JSONRenderer().render(PAYLOAD, 'application/json', context)
+        assert FastJSONRenderer().render(None) == b''
+
+    def test_03_api_responses(self, admin_client, user, user_client,
+                              moderator, moderator_client, settings):
+        _, reviews, titles = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        settings.RESPONSE_CACHE = {'ENABLED': False}
+        urls = [
+            self.TITLES_URL,
+            f'{self.TITLES_URL}{titles[0]["id"]}/',
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id']),
+        ]
+        for url in urls:
+            response = admin_client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert response['Content-Type'] == 'application/json'
+            assert response.content == JSONRenderer().render(
+                response.data
+            ), (
+                f'Проверьте, что ответ на GET-запрос к `{url}` совпадает '
+                'с выводом JSONRenderer.'
+            )
+
+    def test_04_parser(self, monkeypatch):
+        body = json.dumps(PAYLOAD, default=str, ensure_ascii=False)
+        expected = JSONParser().parse(BytesIO(body.encode()))
+        assert FastJSONParser().parse(BytesIO(body.encode())) == expected, (
+            'Проверьте, что FastJSONParser разбирает тело так же, как '
+            'JSONParser.'
+        )
+        for invalid in (b'{"score": NaN}', b'{"score": ', b'\xff'):
+            with pytest.raises(ParseError) as fast_error:
+                FastJSONParser().parse(BytesIO(invalid))
+            with pytest.raises(ParseError) as error:
+                JSONParser().parse(BytesIO(invalid))
+            assert str(fast_error.value) == str(error.value)
+        monkeypatch.setattr(parsers, 'orjson', None)
+        assert FastJSONParser().parse(BytesIO(body.encode())) == expected
+
+    def test_05_api_json_requests(self, admin_client):
+        response = admin_client.post(
+            '/api/v1/categories/',
+            data=json.dumps({'name': 'Кино', 'slug': 'kino'}),
+            content_type='application/json',
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что API принимает JSON через FastJSONParser.'
+        )
+        response = admin_client.post(
+            '/api/v1/categories/', data='{"name": ',
+            content_type='application/json',
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что некорректный JSON возвращает ответ 400.'
+        )
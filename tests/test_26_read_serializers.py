@@ -0,0 +1,125 @@
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+from api.read_serializers import TitleValuesSerializer
+from api.serializers import TitleReadSerializer
+from api.views import (
+    CategoryViewSet,
+    CommentViewSet,
+    GenreViewSet,
+    ReviewViewSet,
+    TitleViewSet,
+)
+from reviews.models import Category, Review, Title
+from tests.utils import count_queries, create_comments
+
+
+VIEWSETS = (
+    CategoryViewSet, GenreViewSet, TitleViewSet, ReviewViewSet,
+    CommentViewSet,
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26ReadSerializers:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    @pytest.fixture
+    def comments(self, admin_client, admin, user, user_client, moderator,
+                 moderator_client, settings):
+        result = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        _, _, titles = result
+        # Дробный рейтинг 6.33 и произведение без категории.
+        Review.objects.create(
+            title_id=titles[0]['id'], author=admin, text='Плохо', score=9
+        )
+        Category.objects.get(slug=titles[1]['category']).delete()
+        settings.RESPONSE_CACHE = {'ENABLED': False}
+        return result
+
+    def get_urls(self, comments):
+        comments, reviews, titles = comments
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review_id
+        )
+        return [
+            '/api/v1/categories/',
+            '/api/v1/genres/?search=ужас',
+            self.TITLES_URL,
+            f'{self.TITLES_URL}?genre={titles[0]["genre"][0]}',
+            f'{self.TITLES_URL}?name=Терминатор',
+            f'{self.TITLES_URL}{title_id}/',
+            f'{self.TITLES_URL}{titles[1]["id"]}/',
+            reviews_url,
+            f'{reviews_url}?pagination=cursor',
+            f'{reviews_url}{review_id}/',
+            comments_url,
+            f'{comments_url}{comments[0]["id"]}/',
+        ]
+
+    def get_model_responses(self, client, urls, monkeypatch):
+        with monkeypatch.context() as patch:
+            for viewset in VIEWSETS:
+                patch.setattr(viewset, 'values_serializer_class', None)
+            return [client.get(url).content for url in urls]
+
+    def test_01_same_as_model_serializers(self, client, comments,
+                                          monkeypatch, async_reads):
+        urls = self.get_urls(comments)
+        expected = self.get_model_responses(client, urls, monkeypatch)
+        get = async_to_sync(AsyncClient().get)
+        for url, content in zip(urls, expected):
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK, url
+            assert response.content == content, (
+                f'Проверьте, что ответ на GET-запрос к `{url}` совпадает с '
+                'ответом ModelSerializer.'
+            )
+            assert get(url).content == content, (
+                f'Проверьте, что асинхронный ответ на GET-запрос к `{url}` '
+                'совпадает с ответом ModelSerializer.'
+            )
+        assert client.get(urls[5]).json()['rating'] == 6
+        assert client.get(urls[6]).json()['category'] is None
+
+    def test_02_serializer(self, comments):
+        queryset = Title.objects.order_by('name', 'year')
+        expected = TitleReadSerializer(
+            queryset.select_related('category').prefetch_related('genre'),
+            many=True,
+        ).data
+        rows = list(TitleValuesSerializer.get_values_queryset(queryset))
+        assert rows and isinstance(rows[0], dict)
+        data = []
+        queries = count_queries(lambda: data.append(
+            TitleValuesSerializer(rows, many=True).data
+        ))
+        assert data[0] == expected
+        assert len(queries) == 1, (
+            'Проверьте, что жанры страницы читаются одним запросом.'
+        )
+        assert TitleValuesSerializer(rows[0]).data == expected[0]
+
+    def test_03_values_only_for_reads(self, admin_client, comments):
+        _, _, titles = comments
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+        response = admin_client.patch(url, data={'year': 1985})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['year'] == 1985
+        response = admin_client.get(url, HTTP_ACCEPT='text/html')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что browsable API строит формы обычными '
+            'сериализаторами.'
+        )
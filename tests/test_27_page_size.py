@@ -0,0 +1,111 @@
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+from reviews.models import Category
+from tests.utils import count_queries, create_reviews, get_claims_client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27PageSize:
+
+    CATEGORIES_URL = '/api/v1/categories/'
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    @pytest.fixture
+    def categories(self, settings):
+        settings.RESPONSE_CACHE = {'ENABLED': False}
+        settings.PAGINATION = {'MAX_PAGE_SIZE': 8}
+        Category.objects.bulk_create(
+            Category(name=f'Категория {i}', slug=f'category-{i}')
+            for i in range(12)
+        )
+
+    def test_01_page_size(self, client, categories, async_reads):
+        response = client.get(self.CATEGORIES_URL)
+        assert len(response.json()['results']) == 5, (
+            'Проверьте, что без `page_size` используется PAGE_SIZE.'
+        )
+        data = client.get(f'{self.CATEGORIES_URL}?page_size=7').json()
+        assert len(data['results']) == 7 and data['count'] == 12, (
+            'Проверьте, что параметр `page_size` задаёт размер страницы.'
+        )
+        assert 'page_size=7' in data['next']
+        data = client.get(f'{self.CATEGORIES_URL}?page_size=1000').json()
+        assert len(data['results']) == 8, (
+            'Проверьте, что размер страницы не превышает MAX_PAGE_SIZE.'
+        )
+        data = async_to_sync(AsyncClient().get)(
+            f'{self.TITLES_URL}?page_size=1000'
+        ).json()
+        assert data['count'] == 0 and data['results'] == []
+
+    def test_02_cached_count(self, admin, admin_client, categories):
+        client = get_claims_client(admin)
+        url = f'{self.CATEGORIES_URL}?page_size=2'
+        first = count_queries(client.get, url)
+        second = count_queries(client.get, f'{url}&page=3')
+        assert len(second) == len(first) - 1, (
+            'Проверьте, что количество записей списка кэшируется для '
+            'всех страниц одного набора фильтров.'
+        )
+        assert client.get(f'{url}&page=3').json()['count'] == 12
+
+        data = client.get(f'{self.CATEGORIES_URL}?search=Категория 1').json()
+        assert data['count'] == 3, (
+            'Проверьте, что количество кэшируется отдельно для каждого '
+            'набора фильтров.'
+        )
+
+        response = admin_client.post(
+            self.CATEGORIES_URL, data={'name': 'Новая', 'slug': 'new'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert client.get(url).json()['count'] == 13, (
+            'Проверьте, что создание записи сбрасывает кэш количества.'
+        )
+        admin_client.delete(f'{self.CATEGORIES_URL}new/')
+        assert client.get(url).json()['count'] == 12, (
+            'Проверьте, что удаление записи сбрасывает кэш количества.'
+        )
+
+    def test_03_cached_validators(self, admin, admin_client, user,
+                                  user_client, moderator, moderator_client,
+                                  settings):
+        settings.RESPONSE_CACHE = {'ENABLED': False}
+        _, titles = create_reviews(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        client = get_claims_client(admin)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        etag = client.get(url)['ETag']
+        responses = []
+        queries = count_queries(lambda: responses.append(
+            client.get(url, HTTP_IF_NONE_MATCH=etag)
+        ))
+        assert responses[0].status_code == HTTPStatus.NOT_MODIFIED
+        assert not queries, (
+            'Проверьте, что валидаторы списка берутся из кэша пагинации.'
+        )
+        data = client.get(f'{url}?pagination=cursor&page_size=1').json()
+        assert len(data['results']) == 1 and data['next'], (
+            'Проверьте, что `page_size` работает и в курсорной пагинации.'
+        )
+
+        response = admin_client.post(url, data={'text': 'Ещё', 'score': 3})
+        assert response.status_code == HTTPStatus.CREATED
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == 3, (
+            'Проверьте, что новый отзыв сбрасывает кэш количества ленты.'
+        )
+
+    def test_04_disabled_cache(self, admin, categories, settings):
+        settings.PAGINATION = {'COUNT_CACHE_TIMEOUT': 0}
+        client = get_claims_client(admin)
+        first = count_queries(client.get, self.CATEGORIES_URL)
+        second = count_queries(client.get, self.CATEGORIES_URL)
+        assert len(second) == len(first)
@@ -0,0 +1,74 @@
+import pytest
+from django.conf import settings as django_settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+
+from reviews.sqlite import get_sqlite_pragmas
+
+
+def open_connection(path):
+    """Новое соединение Django с файловой базой SQLite."""
+    default = connections['default']
+    wrapper = type(default)(
+        {**default.settings_dict, 'NAME': str(path)}, alias='tuning'
+    )
+    wrapper.ensure_connection()
+    return wrapper
+
+
+def read_pragmas(wrapper, names):
+    values = {}
+    with wrapper.cursor() as cursor:
+        for name in names:
+            cursor.execute(f'PRAGMA {name}')
+            values[name] = cursor.fetchone()[0]
+    return values
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28SqliteTuning:
+
+    def test_01_pragmas(self, tmp_path):
+        wrapper = open_connection(tmp_path / 'db.sqlite3')
+        try:
+            values = read_pragmas(wrapper, (
+                'journal_mode', 'synchronous', 'busy_timeout',
+                'cache_size', 'mmap_size', 'temp_store',
+            ))
+        finally:
+            wrapper.close()
+        assert values == {
+            'journal_mode': 'wal',
+            'synchronous': 1,
+            'busy_timeout': 5000,
+            'cache_size': -64 * 1024,
+            'mmap_size': 256 * 1024 * 1024,
+            'temp_store': 2,
+        }, (
+            'Проверьте, что новое соединение SQLite получает PRAGMA из '
+            'SQLITE_PRAGMAS.'
+        )
+
+    def test_02_settings(self, tmp_path, settings):
+        settings.SQLITE_PRAGMAS = {'mmap_size': None, 'cache_size': -1000}
+        assert 'mmap_size' not in get_sqlite_pragmas()
+        wrapper = open_connection(tmp_path / 'db.sqlite3')
+        try:
+            values = read_pragmas(wrapper, ('cache_size', 'journal_mode'))
+        finally:
+            wrapper.close()
+        assert values == {'cache_size': -1000, 'journal_mode': 'wal'}, (
+            'Проверьте, что SQLITE_PRAGMAS дополняет значения по '
+            'умолчанию.'
+        )
+
+        settings.SQLITE_PRAGMAS = {'journal_mode': 'wal; DROP TABLE x'}
+        with pytest.raises(ImproperlyConfigured):
+            get_sqlite_pragmas()
+
+    def test_03_persistent_connections(self):
+        database = django_settings.DATABASES['default']
+        assert database['CONN_MAX_AGE'] > 0, (
+            'Проверьте, что соединения с базой переиспользуются.'
+        )
+        assert database['CONN_HEALTH_CHECKS'] is True
@@ -0,0 +1,139 @@
+import subprocess
+import sys
+from http import HTTPStatus
+from pathlib import Path
+
+import pytest
+from django.db import OperationalError
+
+from api.metrics import write_metrics
+from api.views import ReviewViewSet
+from api.writes import DatabaseBusy, run_write
+from reviews.models import Review
+from tests.utils import create_titles
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def locked_error():
+    return OperationalError('database is locked')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29WriteContention:
+
+    @pytest.fixture(autouse=True)
+    def write_settings(self, settings):
+        settings.WRITE_COORDINATOR = {
+            **settings.WRITE_COORDINATOR,
+            'BACKOFF_MS': 1,
+            'MAX_BACKOFF_MS': 2,
+        }
+        write_metrics.reset()
+        return settings
+
+    def test_01_retry_on_lock(self):
+        calls = []
+
+        def func():
+            calls.append(1)
+            if len(calls) < 3:
+                raise locked_error()
+            return 'ok'
+
+        assert run_write(func) == 'ok'
+        assert len(calls) == 3, (
+            'Проверьте, что запись повторяется при "database is locked".'
+        )
+        _, _, count, retries, failures = write_metrics.snapshot()
+        assert (count, retries, failures) == (1, 2, 0), (
+            'Проверьте, что повторы записи попадают в метрики.'
+        )
+
+    def test_02_budget_and_other_errors(self, write_settings):
+        write_settings.WRITE_COORDINATOR = {
+            **write_settings.WRITE_COORDINATOR, 'RETRY_BUDGET_MS': 20,
+        }
+
+        def locked():
+            raise locked_error()
+
+        with pytest.raises(DatabaseBusy):
+            run_write(locked)
+        assert write_metrics.snapshot()[4] == 1
+
+        calls = []
+
+        def broken():
+            calls.append(1)
+            raise OperationalError('no such table: missing')
+
+        with pytest.raises(OperationalError):
+            run_write(broken)
+        assert len(calls) == 1, (
+            'Проверьте, что повторяются только ошибки блокировки.'
+        )
+
+    def test_03_api_retry(self, admin_client, user_client, monkeypatch):
+        titles, _, _ = create_titles(admin_client)
+        perform_create = ReviewViewSet.perform_create
+        calls = []
+
+        def flaky_create(self, serializer):
+            perform_create(self, serializer)
+            calls.append(1)
+            if len(calls) == 1:
+                raise locked_error()
+
+        monkeypatch.setattr(ReviewViewSet, 'perform_create', flaky_create)
+        write_metrics.reset()
+        response = user_client.post(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+            {'text': 'Отзыв', 'score': 7},
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что запись при блокировке базы повторяется, а не '
+            'завершается ошибкой 500.'
+        )
+        assert Review.objects.count() == 1, (
+            'Проверьте, что неудачная попытка записи откатывается.'
+        )
+        text = admin_client.get('/api/v1/metrics/').content.decode()
+        assert 'yamdb_write_lock_retries_total 1' in text
+        assert 'yamdb_write_lock_failures_total 0' in text
+
+    def test_04_api_busy(self, user_client, admin_client, monkeypatch,
+                         write_settings):
+        titles, _, _ = create_titles(admin_client)
+        write_settings.WRITE_COORDINATOR = {
+            **write_settings.WRITE_COORDINATOR, 'RETRY_BUDGET_MS': 20,
+        }
+
+        def locked_create(self, serializer):
+            raise locked_error()
+
+        monkeypatch.setattr(ReviewViewSet, 'perform_create', locked_create)
+        response = user_client.post(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+            {'text': 'Отзыв', 'score': 7},
+        )
+        assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE, (
+            'Проверьте, что после исчерпания RETRY_BUDGET_MS запись '
+            'завершается ответом 503.'
+        )
+
+    def test_05_stress(self):
+        result = subprocess.run(
+            [
+                sys.executable, '-m', 'benchmarks.write_contention',
+                '--writers', '200', '--titles', '20',
+                '--modes', 'immediate', 'serialized', '--check',
+            ],
+            cwd=ROOT, capture_output=True, text=True, timeout=600,
+        )
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert result.stdout.count('отказов 0') == 2, (
+            'Проверьте, что при 200 одновременных писателях ни одна запись '
+            'не завершается ошибкой.\n' + result.stdout
+        )
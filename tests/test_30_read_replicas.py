@@ -0,0 +1,178 @@
+import sqlite3
+from http import HTTPStatus
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connections
+from rest_framework.test import APIClient
+
+from api.replicas import (
+    ReplicaRouter,
+    is_read_from_replica,
+    set_read_from_replica,
+)
+from api.views import TitleViewSet
+from reviews.models import Title
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30ReadReplicas:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    @pytest.fixture
+    def titles(self, admin_client, settings):
+        settings.RESPONSE_CACHE = {'ENABLED': False}
+        settings.PAGINATION = {'COUNT_CACHE_TIMEOUT': 0}
+        titles, _, _ = create_titles(admin_client)
+        return titles
+
+    @pytest.fixture
+    def replica(self, titles, tmp_path, settings):
+        """Копия тестовой базы в файле, подключённая как реплика."""
+        path = tmp_path / 'replica.sqlite3'
+        default = connections['default']
+        default.ensure_connection()
+        target = sqlite3.connect(path)
+        default.connection.backup(target)
+        target.close()
+        connections.settings['replica'] = {
+            **default.settings_dict, 'NAME': str(path), 'OPTIONS': {},
+        }
+        # Соединение открывается заранее: тестовый класс Django не
+        # разрешает новые соединения с базами, которых нет в databases.
+        connections['replica'].connect()
+        settings.READ_REPLICAS = {'DATABASES': ['replica']}
+        cache.clear()
+        yield
+        set_read_from_replica(False)
+        connections['replica'].close()
+        del connections['replica']
+        del connections.settings['replica']
+
+    def test_01_router(self, replica):
+        router = ReplicaRouter()
+        assert router.db_for_read(Title) is None, (
+            'Проверьте, что вне чтения вьюсета запросы идут в default.'
+        )
+        set_read_from_replica(True)
+        assert router.db_for_read(Title) == 'replica'
+        assert router.db_for_write(Title) == 'default'
+        assert router.allow_migrate('replica', 'reviews') is False
+        assert router.allow_migrate('default', 'reviews') is None
+
+    def test_02_reads_from_replica(self, client, titles, replica):
+        Title.objects.create(name='Только в default', year=2000)
+        response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == len(titles), (
+            'Проверьте, что чтения каталога выполняются с реплики.'
+        )
+        response = client.get(f'{self.TITLES_URL}{titles[0]["id"]}/')
+        assert response.status_code == HTTPStatus.OK
+        assert Title.objects.count() == len(titles) + 1, (
+            'Проверьте, что чтения вне вьюсетов каталога идут в default.'
+        )
+
+    def test_03_read_your_writes(self, user_client, moderator_client,
+                                 titles, replica, settings):
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        response = user_client.post(url, {'text': 'Отзыв', 'score': 7})
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что записи выполняются в default.'
+        )
+        assert user_client.get(url).json()['count'] == 1, (
+            'Проверьте, что после записи пользователь читает свои данные '
+            'из default.'
+        )
+        assert moderator_client.get(url).json()['count'] == 0, (
+            'Проверьте, что остальные пользователи читают с реплики.'
+        )
+        cache.clear()
+        assert user_client.get(url).json()['count'] == 0, (
+            'Проверьте, что закрепление за default ограничено по времени.'
+        )
+
+        settings.READ_REPLICAS = {'DATABASES': []}
+        assert moderator_client.get(url).json()['count'] == 1, (
+            'Проверьте, что без реплик все чтения идут в default.'
+        )
+
+    def test_04_one_replica_per_request(self, replica, settings):
+        settings.READ_REPLICAS = {'DATABASES': ['replica', 'replica2']}
+        router = ReplicaRouter()
+        for _ in range(10):
+            set_read_from_replica(True)
+            aliases = {router.db_for_read(Title) for _ in range(10)}
+            assert len(aliases) == 1, (
+                'Проверьте, что все запросы к базе одного HTTP-запроса '
+                'читаются с одной реплики.'
+            )
+
+    def test_05_shared_caches_not_filled_from_replica(
+        self, client, moderator_client, titles, replica, settings
+    ):
+        Title.objects.create(name='Только в default', year=2000)
+        settings.RESPONSE_CACHE = {'ENABLED': True, 'REPLICA_TIMEOUT': 0}
+        settings.PAGINATION = {'COUNT_CACHE_TIMEOUT': 30}
+        assert client.get(self.TITLES_URL).json()['count'] == len(titles), (
+            'Проверьте, что кэшируемые анонимные чтения выполняются с '
+            'реплики.'
+        )
+        assert moderator_client.get(self.TITLES_URL).json()['count'] == (
+            len(titles)
+        ), (
+            'Проверьте, что количество записей при чтении с реплики '
+            'считается на той же реплике.'
+        )
+        settings.READ_REPLICAS = {'DATABASES': []}
+        assert client.get(self.TITLES_URL).json()['count'] == (
+            len(titles) + 1
+        ), (
+            'Проверьте, что при REPLICA_TIMEOUT = 0 ответы, прочитанные с '
+            'реплики, не сохраняются в кэше ответов.'
+        )
+        assert moderator_client.get(self.TITLES_URL).json()['count'] == (
+            len(titles) + 1
+        ), (
+            'Проверьте, что количество записей, посчитанное на реплике, '
+            'не сохраняется в кэше.'
+        )
+
+    def test_06_replica_responses_cached_briefly(
+        self, client, titles, replica, settings
+    ):
+        settings.RESPONSE_CACHE = {
+            'ENABLED': True, 'TIMEOUT': 60, 'REPLICA_TIMEOUT': 5,
+        }
+        with patch.object(
+            LocMemCache, 'set', autospec=True, side_effect=LocMemCache.set
+        ) as cache_set:
+            response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        # Ответы хранятся кортежем (содержимое, тип, валидаторы).
+        timeouts = [
+            call.args[3] for call in cache_set.call_args_list
+            if isinstance(call.args[2], tuple)
+        ]
+        assert timeouts == [5], (
+            'Проверьте, что ответ, прочитанный с реплики, хранится в кэше '
+            'REPLICA_TIMEOUT секунд.'
+        )
+
+    def test_07_flag_reset_after_error(self, titles, replica, monkeypatch):
+        def fail(*args, **kwargs):
+            raise RuntimeError('Ошибка чтения')
+
+        monkeypatch.setattr(TitleViewSet, 'list', fail)
+        client = APIClient(raise_request_exception=False)
+        response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.INTERNAL_SERVER_ERROR
+        assert not is_read_from_replica(), (
+            'Проверьте, что флаг чтения с реплики сбрасывается, даже если '
+            'обработчик запроса завершился исключением.'
+        )
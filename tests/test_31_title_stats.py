@@ -0,0 +1,133 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Review, TitleScoreCount
+from tests.utils import count_queries, create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test31TitleStats:
+
+    STATS_URL_TEMPLATE = '/api/v1/titles/{title_id}/stats/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_stats(self, client, title_id):
+        response = client.get(
+            self.STATS_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос к `/api/v1/titles/{title_id}/stats/` '
+            'возвращает ответ со статусом 200.'
+        )
+        return response.json()
+
+    @staticmethod
+    def get_counts(stats):
+        return {
+            item['score']: item['count']
+            for item in stats['distribution'] if item['count']
+        }
+
+    def test_01_stats(self, client, admin_client, user_client,
+                      moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        stats = self.get_stats(client, title_id)
+        assert stats['count'] == 0
+        assert stats['mean'] is None and stats['median'] is None
+        assert [item['score'] for item in stats['distribution']] == list(
+            range(1, 11)
+        ), 'Проверьте, что распределение содержит все оценки от 1 до 10.'
+
+        create_single_review(user_client, title_id, 'Отлично', 10)
+        review_id = create_single_review(
+            moderator_client, title_id, 'Так себе', 4
+        ).json()['id']
+        create_single_review(admin_client, title_id, 'Неплохо', 7)
+        stats = self.get_stats(client, title_id)
+        assert self.get_counts(stats) == {4: 1, 7: 1, 10: 1}, (
+            'Проверьте, что распределение оценок учитывает новые отзывы.'
+        )
+        assert stats['count'] == 3
+        assert stats['mean'] == 7.0
+        assert stats['median'] == 7.0
+
+        response = moderator_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review_id
+            ),
+            data={'score': 9},
+        )
+        assert response.status_code == HTTPStatus.OK
+        stats = self.get_stats(client, title_id)
+        assert self.get_counts(stats) == {7: 1, 9: 1, 10: 1}, (
+            'Проверьте, что изменение оценки переносит отзыв в '
+            'распределении.'
+        )
+        assert stats['median'] == 9.0
+
+        response = moderator_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review_id
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        stats = self.get_stats(client, title_id)
+        assert self.get_counts(stats) == {7: 1, 10: 1}, (
+            'Проверьте, что удалённый отзыв исключается из распределения.'
+        )
+        assert stats['mean'] == 8.5 and stats['median'] == 8.5
+
+        response = client.get(self.STATS_URL_TEMPLATE.format(title_id=0))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_constant_queries(self, client, admin_client, user_client,
+                                 moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = self.STATS_URL_TEMPLATE.format(title_id=title_id)
+        create_single_review(user_client, title_id, 'Отлично', 10)
+        before = count_queries(client.get, url)
+        create_single_review(moderator_client, title_id, 'Так себе', 4)
+        create_single_review(admin_client, title_id, 'Неплохо', 7)
+        after = count_queries(client.get, url)
+        assert len(after) == len(before), (
+            'Проверьте, что число запросов к БД не зависит от количества '
+            'отзывов произведения.'
+        )
+        assert not any(
+            'reviews_review' in query['sql'] for query in after
+        ), 'Проверьте, что статистика читается без запроса к отзывам.'
+
+    def test_03_recalculate(self, client, admin_client, user_client,
+                            moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Отлично', 10)
+        create_single_review(moderator_client, title_id, 'Так себе', 4)
+        expected = self.get_stats(client, title_id)
+
+        TitleScoreCount.objects.all().delete()
+        Review.objects.filter(score=4).update(score=5)
+        call_command('recalculate_ratings', stdout=StringIO())
+        stats = self.get_stats(client, title_id)
+        assert self.get_counts(stats) == {5: 1, 10: 1}, (
+            'Проверьте, что команда `recalculate_ratings` восстанавливает '
+            'распределение оценок по отзывам.'
+        )
+        assert stats['count'] == expected['count']
+
+    def test_04_import(self):
+        call_command('import_csv', stdout=StringIO(), stderr=StringIO())
+        total = sum(
+            TitleScoreCount.objects.values_list('count', flat=True)
+        )
+        assert total == Review.objects.count(), (
+            'Проверьте, что после `import_csv` распределение оценок '
+            'учитывает импортированные отзывы.'
+        )
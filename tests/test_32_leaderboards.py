@@ -0,0 +1,227 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import TitleRanking
+from tests.utils import count_queries, create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test32Leaderboards:
+
+    LEADERBOARD_URL = '/api/v1/leaderboards/'
+    CATEGORY_URL_TEMPLATE = '/api/v1/leaderboards/categories/{slug}/'
+    GENRE_URL_TEMPLATE = '/api/v1/leaderboards/genres/{slug}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    @pytest.fixture
+    def titles(self, admin_client, user_client, moderator_client, settings):
+        """
+        Терминатор: один отзыв 10; Крепкий орешек: три отзыва 9;
+        Чужой: без отзывов.
+        """
+        settings.LEADERBOARD = {'PRIOR_MEAN': 7, 'PRIOR_COUNT': 2}
+        titles, _, _ = create_titles(admin_client)
+        response = admin_client.post('/api/v1/titles/', data={
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': ['horror'],
+            'category': 'films',
+        })
+        assert response.status_code == HTTPStatus.CREATED
+        terminator, die_hard = titles[0]['id'], titles[1]['id']
+        create_single_review(user_client, terminator, 'Отлично', 10)
+        for client in (user_client, moderator_client, admin_client):
+            create_single_review(client, die_hard, 'Хорошо', 9)
+        return terminator, die_hard, response.json()['id']
+
+    @staticmethod
+    def get_ranking(client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        return [
+            (item['id'], item['bayesian_rating'])
+            for item in response.json()['results']
+        ]
+
+    def test_01_bayesian_order(self, client, titles):
+        terminator, die_hard, _ = titles
+        assert self.get_ranking(client, self.LEADERBOARD_URL) == [
+            (die_hard, 8.2), (terminator, 8.0),
+        ], (
+            'Проверьте, что рейтинг лидеров упорядочен по байесовской '
+            'оценке (v * R + m * C) / (v + m), а произведения без отзывов '
+            'в него не попадают.'
+        )
+        response = client.get(self.LEADERBOARD_URL).json()['results'][0]
+        assert response['name'] == 'Крепкий орешек'
+        assert response['rating'] == 9
+        assert response['genre'] == [{'name': 'Драма', 'slug': 'drama'}]
+
+    def test_02_groups(self, client, titles):
+        terminator, die_hard, _ = titles
+        assert self.get_ranking(
+            client, self.CATEGORY_URL_TEMPLATE.format(slug='films')
+        ) == [(terminator, 8.0)], (
+            'Проверьте, что рейтинг категории содержит только её '
+            'произведения.'
+        )
+        assert self.get_ranking(
+            client, self.GENRE_URL_TEMPLATE.format(slug='drama')
+        ) == [(die_hard, 8.2)], (
+            'Проверьте, что рейтинг жанра содержит только его произведения.'
+        )
+        for url in (
+            self.CATEGORY_URL_TEMPLATE.format(slug='missing'),
+            self.GENRE_URL_TEMPLATE.format(slug='missing'),
+        ):
+            assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+
+    def test_03_keyset_pages(self, client, titles, moderator_client):
+        _, _, alien = titles
+        create_single_review(moderator_client, alien, 'Неплохо', 8)
+        expected = self.get_ranking(client, self.LEADERBOARD_URL)
+        assert len(expected) == 3
+
+        url = f'{self.LEADERBOARD_URL}?page_size=1'
+        pages = []
+        while url:
+            data = client.get(url).json()
+            assert len(data['results']) == 1
+            item = data['results'][0]
+            pages.append((item['id'], item['bayesian_rating']))
+            previous, url = data['previous'], data['next']
+        assert pages == expected, (
+            'Проверьте, что курсор `next` проходит рейтинг без пропусков '
+            'и повторов.'
+        )
+        data = client.get(previous).json()
+        assert data['results'][0]['id'] == expected[1][0], (
+            'Проверьте, что курсор `previous` возвращает предыдущую страницу.'
+        )
+        response = client.get(f'{self.LEADERBOARD_URL}?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_04_incremental_updates(self, client, admin_client, user_client,
+                                    titles):
+        terminator, die_hard, alien = titles
+        review_id = client.get(
+            f'/api/v1/titles/{terminator}/reviews/'
+        ).json()['results'][0]['id']
+        url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=terminator, review_id=review_id
+        )
+        user_client.patch(url, data={'score': 4})
+        assert self.get_ranking(client, self.LEADERBOARD_URL) == [
+            (die_hard, 8.2), (terminator, 6.0),
+        ], 'Проверьте, что изменение оценки обновляет рейтинг лидеров.'
+
+        admin_client.patch(
+            f'/api/v1/titles/{die_hard}/',
+            data={'genre': ['comedy'], 'category': 'films'},
+        )
+        assert self.get_ranking(
+            client, self.GENRE_URL_TEMPLATE.format(slug='comedy')
+        ) == [(die_hard, 8.2), (terminator, 6.0)], (
+            'Проверьте, что смена жанров переносит произведение в рейтинги '
+            'новых жанров.'
+        )
+        assert self.get_ranking(
+            client, self.GENRE_URL_TEMPLATE.format(slug='drama')
+        ) == []
+
+        user_client.delete(url)
+        assert self.get_ranking(client, self.LEADERBOARD_URL) == [
+            (die_hard, 8.2),
+        ], (
+            'Проверьте, что произведение без отзывов исключается из '
+            'рейтинга.'
+        )
+        assert not TitleRanking.objects.filter(
+            title_id=alien, score__isnull=False
+        ).exists()
+
+    def test_05_recompute(self, client, titles, settings):
+        terminator, die_hard, _ = titles
+        settings.LEADERBOARD = {'PRIOR_COUNT': 2}
+        TitleRanking.objects.all().delete()
+        stdout = StringIO()
+        call_command('recompute_rankings', stdout=stdout)
+        # Средняя всех отзывов: (10 + 9 * 3) / 4 = 9.25.
+        assert set(
+            TitleRanking.objects.values_list('prior_mean', flat=True)
+        ) == {9.25}, (
+            'Проверьте, что команда `recompute_rankings` пересчитывает '
+            'рейтинги со средней оценкой всех отзывов.'
+        )
+        assert self.get_ranking(client, self.LEADERBOARD_URL) == [
+            (terminator, 9.5), (die_hard, 9.1),
+        ]
+        assert 'Строк рейтингов: 10' in stdout.getvalue()
+
+    def test_06_constant_queries(self, client, titles, moderator_client,
+                                 settings):
+        settings.RESPONSE_CACHE = {'ENABLED': False}
+        url = self.GENRE_URL_TEMPLATE.format(slug='horror')
+        _, _, alien = titles
+        before = count_queries(client.get, url)
+        create_single_review(moderator_client, alien, 'Неплохо', 8)
+        after = count_queries(client.get, url)
+        assert len(after) == len(before) == 3, (
+            'Проверьте, что страница рейтинга читается тремя запросами: '
+            'группа, страница и жанры произведений.'
+        )
+        assert not any(
+            'reviews_review' in query['sql'] for query in after
+        ), 'Проверьте, что рейтинг не считается по отзывам при запросе.'
+
+    def test_07_imported_titles(self, client, user_client):
+        call_command(
+            'import_csv', 'categories', 'genres', 'titles', 'genres_titles',
+            stdout=StringIO(), stderr=StringIO(),
+        )
+        title_id = TitleRanking.objects.filter(
+            kind=TitleRanking.GENRE
+        ).values_list('title_id', flat=True).first()
+        assert title_id is not None, (
+            'Проверьте, что `import_csv` создаёт строки рейтингов лидеров '
+            'для импортированных произведений и их жанров.'
+        )
+        create_single_review(user_client, title_id, 'Отлично', 10)
+        assert [
+            item_id for item_id, _ in self.get_ranking(
+                client, self.LEADERBOARD_URL
+            )
+        ] == [title_id]
+
+    def test_08_delete_reviewed_title(self, client, admin_client, titles):
+        terminator, die_hard, _ = titles
+        response = admin_client.delete(f'/api/v1/titles/{die_hard}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT, (
+            'Проверьте, что произведение с отзывами удаляется.'
+        )
+        assert self.get_ranking(client, self.LEADERBOARD_URL) == [
+            (terminator, 8.0),
+        ], 'Проверьте, что удалённое произведение исключается из рейтинга.'
+        assert not TitleRanking.objects.filter(title_id=die_hard).exists()
+
+    def test_09_import_rebuilds_once(self):
+        queries = count_queries(
+            call_command, 'import_csv', stdout=StringIO(), stderr=StringIO()
+        )
+        rebuilds = [
+            query for query in queries
+            if query['sql'].startswith('DELETE FROM "reviews_titleranking"')
+        ]
+        assert len(rebuilds) == 1, (
+            'Проверьте, что `import_csv` пересчитывает рейтинги лидеров '
+            'один раз после всех файлов.'
+        )
+        assert TitleRanking.objects.filter(score__isnull=False).exists()
@@ -1,5 +1,11 @@
 from http import HTTPStatus
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.authentication import RoleAccessToken
+
 
 check_name_and_slug_patterns = (
     (
@@ -305,3 +311,34 @@ def check_fields(obj_type, url_pattern, obj, expected_data, detail=False):
         f'данные {obj_types[obj_type]}{results_in_msg}. Поле `id` не '
         'найдено или не является целым числом.'
     )
+
+
+def count_queries(func, *args, **kwargs):
+    with CaptureQueriesContext(connection) as context:
+        func(*args, **kwargs)
+    return context.captured_queries
+
+
+def check_constant_query_count(client, url, populate):
+    """
+    Проверяет, что число запросов к БД при GET-запросе к `url` не
+    зависит от количества объектов на странице: `populate` должен
+    добавить объекты, попадающие на ту же страницу.
+    """
+    queries_before = count_queries(client.get, url)
+    populate()
+    queries_after = count_queries(client.get, url)
+    assert len(queries_after) == len(queries_before), (
+        f'Проверьте, что число запросов к БД при GET-запросе к `{url}` '
+        'не растёт вместе с количеством объектов на странице: было '
+        f'{len(queries_before)}, стало {len(queries_after)}.'
+    )
+
+
+def get_claims_client(user):
+    """Клиент с токеном, содержащим claims роли пользователя."""
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {RoleAccessToken.for_user(user)}'
+    )
+    return client